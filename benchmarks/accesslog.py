@@ -0,0 +1,63 @@
+# Cost of one access log record on the request path: a logging handler
+# writing to a file vs AccessLog.push (the file is written by its thread):
+#
+#     python benchmarks/accesslog.py [--records N]
+import os
+import logging
+import tempfile
+from argparse import ArgumentParser
+from time import perf_counter_ns
+from hius.accesslog import AccessLog, format_record
+
+RECORD = (0.0, ('127.0.0.1', 5000), 'GET', '/users/1', 'user', 200, 17,
+          0.0012)
+
+
+def bench_logging(path, count):
+    logger = logging.getLogger('bench.access')
+    logger.propagate = False
+    handler = logging.FileHandler(path)
+    logger.addHandler(handler)
+
+    start = perf_counter_ns()
+    for _ in range(count):
+        logger.info('%s', format_record(RECORD))
+    elapsed = (perf_counter_ns() - start) / count
+
+    logger.removeHandler(handler)
+    handler.close()
+    return elapsed
+
+
+def bench_access_log(path, count):
+    with open(path, 'w') as stream:
+        log = AccessLog(stream, capacity=count)
+        log.start()
+
+        start = perf_counter_ns()
+        for _ in range(count):
+            log.push(RECORD)
+        elapsed = (perf_counter_ns() - start) / count
+
+        log.stop()
+    return elapsed, log.dropped
+
+
+def main():
+    parser = ArgumentParser()
+    parser.add_argument('--records', type=int, default=50000)
+    args = parser.parse_args()
+
+    logging.getLogger('bench.access').setLevel(logging.INFO)
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'access.log')
+        sync = min(bench_logging(path, args.records) for _ in range(3))
+        pushed = min(bench_access_log(path, args.records) for _ in range(3))
+
+    print(f'logging.FileHandler:  {sync:8.0f} ns per record')
+    print(f'AccessLog.push:       {pushed[0]:8.0f} ns per record '
+          f'({pushed[1]} dropped)')
+
+
+if __name__ == '__main__':
+    main()
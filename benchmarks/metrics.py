@@ -0,0 +1,98 @@
+# Per-request overhead of RequestMetrics:
+#
+#     python benchmarks/metrics.py [--requests N] [--rounds N]
+import asyncio
+from statistics import median
+from argparse import ArgumentParser
+from time import perf_counter_ns
+from hius import Hius
+from hius.routing import route
+from hius.metrics import MetricsStore, RequestMetrics
+from hius.responses import Response
+
+
+async def user(request, user_id: int):
+    return Response(b'')
+
+
+def create_app(metrics):
+    return Hius(routes=[route('/users/{user_id}', user)],
+                metrics=metrics,
+                openapi_config=None)
+
+
+SCOPE = {
+    'type': 'http',
+    'http_version': '1.1',
+    'method': 'GET',
+    'scheme': 'http',
+    'path': '/users/1',
+    'root_path': '',
+    'query_string': b'',
+    'headers': [],
+    'server': ('testserver', 80)
+}
+
+
+async def receive():
+    return {'type': 'http.request', 'body': b'', 'more_body': False}
+
+
+async def send(message):
+    pass
+
+
+async def run_requests(app, count):
+    start = perf_counter_ns()
+    for _ in range(count):
+        await app(dict(SCOPE), receive, send)
+    return (perf_counter_ns() - start) / count
+
+
+async def bench_record(metrics, route, count):
+    record = metrics.record
+    start = perf_counter_ns()
+    for _ in range(count):
+        record(route, 200, 0.001)
+    metrics.flush()
+    return (perf_counter_ns() - start) / count
+
+
+def main():
+    parser = ArgumentParser()
+    parser.add_argument('--requests', type=int, default=5000)
+    parser.add_argument('--rounds', type=int, default=40)
+    args = parser.parse_args()
+
+    # the same app with the recorder switched on and off, so both variants
+    # share one memory layout; rounds alternate to cancel out drift
+    metrics = RequestMetrics(MetricsStore(workers=1))
+    app = create_app(metrics)
+
+    def run(enabled):
+        app.router.metrics = metrics if enabled else None
+        return loop.run_until_complete(run_requests(app, args.requests))
+
+    loop = asyncio.new_event_loop()
+    run(True), run(False)
+
+    plain, instrumented = [], []
+    for index in range(args.rounds):
+        for enabled in (index % 2 == 0, index % 2 == 1):
+            (instrumented if enabled else plain).append(run(enabled))
+    overhead = median(with_metrics - base
+                      for with_metrics, base in zip(instrumented, plain))
+
+    route = next(route for _, route in app.router.iter_http_routes())
+    record = min(loop.run_until_complete(
+                     bench_record(metrics, route, args.requests * 10))
+                 for _ in range(5))
+
+    print(f'request without metrics: {min(plain):8.0f} ns')
+    print(f'request with metrics:    {min(instrumented):8.0f} ns')
+    print(f'metrics overhead:        {overhead:8.0f} ns (median of rounds)')
+    print(f'record() call:           {record:8.0f} ns')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,47 @@
+import logging
+from argparse import ArgumentParser
+from typing import Sequence
+from hius.runner import Supervisor, import_app
+
+
+def main(args: Sequence[str] = None) -> None:
+    parser = ArgumentParser(
+        prog='python -m hius',
+        description='Hius command line interface'
+    )
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    serve = commands.add_parser(
+        'serve',
+        description='Import the app once and serve it with pre-forked '
+                    'uvicorn workers sharing the port via SO_REUSEPORT'
+    )
+    serve.add_argument('app', help='app as "module:attribute"')
+    serve.add_argument('--host', default='127.0.0.1')
+    serve.add_argument('--port', type=int, default=8000)
+    serve.add_argument('--workers', type=int, default=1)
+    serve.add_argument('--timeout', type=float, default=30.0,
+                       help='kill workers silent for this many seconds')
+    serve.add_argument('--graceful-timeout', type=float, default=30.0,
+                       help='time given to workers to finish on shutdown')
+    serve.add_argument('--gc-freeze', action='store_true',
+                       help='freeze the GC heap in the master before fork')
+    serve.add_argument('--log-level', default='info')
+    args = parser.parse_args(args)
+
+    logging.basicConfig(level=args.log_level.upper(),
+                        format='%(asctime)s %(name)s %(message)s')
+
+    supervisor = Supervisor(import_app(args.app),
+                            host=args.host,
+                            port=args.port,
+                            workers=args.workers,
+                            timeout=args.timeout,
+                            graceful_timeout=args.graceful_timeout,
+                            gc_freeze=args.gc_freeze,
+                            log_level=args.log_level)
+    supervisor.run()
+
+
+if __name__ == '__main__':
+    main()  # pragma: no cover
@@ -0,0 +1,175 @@
+import sys
+import time
+import threading
+from logging import getLogger
+from typing import (
+    AsyncGenerator,
+    Callable,
+    Optional,
+    TextIO,
+    Tuple,
+    List
+)
+from starlette.types import Scope, Receive, Send, ASGIApp, Message
+from hius.metrics.store import MetricsStore
+
+logger = getLogger('hius.access')
+
+Client = Optional[Tuple[str, int]]
+Record = Tuple[float, Client, str, str, Optional[str], int, int, float]
+
+
+def format_record(record: Record) -> str:
+    timestamp, client, method, path, route, status, size, duration = record
+    host = client[0] if client else '-'
+    moment = time.strftime('%d/%b/%Y:%H:%M:%S %z', time.localtime(timestamp))
+    return (f'{host} [{moment}] "{method} {path}" {status} {size} '
+            f'{duration * 1000:.3f}ms {route or "-"}')
+
+
+class AccessLog:
+
+    __slots__ = ('stream', 'capacity', 'batch', 'interval', 'formatter',
+                 'store', 'name', 'dropped', 'written', '_ring', '_mask',
+                 '_head', '_tail', '_reported', '_wakeup', '_stopped',
+                 '_thread')
+
+    def __init__(self,
+                 stream: TextIO = None,
+                 capacity: int = 8192,
+                 batch: int = 512,
+                 interval: float = 0.5,
+                 formatter: Callable[[Record], str] = format_record,
+                 store: MetricsStore = None,
+                 name: str = 'hius_access_log_dropped_total') -> None:
+        self.stream = stream
+        self.capacity = 1 << max(capacity - 1, 1).bit_length()
+        self.batch = min(batch, self.capacity)
+        self.interval = interval
+        self.formatter = formatter
+        self.store = store
+        self.name = name
+
+        self.dropped = 0
+        self.written = 0
+
+        self._ring: List[Optional[Record]] = [None] * self.capacity
+        self._mask = self.capacity - 1
+        self._head = 0
+        self._tail = 0
+        self._reported = 0
+
+        self._wakeup = threading.Event()
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def __len__(self) -> int:
+        return self._head - self._tail
+
+    def push(self, record: Record) -> bool:
+        head = self._head
+        pending = head - self._tail
+        if pending >= self.capacity:
+            self.dropped += 1
+            return False
+
+        self._ring[head & self._mask] = record
+        self._head = head + 1
+        if pending + 1 == self.batch:
+            self._wakeup.set()
+        return True
+
+    # ---
+
+    def flush(self) -> int:
+        tail, head = self._tail, self._head
+        self._report_dropped()
+        if tail == head:
+            return 0
+
+        ring, mask, formatter = self._ring, self._mask, self.formatter
+        lines = []
+        for index in range(tail, head):
+            lines.append(formatter(ring[index & mask]))
+            ring[index & mask] = None
+        self._tail = head
+
+        stream = self.stream or sys.stdout
+        stream.write('\n'.join(lines) + '\n')
+        stream.flush()
+        self.written += head - tail
+        return head - tail
+
+    def _report_dropped(self) -> None:
+        dropped = self.dropped
+        if self.store is not None and dropped > self._reported:
+            self.store.inc(self.name, dropped - self._reported)
+            self._reported = dropped
+
+    def _run(self) -> None:
+        while not self._stopped.is_set():
+            self._wakeup.wait(self.interval)
+            self._wakeup.clear()
+            try:
+                self.flush()
+            except Exception:
+                logger.exception('failed to write access log')
+
+    # ---
+
+    def start(self) -> None:
+        self._stopped.clear()
+        self._thread = threading.Thread(target=self._run,
+                                        name='hius-access-log',
+                                        daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stopped.set()
+        self._wakeup.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self.flush()
+
+    async def lifespan(self, app: ASGIApp) -> AsyncGenerator:
+        self.start()
+        try:
+            yield
+        finally:
+            self.stop()
+
+
+class AccessLogMiddleware:
+    def __init__(self, app: ASGIApp, log: AccessLog) -> None:
+        self.app = app
+        self.log = log
+
+    async def __call__(self,
+                       scope: Scope,
+                       receive: Receive,
+                       send: Send) -> None:
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+
+        status, size = 500, 0
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status, size
+            if message['type'] == 'http.response.start':
+                status = message['status']
+            elif message['type'] == 'http.response.body':
+                size += len(message.get('body', b''))
+            await send(message)
+
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            route = scope.get('route')
+            self.log.push((time.time(), scope.get('client'), scope['method'],
+                           scope['path'],
+                           route.name if route is not None else None,
+                           status, size, time.perf_counter() - start))
+
@@ -0,0 +1,41 @@
+from hius.routing import Router, route
+from hius.admin.profiler import Sampler, ProfilerEndpoint
+from hius.admin.loop import LoopMonitor, LoopMonitorEndpoint
+from hius.admin.allocations import (
+    AllocationTracer,
+    TracemallocEndpoint,
+    SnapshotEndpoint,
+    DiffEndpoint
+)
+from hius.admin.slowlog import SlowRequestMiddleware
+
+__all__ = [
+    'Sampler',
+    'ProfilerEndpoint',
+    'LoopMonitor',
+    'LoopMonitorEndpoint',
+    'AllocationTracer',
+    'SlowRequestMiddleware',
+    'create_admin'
+]
+
+
+def create_admin(max_seconds: float = 60.0,
+                 loop_monitor: LoopMonitor = None,
+                 tracer: AllocationTracer = None) -> Router:
+    routes = [
+        route('/profile', ProfilerEndpoint(max_seconds), name='profile')
+    ]
+    if loop_monitor is not None:
+        routes.append(route('/loop', LoopMonitorEndpoint(loop_monitor),
+                            name='loop'))
+    if tracer is not None:
+        routes.extend([
+            route('/tracemalloc', TracemallocEndpoint(tracer),
+                  name='tracemalloc'),
+            route('/tracemalloc/snapshots/{name}', SnapshotEndpoint(tracer),
+                  name='tracemalloc_snapshot'),
+            route('/tracemalloc/diff', DiffEndpoint(tracer),
+                  name='tracemalloc_diff')
+        ])
+    return Router(routes=routes)
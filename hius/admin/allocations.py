@@ -0,0 +1,214 @@
+import time
+import tracemalloc
+from bisect import bisect_right
+from collections import OrderedDict
+from dis import findlinestarts
+from typing import (
+    Optional,
+    Tuple,
+    List,
+    Dict,
+    Any
+)
+from hius.requests import Request
+from hius.responses import JSONResponse, Response
+from hius.httpcodes import HTTPConflict, HTTPNotFound
+from hius.admin.profiler import Routes, get_route_codes
+
+try:
+    from typing import Literal
+except ImportError:  # pragma: no cover
+    from typing_extensions import Literal
+
+UNKNOWN = '<unknown>'
+FILTERS = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, '<frozen importlib._bootstrap>'),
+    tracemalloc.Filter(False, '<frozen importlib._bootstrap_external>'),
+    tracemalloc.Filter(False, '<unknown>')
+)
+
+Ranges = Dict[str, List[Tuple[int, int, str]]]
+
+
+def get_route_ranges(routes: Routes) -> Ranges:
+    ranges: Ranges = {}
+    for code, name in routes.items():
+        last = max(line for _, line in findlinestarts(code) if line)
+        ranges.setdefault(code.co_filename, []).append(
+            (code.co_firstlineno, last, name))
+    for items in ranges.values():
+        items.sort()
+    return ranges
+
+
+def get_traceback_route(traceback: tracemalloc.Traceback,
+                        ranges: Ranges) -> str:
+    for frame in traceback:
+        items = ranges.get(frame.filename)
+        if not items:
+            continue
+        index = bisect_right(items, (frame.lineno, float('inf'), '')) - 1
+        if index >= 0 and items[index][1] >= frame.lineno:
+            return items[index][2]
+    return UNKNOWN
+
+
+# ---
+
+
+class AllocationTracer:
+
+    __slots__ = 'keep', 'snapshots', 'ranges',
+
+    def __init__(self, keep: int = 5) -> None:
+        self.keep = keep
+        self.snapshots: Dict[str, Tuple[float, tracemalloc.Snapshot]] = (
+            OrderedDict())
+        self.ranges: Ranges = {}
+
+    @property
+    def tracing(self) -> bool:
+        return tracemalloc.is_tracing()
+
+    def start(self, nframe: int = 25, routes: Routes = None) -> None:
+        if routes is not None:
+            self.ranges = get_route_ranges(routes)
+        if not self.tracing:
+            tracemalloc.start(nframe)
+
+    def stop(self) -> None:
+        tracemalloc.stop()
+        self.snapshots.clear()
+
+    def status(self) -> Dict[str, Any]:
+        current, peak = tracemalloc.get_traced_memory()
+        return {
+            'tracing': self.tracing,
+            'nframe': tracemalloc.get_traceback_limit(),
+            'current': current,
+            'peak': peak,
+            'overhead': tracemalloc.get_tracemalloc_memory(),
+            'snapshots': [{'name': name, 'taken': taken}
+                          for name, (taken, _) in self.snapshots.items()]
+        }
+
+    # ---
+
+    def take(self, name: str) -> None:
+        snapshot = tracemalloc.take_snapshot().filter_traces(FILTERS)
+        self.snapshots.pop(name, None)
+        self.snapshots[name] = (time.time(), snapshot)
+        while len(self.snapshots) > self.keep:
+            self.snapshots.popitem(last=False)
+
+    def get(self, name: Optional[str]) -> Optional[tracemalloc.Snapshot]:
+        if name is None:
+            return tracemalloc.take_snapshot().filter_traces(FILTERS)
+        taken = self.snapshots.get(name)
+        return taken[1] if taken is not None else None
+
+    def delete(self, name: str) -> bool:
+        return self.snapshots.pop(name, None) is not None
+
+    def diff(self,
+             base: tracemalloc.Snapshot,
+             target: tracemalloc.Snapshot,
+             group_by: str = 'lineno',
+             limit: int = 20) -> List[Dict[str, Any]]:
+        if group_by == 'route':
+            return self._diff_routes(base, target)[:limit]
+
+        result = []
+        for stat in target.compare_to(base, group_by)[:limit]:
+            frame = stat.traceback[0]
+            item = {'file': frame.filename}
+            if group_by == 'lineno':
+                item['line'] = frame.lineno
+            item.update(size=stat.size, size_diff=stat.size_diff,
+                        count=stat.count, count_diff=stat.count_diff)
+            result.append(item)
+        return result
+
+    def _diff_routes(self,
+                     base: tracemalloc.Snapshot,
+                     target: tracemalloc.Snapshot) -> List[Dict[str, Any]]:
+        routes: Dict[str, Dict[str, Any]] = {}
+        for stat in target.compare_to(base, 'traceback'):
+            route = get_traceback_route(stat.traceback, self.ranges)
+            item = routes.setdefault(route, {
+                'route': route, 'size': 0, 'size_diff': 0,
+                'count': 0, 'count_diff': 0
+            })
+            for key in ('size', 'size_diff', 'count', 'count_diff'):
+                item[key] += getattr(stat, key)
+        return sorted(routes.values(),
+                      key=lambda item: abs(item['size_diff']), reverse=True)
+
+
+# ---
+
+
+class TracemallocEndpoint:
+
+    include_in_schema = False
+
+    def __init__(self, tracer: AllocationTracer) -> None:
+        self.tracer = tracer
+
+    def get(self, request: Request) -> Response:
+        return JSONResponse(self.tracer.status())
+
+    def post(self, request: Request, nframe: int = 25) -> Response:
+        router = request.scope.get('router')
+        routes = get_route_codes(router) if router is not None else None
+        self.tracer.start(nframe, routes)
+        return JSONResponse(self.tracer.status())
+
+    def delete(self, request: Request) -> Response:
+        self.tracer.stop()
+        return JSONResponse(self.tracer.status())
+
+
+class SnapshotEndpoint:
+
+    include_in_schema = False
+
+    def __init__(self, tracer: AllocationTracer) -> None:
+        self.tracer = tracer
+
+    def put(self, request: Request, name: str) -> Response:
+        if not self.tracer.tracing:
+            raise HTTPConflict()
+        self.tracer.take(name)
+        return JSONResponse(self.tracer.status())
+
+    def delete(self, request: Request, name: str) -> Response:
+        if not self.tracer.delete(name):
+            raise HTTPNotFound()
+        return JSONResponse(self.tracer.status())
+
+
+class DiffEndpoint:
+
+    include_in_schema = False
+
+    def __init__(self, tracer: AllocationTracer) -> None:
+        self.tracer = tracer
+
+    def get(self,
+            request: Request,
+            base: str,
+            target: str = None,
+            group_by: Literal['lineno', 'filename', 'route'] = 'lineno',
+            limit: int = 20) -> Response:
+        if not self.tracer.tracing:
+            raise HTTPConflict()
+
+        base_snapshot = self.tracer.get(base)
+        target_snapshot = self.tracer.get(target)
+        if base_snapshot is None or target_snapshot is None:
+            raise HTTPNotFound()
+
+        return JSONResponse(self.tracer.diff(base_snapshot, target_snapshot,
+                                             group_by, limit))
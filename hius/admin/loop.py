@@ -0,0 +1,178 @@
+import sys
+import time
+import asyncio
+import threading
+import traceback
+from collections import deque
+from logging import getLogger
+from types import FrameType
+from typing import (
+    AsyncGenerator,
+    Optional,
+    Deque,
+    List,
+    Dict,
+    Any
+)
+from starlette.types import ASGIApp
+from hius.requests import Request
+from hius.responses import JSONResponse, Response
+from hius.metrics.exposition import metric_name
+from hius.metrics.store import MetricsStore
+from hius.routing.router import get_router
+from hius.admin.profiler import Routes, get_route_codes
+
+logger = getLogger('hius.loop')
+
+UNKNOWN = '<unknown>'
+
+
+def get_frame_route(frame: Optional[FrameType], routes: Routes) -> str:
+    while frame is not None:
+        route = routes.get(frame.f_code)
+        if route is not None:
+            return route
+        frame = frame.f_back
+    return UNKNOWN
+
+
+class Block:
+
+    __slots__ = 'started', 'duration', 'route', 'stack',
+
+    def __init__(self,
+                 started: float,
+                 route: str = UNKNOWN,
+                 stack: Optional[List[str]] = None) -> None:
+        self.started = started
+        self.duration = 0.0
+        self.route = route
+        self.stack = stack
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            'started': self.started,
+            'duration': self.duration,
+            'route': self.route,
+            'stack': self.stack
+        }
+
+
+# ---
+
+
+class LoopMonitor:
+
+    __slots__ = ('interval', 'threshold', 'store', 'name', 'blocks',
+                 'routes', '_last', '_pending', '_loop_thread', '_task',
+                 '_watchdog', '_stopped')
+
+    def __init__(self,
+                 interval: float = 0.05,
+                 threshold: float = 0.1,
+                 store: MetricsStore = None,
+                 name: str = 'hius_event_loop',
+                 keep: int = 100) -> None:
+        self.interval = interval
+        self.threshold = threshold
+        self.store = store
+        self.name = name
+        self.blocks: Deque[Block] = deque(maxlen=keep)
+        self.routes: Routes = {}
+
+        self._last = time.monotonic()
+        self._pending: Optional[Block] = None
+        self._loop_thread: Optional[int] = None
+        self._task: Optional[asyncio.Task] = None
+        self._watchdog: Optional[threading.Thread] = None
+        self._stopped = threading.Event()
+
+    async def lifespan(self, app: ASGIApp) -> AsyncGenerator:
+        self.start(app)
+        try:
+            yield
+        finally:
+            await self.stop()
+
+    def start(self, app: ASGIApp = None) -> None:
+        router = get_router(app)
+        if router is not None:
+            self.routes = get_route_codes(router)
+
+        self._last = time.monotonic()
+        self._loop_thread = threading.get_ident()
+        self._stopped.clear()
+
+        self._task = asyncio.get_running_loop().create_task(self._beat())
+        self._watchdog = threading.Thread(target=self._watch,
+                                          name='hius-loop-monitor',
+                                          daemon=True)
+        self._watchdog.start()
+
+    async def stop(self) -> None:
+        self._stopped.set()
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._watchdog.join()
+
+    # ---
+
+    async def _beat(self) -> None:
+        while True:
+            start = time.monotonic()
+            await asyncio.sleep(self.interval)
+            now = time.monotonic()
+            self._last = now
+
+            lag = max(now - start - self.interval, 0.0)
+            if self.store is not None:
+                self.store.observe(f'{self.name}_lag_seconds', lag)
+            if lag >= self.threshold:
+                self._report(start + self.interval, lag)
+
+    def _watch(self) -> None:
+        while not self._stopped.wait(self.threshold / 2):
+            last = self._last
+            stalled = time.monotonic() - last - self.interval
+            pending = self._pending
+            if stalled < self.threshold or (pending is not None and
+                                            pending.started >= last):
+                continue
+
+            frame = sys._current_frames().get(self._loop_thread)
+            self._pending = Block(last + self.interval,
+                                  get_frame_route(frame, self.routes),
+                                  traceback.format_stack(frame))
+
+    def _report(self, started: float, lag: float) -> None:
+        block = self._pending
+        if block is None or block.started < started - self.interval:
+            block = Block(started)
+        self._pending = None
+
+        block.duration = lag
+        self.blocks.append(block)
+
+        if self.store is not None:
+            self.store.inc(metric_name(f'{self.name}_blocked_total',
+                                       route=block.route))
+        logger.warning('event loop was blocked for %.3fs in route %s\n%s',
+                       lag, block.route, ''.join(block.stack or ()))
+
+
+class LoopMonitorEndpoint:
+
+    include_in_schema = False
+
+    def __init__(self, monitor: LoopMonitor) -> None:
+        self.monitor = monitor
+
+    def get(self, request: Request) -> Response:
+        return JSONResponse({
+            'interval': self.monitor.interval,
+            'threshold': self.monitor.threshold,
+            'blocks': [block.as_dict() for block in self.monitor.blocks]
+        })
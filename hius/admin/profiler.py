@@ -0,0 +1,188 @@
+import sys
+import time
+import threading
+from collections import Counter
+from types import CodeType, FrameType
+from typing import (
+    Optional,
+    Iterator,
+    Tuple,
+    List,
+    Dict,
+    Any
+)
+from starlette.concurrency import run_in_threadpool
+from hius.requests import Request
+from hius.responses import JSONResponse, PlainTextResponse, Response
+from hius.httpcodes import HTTPBadRequest, HTTPConflict
+from hius.routing.router import Router
+from hius.routing.endpoint import BaseEndpoint, HTTPClassEndpoint
+
+try:
+    from typing import Literal
+except ImportError:  # pragma: no cover
+    from typing_extensions import Literal
+
+Frame = Tuple[str, str, int]
+Stack = Tuple[str, Tuple[Frame, ...]]
+Routes = Dict[CodeType, str]
+
+SPEEDSCOPE_SCHEMA = 'https://www.speedscope.app/file-format-schema.json'
+
+
+def get_endpoint_codes(endpoint: BaseEndpoint) -> List[CodeType]:
+    if isinstance(endpoint, HTTPClassEndpoint):
+        functions = [getattr(endpoint._endpoint, method.lower())
+                     for method in endpoint.models]
+    else:
+        functions = [endpoint._endpoint]
+
+    return [function.__code__ for function in functions
+            if hasattr(function, '__code__')]
+
+
+def get_route_codes(router: Router) -> Routes:
+    codes = {}
+    for _, route in router.iter_http_routes():
+        for code in get_endpoint_codes(route.endpoint):
+            codes[code] = route.name
+    return codes
+
+
+def _code_name(code: CodeType) -> str:
+    return getattr(code, 'co_qualname', code.co_name)
+
+
+# ---
+
+
+class Sampler:
+
+    __slots__ = 'interval', 'routes', 'samples', 'duration', '_thread_names'
+
+    def __init__(self,
+                 interval: float = 0.005,
+                 routes: Optional[Routes] = None) -> None:
+        self.interval = interval
+        self.routes = routes or {}
+        self.samples: Counter = Counter()
+        self.duration = 0.0
+        self._thread_names: Dict[int, str] = {}
+
+    def run(self, seconds: float) -> None:
+        ident = threading.get_ident()
+        start = time.perf_counter()
+        deadline = start + seconds
+        while True:
+            self.sample(exclude=ident)
+            now = time.perf_counter()
+            if now >= deadline:
+                break
+            time.sleep(min(self.interval, deadline - now))
+        self.duration = time.perf_counter() - start
+
+    def sample(self, exclude: Optional[int] = None) -> None:
+        self._thread_names = {thread.ident: thread.name
+                              for thread in threading.enumerate()}
+        for ident, frame in sys._current_frames().items():
+            if ident != exclude:
+                self.samples[self._get_stack(ident, frame)] += 1
+
+    def _get_stack(self, ident: int, frame: FrameType) -> Stack:
+        frames, root = [], None
+        while frame is not None:
+            code = frame.f_code
+            route = self.routes.get(code)
+            if route is not None:
+                root = f'route:{route}'
+            frames.append((code.co_filename, _code_name(code),
+                           code.co_firstlineno))
+            frame = frame.f_back
+
+        if root is None:
+            root = self._thread_names.get(ident, f'thread-{ident}')
+        frames.reverse()
+        return root, tuple(frames)
+
+    # ---
+
+    def collapsed(self) -> str:
+        lines = []
+        for (root, frames), count in self.samples.most_common():
+            names = ';'.join(f'{name} ({filename}:{line})'
+                             for filename, name, line in frames)
+            lines.append(f'{root};{names} {count}')
+        lines.append('')
+        return '\n'.join(lines)
+
+    def speedscope(self, name: str = 'hius') -> Dict[str, Any]:
+        frames: Dict[Frame, int] = {}
+        samples, weights = [], []
+        for (root, stack), count in self.samples.most_common():
+            sample = [frames.setdefault(('', root, 0), len(frames))]
+            sample.extend(frames.setdefault(frame, len(frames))
+                          for frame in stack)
+            samples.append(sample)
+            weights.append(count * self.interval)
+
+        return {
+            '$schema': SPEEDSCOPE_SCHEMA,
+            'name': name,
+            'exporter': 'hius',
+            'shared': {'frames': list(self._frames(frames))},
+            'profiles': [{
+                'type': 'sampled',
+                'name': name,
+                'unit': 'seconds',
+                'startValue': 0,
+                'endValue': sum(weights),
+                'samples': samples,
+                'weights': weights
+            }]
+        }
+
+    def _frames(self, frames: Dict[Frame, int]) -> Iterator[Dict[str, Any]]:
+        for filename, name, line in frames:
+            if filename:
+                yield {'name': name, 'file': filename, 'line': line}
+            else:
+                yield {'name': name}
+
+
+# ---
+
+
+class ProfilerEndpoint:
+
+    include_in_schema = False
+
+    def __init__(self, max_seconds: float = 60.0) -> None:
+        self.max_seconds = max_seconds
+        self._lock = threading.Lock()
+
+    async def get(self,
+                  request: Request,
+                  seconds: float = 5.0,
+                  interval: float = 0.005,
+                  output: Literal['collapsed', 'speedscope'] = 'collapsed'
+                  ) -> Response:
+        if not 0 < seconds <= self.max_seconds or interval <= 0:
+            raise HTTPBadRequest()
+        if not self._lock.acquire(blocking=False):
+            raise HTTPConflict()
+
+        try:
+            sampler = Sampler(interval, self._get_routes(request))
+            await run_in_threadpool(sampler.run, seconds)
+        finally:
+            self._lock.release()
+
+        if output == 'speedscope':
+            return JSONResponse(sampler.speedscope())
+        return PlainTextResponse(sampler.collapsed())
+
+    def _get_routes(self, request: Request) -> Routes:
+        router = request.scope.get('router')
+        if router is None:
+            return {}  # pragma: no cover
+        return get_route_codes(router)
@@ -0,0 +1,178 @@
+import sys
+import json
+import atexit
+import asyncio
+import traceback
+from queue import SimpleQueue
+from time import perf_counter
+from logging import Handler, Logger, LogRecord, StreamHandler, getLogger
+from logging.handlers import QueueHandler, QueueListener
+from typing import (
+    Optional,
+    Sequence,
+    List,
+    Dict,
+    Any
+)
+from starlette.types import Scope, Receive, Send, ASGIApp, Message
+from hius.routing.timing import TIMING, Timing, get_timing
+from hius.admin.profiler import get_endpoint_codes
+
+_listeners: Dict[str, QueueListener] = {}
+
+
+class RecordQueueHandler(QueueHandler):
+    def prepare(self, record: LogRecord) -> LogRecord:
+        return record
+
+
+def get_queue_logger(name: str,
+                     handlers: Sequence[Handler] = ()) -> Logger:
+    logger = getLogger(name)
+    if name not in _listeners:
+        queue = SimpleQueue()
+        listener = QueueListener(queue, *(handlers or [StreamHandler()]),
+                                 respect_handler_level=True)
+        logger.addHandler(RecordQueueHandler(queue))
+        logger.propagate = False
+
+        listener.start()
+        atexit.register(listener.stop)
+        _listeners[name] = listener
+    return logger
+
+
+def stop_queue_logger(name: str) -> None:
+    listener = _listeners.pop(name, None)
+    if listener is None:
+        return
+
+    listener.stop()
+    atexit.unregister(listener.stop)
+    logger = getLogger(name)
+    for handler in list(logger.handlers):
+        if isinstance(handler, RecordQueueHandler):
+            logger.removeHandler(handler)
+    logger.propagate = True
+
+
+# ---
+
+
+class SlowRequestMiddleware:
+    def __init__(self,
+                 app: ASGIApp,
+                 threshold: float = 1.0,
+                 stack: bool = True,
+                 name: str = 'hius.slow',
+                 handlers: Sequence[Handler] = ()) -> None:
+        self.app = app
+        self.threshold = threshold
+        self.stack = stack
+        self.logger = get_queue_logger(name, handlers)
+
+    async def __call__(self,
+                       scope: Scope,
+                       receive: Receive,
+                       send: Send) -> None:
+        if scope['type'] != 'http' or 'hius.warmup' in scope:
+            await self.app(scope, receive, send)
+            return
+
+        timing = get_timing(scope)
+        if timing is None:
+            timing = Timing()
+            scope['extensions'] = {**scope.get('extensions', {}),
+                                   TIMING: timing}
+
+        status = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status
+            if message['type'] == 'http.response.start':
+                status = message['status']
+            await send(message)
+
+        stack: List[Optional[List[str]]] = [None]
+        timer = None
+        if self.stack:
+            timer = asyncio.get_running_loop().call_later(
+                self.threshold, self._sample, scope,
+                asyncio.current_task(), stack)
+
+        start = perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            duration = perf_counter() - start
+            if timer is not None:
+                timer.cancel()
+            if duration >= self.threshold:
+                self.log(scope, status, duration, timing, stack[0])
+
+    def _sample(self,
+                scope: Scope,
+                task: Optional[asyncio.Task],
+                stack: List[Optional[List[str]]]) -> None:
+        stack[0] = get_request_stack(scope, task)
+
+    def log(self,
+            scope: Scope,
+            status: int,
+            duration: float,
+            timing: Timing,
+            stack: Optional[List[str]]) -> None:
+        route = scope.get('route')
+        record = {
+            'method': scope['method'],
+            'path': scope['path'],
+            'route': route.name if route is not None else None,
+            'status': status,
+            'duration': round(duration, 6),
+            'path_params': scope.get('path_params', {}),
+            'params': scope.get('hius.params', {}),
+            'stages': {stage: round(value / 1e6, 3)
+                       for stage, value in timing.stages.items()},
+            'stack': stack
+        }
+        self.logger.warning('slow request %s', SlowRecord(record),
+                            extra={'request': record})
+
+
+class SlowRecord:
+
+    __slots__ = 'data',
+
+    def __init__(self, data: Dict[str, Any]) -> None:
+        self.data = data
+
+    def __str__(self) -> str:
+        return json.dumps(self.data, default=str)
+
+
+def get_request_stack(scope: Scope,
+                      task: Optional[asyncio.Task]) -> Optional[List[str]]:
+    route = scope.get('route')
+    if route is not None and hasattr(route, 'endpoint'):
+        codes = set(get_endpoint_codes(route.endpoint))
+        for frame in sys._current_frames().values():
+            current = frame
+            while current is not None:
+                if current.f_code in codes:
+                    return traceback.format_stack(frame)
+                current = current.f_back
+
+    if task is None:
+        return None  # pragma: no cover
+    lines = []
+    get_coro = getattr(task, 'get_coro', None)
+    awaitable = get_coro() if get_coro else getattr(task, '_coro', None)
+    while awaitable is not None:
+        frame = getattr(awaitable, 'cr_frame', None)
+        if frame is None:
+            frame = getattr(awaitable, 'gi_frame', None)
+        if frame is not None:
+            lines.extend(traceback.format_stack(frame, limit=1))
+        awaitable = (getattr(awaitable, 'cr_await', None) or
+                     getattr(awaitable, 'gi_yieldfrom', None))
+    return lines
@@ -1,5 +1,7 @@
 from typing import (
+    TYPE_CHECKING,
     Callable,
+    Optional,
     Sequence,
     Union,
     Dict,
@@ -9,16 +11,26 @@ from typing import (
 from starlette.middleware.exceptions import ExceptionMiddleware
 from starlette.middleware.errors import ServerErrorMiddleware
 from starlette.types import Scope, Receive, Send, ASGIApp
-from hius.types import ExceptionHandlers, LifespanGenerator
+from hius.types import ExceptionHandlers, LifespanGenerator, Middleware
 from hius.handlers.exceptions import validation_error_handler
-from hius.openapi.middleware import OpenAPIMiddleware
+from hius.openapi.endpoints import create_openapi, get_openapi_routes
 from hius.openapi.config import OpenAPIConfig
 from hius.routing.exceptions import HTTPValidationError
 from hius.routing.lifespan import Lifespan
+from hius.routing.hooks import Hook
+from hius.routing.report import Report
+from hius.routing.drain import RequestTracker
+from hius.routing.memory import Thresholds
+from hius.routing.warmup import WarmupRequest, get_warmup_hooks
 from hius.routing.routes import BaseRoute
-from hius.routing.utils import URLPath
+from hius.routing.utils import URLPath, build_middleware_stack
 from hius.routing import Router
 
+if TYPE_CHECKING:  # pragma: no cover
+    from hius.metrics.recorder import RequestMetrics
+
+DEFAULT = object()
+
 
 class Hius:
     def __init__(self,
@@ -28,19 +40,59 @@ class Hius:
                  on_startup: Sequence[Callable] = None,
                  on_shutdown: Sequence[Callable] = None,
                  on_lifespan: Sequence[LifespanGenerator] = None,
-                 openapi_config: OpenAPIConfig = None) -> None:
+                 concurrent_lifespan: bool = False,
+                 log_report: bool = False,
+                 drain_timeout: float = None,
+                 reject_on_drain: bool = False,
+                 warmup: Union[bool, Sequence[WarmupRequest]] = False,
+                 gc_freeze: bool = False,
+                 gc_thresholds: Thresholds = None,
+                 metrics: 'RequestMetrics' = None,
+                 openapi_config: Optional[OpenAPIConfig] = DEFAULT) -> None:
         self.debug = debug
-        self.openapi_config = openapi_config or OpenAPIConfig()
-
-        lifespan = Lifespan(on_startup, on_shutdown, on_lifespan)
-        self.router = Router(routes=routes, lifespan=lifespan)
+        if openapi_config is DEFAULT:
+            openapi_config = OpenAPIConfig()
+        self.openapi_config = openapi_config
+
+        self.report = Report()
+        self.tracker = None
+        if drain_timeout is not None:
+            self.tracker = RequestTracker(reject_on_drain)
+
+        lifespan = Lifespan(on_startup, on_shutdown, on_lifespan,
+                            concurrent=concurrent_lifespan,
+                            report=self.report,
+                            log_report=log_report,
+                            tracker=self.tracker,
+                            drain_timeout=drain_timeout,
+                            gc_freeze=gc_freeze,
+                            gc_thresholds=gc_thresholds)
+        self.router = Router(lifespan=lifespan, metrics=metrics)
+        if metrics is not None:
+            lifespan.on_lifespan.append(Hook(metrics.lifespan,
+                                             name='metrics'))
+
+        self.openapi = None
+        if self.openapi_config is not None:
+            with self.report.measure('init', 'openapi'):
+                self.openapi = create_openapi(self.router,
+                                              self.openapi_config)
+                self.add_routes(get_openapi_routes(self.openapi))
+        if routes is not None:
+            with self.report.measure('init', 'routes'):
+                self.add_routes(routes)
 
         self.exception_handlers = self.set_exc_handlers(exception_handlers)
 
         self.baggage = {}
 
         self.middleware = []
-        self.middleware_stack = self.build_middleware_stack()
+        with self.report.measure('init', 'middleware'):
+            self.middleware_stack = self.build_middleware_stack()
+
+        if warmup:
+            requests = () if warmup is True else warmup
+            lifespan.on_warmup.extend(get_warmup_hooks(self, requests))
 
     def __setitem__(self, key: str, value: Any) -> None:
         self.baggage[key] = value
@@ -53,7 +105,10 @@ class Hius:
                        receive: Receive,
                        send: Send) -> None:
         self._set_scope_self(scope)
-        await self.middleware_stack(scope, receive, send)
+        if self.tracker is None or scope['type'] == 'lifespan':
+            await self.middleware_stack(scope, receive, send)
+        else:
+            await self.tracker(self.middleware_stack, scope, receive, send)
 
     def _set_scope_self(self, scope: Scope) -> None:
         if 'app' not in scope:
@@ -79,16 +134,11 @@ class Hius:
 
         middleware = (
             (ServerErrorMiddleware, {'handler': err_handler, 'debug': debug}),
-            (OpenAPIMiddleware, {'router': self.router,
-                                 'config': self.openapi_config}),
             *self.middleware,
             (ExceptionMiddleware, {'handlers': exc_handlers, 'debug': debug})
         )
 
-        app = self.router
-        for cls, options in reversed(middleware):
-            app = cls(app=app, **options)
-        return app
+        return build_middleware_stack(self.router, middleware)
 
     def url_path_for(self, name: str, **path_params: str) -> URLPath:
         return self.router.url_path_for(name, **path_params)
@@ -102,14 +152,16 @@ class Hius:
                   path: str,
                   endpoint: Callable,
                   methods: Sequence[str] = None,
-                  name: str = None) -> None:
-        self.router._route(path, endpoint, methods, name)
+                  name: str = None,
+                  middleware: Middleware = None) -> None:
+        self.router._route(path, endpoint, methods, name, middleware)
 
     def add_websocket(self,
                       path: str,
                       endpoint: Callable,
-                      name: str = None) -> None:
-        self.router._websocket(path, endpoint, name)
+                      name: str = None,
+                      middleware: Middleware = None) -> None:
+        self.router._websocket(path, endpoint, name, middleware)
 
     def add_middleware(self,
                        mw_cls: ASGIApp,
@@ -126,24 +178,27 @@ class Hius:
     def mount(self,
               path: str,
               app: ASGIApp,
-              name: str = None) -> None:
-        self.router._mount(path, None, app, name)
+              name: str = None,
+              middleware: Middleware = None) -> None:
+        self.router._mount(path, None, app, name, middleware)
 
     # ---
 
     def route(self,
               path: str,
               methods: Sequence[str] = None,
-              name: str = None) -> Callable:
+              name: str = None,
+              middleware: Middleware = None) -> Callable:
         def decorator(endpoint: Callable) -> None:
-            self.router._route(path, endpoint, methods, name)
+            self.router._route(path, endpoint, methods, name, middleware)
         return decorator
 
     def websocket(self,
                   path: str,
-                  name: str = None) -> Callable:
+                  name: str = None,
+                  middleware: Middleware = None) -> Callable:
         def decorator(endpoint: Callable) -> None:
-            self.router._websocket(path, endpoint, name)
+            self.router._websocket(path, endpoint, name, middleware)
         return decorator
 
     def exception_handler(self,
@@ -154,17 +209,29 @@ class Hius:
 
     # ---
 
-    def on_startup(self) -> Callable:
+    def on_startup(self,
+                   name: str = None,
+                   depends: Sequence[str] = (),
+                   timeout: float = None) -> Callable:
         def decorator(func: Callable) -> None:
-            self.router.lifespan.on_startup.append(func)
+            hook = Hook(func, name, depends, timeout)
+            self.router.lifespan.on_startup.append(hook)
         return decorator
 
-    def on_shutdown(self) -> Callable:
+    def on_shutdown(self,
+                    name: str = None,
+                    depends: Sequence[str] = (),
+                    timeout: float = None) -> Callable:
         def decorator(func: Callable) -> None:
-            self.router.lifespan.on_shutdown.append(func)
+            hook = Hook(func, name, depends, timeout)
+            self.router.lifespan.on_shutdown.append(hook)
         return decorator
 
-    def on_lifespan(self) -> Callable:
+    def on_lifespan(self,
+                    name: str = None,
+                    depends: Sequence[str] = (),
+                    timeout: float = None) -> Callable:
         def decorator(func: Callable) -> None:
-            self.router.lifespan.on_lifespan.append(func)
+            hook = Hook(func, name, depends, timeout)
+            self.router.lifespan.on_lifespan.append(hook)
         return decorator
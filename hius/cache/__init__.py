@@ -0,0 +1,7 @@
+from hius.cache.shared import SharedCache
+from hius.cache.middleware import CacheMiddleware
+
+__all__ = [
+    'SharedCache',
+    'CacheMiddleware'
+]
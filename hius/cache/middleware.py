@@ -0,0 +1,119 @@
+import marshal
+from typing import (
+    Callable,
+    Optional,
+    Sequence,
+    List
+)
+from starlette.datastructures import Headers
+from starlette.types import Scope, Receive, Send, ASGIApp, Message
+from hius.cache.shared import SharedCache
+
+KeyFunc = Callable[[Scope], Optional[bytes]]
+
+UNCACHEABLE = ('no-store', 'private')
+BYPASS = ('authorization', 'cookie', 'range')
+
+
+class CacheMiddleware:
+    def __init__(self,
+                 app: ASGIApp,
+                 backend: SharedCache,
+                 ttl: float = 60.0,
+                 vary: Sequence[str] = ('accept-encoding',),
+                 statuses: Sequence[int] = (200,),
+                 key: KeyFunc = None) -> None:
+        self.app = app
+        self.backend = backend
+        self.ttl = ttl
+        self.vary = tuple(name.lower() for name in vary)
+        self.statuses = statuses
+        self.key = key or self.get_key
+
+    async def __call__(self,
+                       scope: Scope,
+                       receive: Receive,
+                       send: Send) -> None:
+        if scope['type'] != 'http' or scope['method'] not in ('GET', 'HEAD'):
+            await self.app(scope, receive, send)
+            return
+
+        key = self.key(scope)
+        if key is None:
+            await self.app(scope, receive, send)
+            return
+
+        cached = self.backend.get(key)
+        if cached is not None:
+            await self._send_cached(scope, send, cached)
+            return
+
+        await self.app(scope, receive, self._wrap_send(scope, send, key))
+
+    def get_key(self, scope: Scope) -> Optional[bytes]:
+        headers = Headers(scope=scope)
+        if any(name in headers for name in BYPASS):
+            return None
+
+        parts = [scope.get('root_path', '') + scope['path'],
+                 scope['query_string'].decode('latin-1')]
+        parts.extend(headers.get(name, '') for name in self.vary)
+        return '\n'.join(parts).encode()
+
+    async def _send_cached(self,
+                           scope: Scope,
+                           send: Send,
+                           cached: bytes) -> None:
+        status, headers, body = marshal.loads(cached)
+        await send({'type': 'http.response.start',
+                    'status': status,
+                    'headers': headers})
+        await send({'type': 'http.response.body',
+                    'body': b'' if scope['method'] == 'HEAD' else body})
+
+    def _wrap_send(self, scope: Scope, send: Send, key: bytes) -> Send:
+        start: Optional[Message] = None
+        chunks: List[bytes] = []
+        size = 0
+        cacheable = scope['method'] == 'GET'
+
+        async def wrapped(message: Message) -> None:
+            nonlocal start, size, cacheable
+            if message['type'] == 'http.response.start':
+                start = message
+                cacheable = cacheable and self._is_cacheable(message)
+            elif message['type'] == 'http.response.body' and cacheable:
+                chunks.append(message.get('body', b''))
+                size += len(chunks[-1])
+                if size > self.backend.item_size:
+                    cacheable = False
+                    chunks.clear()
+                elif not message.get('more_body', False):
+                    self._store(key, start, b''.join(chunks))
+            await send(message)
+
+        return wrapped
+
+    def _is_cacheable(self, message: Message) -> bool:
+        if message['status'] not in self.statuses:
+            return False
+
+        headers = Headers(raw=message.get('headers', []))
+        if 'set-cookie' in headers or not self._is_varied(headers):
+            return False
+        cache_control = headers.get('cache-control', '').lower()
+        return not any(value in cache_control for value in UNCACHEABLE)
+
+    def _is_varied(self, headers: Headers) -> bool:
+        for value in headers.getlist('vary'):
+            for name in value.split(','):
+                name = name.strip().lower()
+                if name and name not in self.vary:
+                    return False
+        return True
+
+    def _store(self, key: bytes, start: Message, body: bytes) -> None:
+        headers = [(bytes(name), bytes(value))
+                   for name, value in start.get('headers', [])]
+        value = marshal.dumps((start['status'], headers, body))
+        self.backend.set(key, value, self.ttl)
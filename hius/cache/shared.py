@@ -0,0 +1,179 @@
+import os
+import mmap
+import time
+import fcntl
+import struct
+import hashlib
+import tempfile
+import threading
+from contextlib import contextmanager
+from typing import (
+    BinaryIO,
+    Iterator,
+    Optional
+)
+
+MAGIC = b'HIUSCAC1'
+HEADER = struct.Struct('8sQQQ')
+ENTRY = struct.Struct('QQddII')
+EMPTY = 0
+
+
+def hash_key(key: bytes) -> int:
+    value = int.from_bytes(hashlib.blake2b(key, digest_size=8).digest(),
+                           'little')
+    return value or 1
+
+
+class SharedCache:
+
+    __slots__ = ('path', 'sets', 'ways', 'item_size', '_file', '_mmap',
+                 '_entry_size', '_thread_lock')
+
+    def __init__(self,
+                 capacity: int = 1024,
+                 item_size: int = 64 * 1024,
+                 ways: int = 4,
+                 path: Optional[str] = None) -> None:
+        self.path = path
+        self.ways = ways
+        self.sets = max(1, -(-capacity // ways))
+        self.item_size = item_size
+
+        self._entry_size = -(-(ENTRY.size + item_size) // 8) * 8
+        self._thread_lock = threading.Lock()
+
+        self._file = self._open()
+        self._mmap = mmap.mmap(self._file.fileno(), self._size)
+
+    @property
+    def capacity(self) -> int:
+        return self.sets * self.ways
+
+    @property
+    def _size(self) -> int:
+        return HEADER.size + self.capacity * self._entry_size
+
+    def _open(self) -> BinaryIO:
+        if self.path is None:
+            file = tempfile.TemporaryFile()
+        else:
+            fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+            file = os.fdopen(fd, 'r+b')
+
+        header = HEADER.pack(MAGIC, self.sets, self.ways, self.item_size)
+        with self._lock(file):
+            if (os.fstat(file.fileno()).st_size != self._size or
+                    file.read(HEADER.size) != header):
+                file.truncate(0)
+                file.truncate(self._size)
+                file.seek(0)
+                file.write(header)
+                file.flush()
+        return file
+
+    @contextmanager
+    def _lock(self, file: BinaryIO = None) -> Iterator[None]:
+        fileno = (file or self._file).fileno()
+        with self._thread_lock:
+            fcntl.lockf(fileno, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.lockf(fileno, fcntl.LOCK_UN)
+
+    def close(self) -> None:
+        self._mmap.close()
+        self._file.close()
+
+    def _offsets(self, key_hash: int) -> range:
+        set_size = self.ways * self._entry_size
+        start = HEADER.size + (key_hash % self.sets) * set_size
+        return range(start, start + set_size, self._entry_size)
+
+    # ---
+
+    def get(self, key: bytes) -> Optional[bytes]:
+        key_hash = hash_key(key)
+        now = time.time()
+        for offset in self._offsets(key_hash):
+            version, entry_hash, expires, _, key_size, value_size = (
+                ENTRY.unpack_from(self._mmap, offset))
+            if entry_hash != key_hash or version & 1:
+                continue
+
+            start = offset + ENTRY.size
+            data = self._mmap[start:start + key_size + value_size]
+            if ENTRY.unpack_from(self._mmap, offset)[0] != version:
+                return None
+            if data[:key_size] != key:
+                continue
+            if expires < now:
+                return None
+
+            struct.pack_into('d', self._mmap, offset + 24, now)
+            return data[key_size:]
+        return None
+
+    def set(self, key: bytes, value: bytes, ttl: float) -> bool:
+        if len(key) + len(value) > self.item_size:
+            return False
+
+        key_hash = hash_key(key)
+        now = time.time()
+        with self._lock():
+            offset = self._choose(key_hash, key, now)
+            version = ENTRY.unpack_from(self._mmap, offset)[0]
+
+            struct.pack_into('Q', self._mmap, offset, version + 1)
+            start = offset + ENTRY.size
+            self._mmap[start:start + len(key) + len(value)] = key + value
+            ENTRY.pack_into(self._mmap, offset, version + 2, key_hash,
+                            now + ttl, now, len(key), len(value))
+        return True
+
+    def _choose(self, key_hash: int, key: bytes, now: float) -> int:
+        free, victim, victim_accessed = None, None, None
+        for offset in self._offsets(key_hash):
+            _, entry_hash, expires, accessed, key_size, _ = (
+                ENTRY.unpack_from(self._mmap, offset))
+            if entry_hash == key_hash:
+                start = offset + ENTRY.size
+                if self._mmap[start:start + key_size] == key:
+                    return offset
+            if free is None and (entry_hash == EMPTY or expires < now):
+                free = offset
+            if victim is None or accessed < victim_accessed:
+                victim, victim_accessed = offset, accessed
+        return victim if free is None else free
+
+    def delete(self, key: bytes) -> bool:
+        key_hash = hash_key(key)
+        with self._lock():
+            for offset in self._offsets(key_hash):
+                version, entry_hash, _, _, key_size, _ = (
+                    ENTRY.unpack_from(self._mmap, offset))
+                start = offset + ENTRY.size
+                if (entry_hash == key_hash and
+                        self._mmap[start:start + key_size] == key):
+                    self._clear(offset, version)
+                    return True
+        return False
+
+    def clear(self) -> None:
+        with self._lock():
+            for offset in range(HEADER.size, self._size, self._entry_size):
+                self._clear(offset, ENTRY.unpack_from(self._mmap, offset)[0])
+
+    def _clear(self, offset: int, version: int) -> None:
+        ENTRY.pack_into(self._mmap, offset, version + 2, EMPTY, 0, 0, 0, 0)
+
+    def __len__(self) -> int:
+        now = time.time()
+        count = 0
+        for offset in range(HEADER.size, self._size, self._entry_size):
+            _, entry_hash, expires, _, _, _ = (
+                ENTRY.unpack_from(self._mmap, offset))
+            if entry_hash != EMPTY and expires >= now:
+                count += 1
+        return count
@@ -0,0 +1,144 @@
+import os
+import gzip
+from mimetypes import guess_type
+from argparse import ArgumentParser
+from typing import Callable, Optional, Sequence, Dict, Set
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover
+    brotli = None
+
+SUFFIXES = {'br': '.br', 'gzip': '.gz'}
+COMPRESSIBLE_TYPES = {
+    'application/javascript',
+    'application/json',
+    'application/manifest+json',
+    'application/wasm',
+    'application/xml',
+    'image/svg+xml',
+    'image/x-icon',
+    'image/vnd.microsoft.icon'
+}
+
+
+def _compress_gzip(data: bytes) -> bytes:
+    return gzip.compress(data, compresslevel=9, mtime=0)
+
+
+def _compress_br(data: bytes) -> bytes:
+    return brotli.compress(data, quality=11)
+
+
+COMPRESSORS = {'br': _compress_br, 'gzip': _compress_gzip}
+
+
+def get_accepted_encodings(header: str) -> Set[str]:
+    accepted = set()
+    for value in header.split(','):
+        encoding, _, params = value.partition(';')
+        if _get_quality(params) > 0:
+            accepted.add(encoding.strip())
+    return accepted
+
+
+def _get_quality(params: str) -> float:
+    try:
+        return float(params.strip().partition('q=')[2] or 1)
+    except ValueError:
+        return 0
+
+
+def get_encodings() -> Sequence[str]:
+    if brotli is None:
+        return ('gzip',)  # pragma: no cover
+    return ('br', 'gzip')
+
+
+def is_compressible(path: str) -> bool:
+    media_type = guess_type(path)[0]
+    if media_type is None:
+        return False
+    return media_type.startswith('text/') or media_type in COMPRESSIBLE_TYPES
+
+
+def _get_compressors(encodings: Optional[Sequence[str]]
+                     ) -> Dict[str, Callable[[bytes], bytes]]:
+    compressors = {}
+    for encoding in encodings or get_encodings():
+        if encoding not in COMPRESSORS:
+            raise ValueError(f'unsupported encoding: {encoding}')
+        if encoding == 'br' and brotli is None:
+            raise RuntimeError('"brotli" must be installed '
+                               'to create .br files')  # pragma: no cover
+        compressors[encoding] = COMPRESSORS[encoding]
+    return compressors
+
+
+def _is_outdated(path: str, sidecar: str) -> bool:
+    try:
+        return os.stat(sidecar).st_mtime < os.stat(path).st_mtime
+    except FileNotFoundError:
+        return True
+
+
+def compress_file(path: str,
+                  compressors: Dict[str, Callable[[bytes], bytes]],
+                  min_size: int = 256) -> int:
+    if os.path.getsize(path) < min_size:
+        return 0
+
+    created = 0
+    data = None
+    for encoding, compressor in compressors.items():
+        sidecar = path + SUFFIXES[encoding]
+        if not _is_outdated(path, sidecar):
+            continue
+
+        if data is None:
+            with open(path, 'rb') as file:
+                data = file.read()
+
+        compressed = compressor(data)
+        if len(compressed) >= len(data):
+            continue
+
+        with open(sidecar, 'wb') as file:
+            file.write(compressed)
+        created += 1
+    return created
+
+
+def compress_directory(directory: str,
+                       encodings: Sequence[str] = None,
+                       min_size: int = 256) -> int:
+    compressors = _get_compressors(encodings)
+    sidecar_suffixes = tuple(SUFFIXES.values())
+
+    created = 0
+    for root, _, files in os.walk(directory):
+        for name in files:
+            if name.endswith(sidecar_suffixes) or not is_compressible(name):
+                continue
+            path = os.path.join(root, name)
+            created += compress_file(path, compressors, min_size)
+    return created
+
+
+def main(args: Sequence[str] = None) -> None:
+    parser = ArgumentParser(
+        prog='python -m hius.handlers.compress',
+        description='Create precompressed .br/.gz copies of static files'
+    )
+    parser.add_argument('directory', nargs='+')
+    parser.add_argument('--encoding', action='append', choices=COMPRESSORS)
+    parser.add_argument('--min-size', type=int, default=256)
+    args = parser.parse_args(args)
+
+    for directory in args.directory:
+        created = compress_directory(directory, args.encoding, args.min_size)
+        print(f'{directory}: {created} files created')
+
+
+if __name__ == '__main__':
+    main()  # pragma: no cover
@@ -0,0 +1,85 @@
+import os
+from collections import OrderedDict
+from typing import Optional, List, Tuple
+from starlette.datastructures import Headers
+from hius.responses import Response
+
+RawHeaders = List[Tuple[bytes, bytes]]
+
+
+class CachedResponse(Response):
+    def __init__(self, body: bytes, raw_headers: RawHeaders) -> None:
+        self.status_code = 200
+        self.background = None
+        self.body = body
+        self.raw_headers = raw_headers
+
+
+class CachedFile:
+
+    __slots__ = 'full_path', 'mtime', 'size', 'content', 'headers',
+
+    def __init__(self,
+                 full_path: str,
+                 stat_result: os.stat_result,
+                 content: bytes,
+                 headers: Headers) -> None:
+        self.full_path = full_path
+        self.mtime = stat_result.st_mtime_ns
+        self.size = stat_result.st_size
+        self.content = content
+        self.headers = headers
+
+    def is_fresh(self) -> bool:
+        try:
+            stat_result = os.stat(self.full_path)
+        except OSError:
+            return False
+        return (stat_result.st_mtime_ns == self.mtime and
+                stat_result.st_size == self.size)
+
+    def response(self, method: str) -> Response:
+        if method == 'HEAD':
+            return CachedResponse(b'', self.headers.raw)
+        return CachedResponse(self.content, self.headers.raw)
+
+
+class FileCache:
+    def __init__(self, size: int, file_size: int) -> None:
+        self.size = size
+        self.file_size = file_size
+
+        self.used = 0
+        self.entries = OrderedDict()
+
+    def get(self, path: str) -> Optional[CachedFile]:
+        entry = self.entries.get(path)
+        if entry is None:
+            return
+
+        if not entry.is_fresh():
+            self.pop(path)
+            return
+
+        self.entries.move_to_end(path)
+        return entry
+
+    def put(self, path: str, entry: CachedFile) -> None:
+        self.pop(path)
+        if entry.size > self.size:
+            return
+
+        self.entries[path] = entry
+        self.used += entry.size
+
+        while self.used > self.size:
+            _, expired = self.entries.popitem(last=False)
+            self.used -= expired.size
+
+    def pop(self, path: str) -> None:
+        entry = self.entries.pop(path, None)
+        if entry is not None:
+            self.used -= entry.size
+
+    def is_cacheable(self, stat_result: os.stat_result) -> bool:
+        return stat_result.st_size <= self.file_size
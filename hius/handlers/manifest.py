@@ -0,0 +1,113 @@
+import os
+import stat
+from hashlib import sha1
+from mimetypes import guess_type
+from typing import Optional, Sequence, Tuple
+
+Lookup = Tuple[str, Optional[os.stat_result]]
+
+
+class ManifestEntry:
+
+    __slots__ = 'full_path', 'stat_result', 'etag', 'media_type', 'url',
+
+    def __init__(self,
+                 full_path: str,
+                 stat_result: os.stat_result,
+                 etag: Optional[str] = None,
+                 url: Optional[str] = None) -> None:
+        self.full_path = full_path
+        self.stat_result = stat_result
+        self.etag = etag
+        self.media_type = guess_type(full_path)[0]
+        self.url = url
+
+    def is_same(self, stat_result: os.stat_result) -> bool:
+        return (self.stat_result.st_mtime_ns == stat_result.st_mtime_ns and
+                self.stat_result.st_size == stat_result.st_size)
+
+
+class Manifest:
+    def __init__(self) -> None:
+        self.entries = {}
+        self.fingerprints = {}
+
+    def get(self, path: str) -> Optional[ManifestEntry]:
+        return self.entries.get(path)
+
+    def lookup(self, path: str) -> Lookup:
+        entry = self.entries.get(os.path.normpath(path))
+        if entry is None:
+            return '', None
+        return entry.full_path, entry.stat_result
+
+    def get_url(self, path: str) -> Optional[str]:
+        entry = self.entries.get(os.path.normpath(path))
+        if entry is not None:
+            return entry.url
+
+    @classmethod
+    def scan(cls,
+             directories: Sequence[str],
+             previous: 'Manifest' = None) -> 'Manifest':
+        manifest = cls()
+        for directory in directories:
+            manifest._scan_directory(os.path.realpath(directory), previous)
+        return manifest
+
+    def _scan_directory(self,
+                        directory: str,
+                        previous: Optional['Manifest']) -> None:
+        self._add_entry(os.curdir, directory, directory, previous)
+        for root, dirs, files in os.walk(directory):
+            for name in dirs + files:
+                full_path = os.path.join(root, name)
+                path = os.path.relpath(full_path, directory)
+                self._add_entry(path, full_path, directory, previous)
+
+    def _add_entry(self,
+                   path: str,
+                   full_path: str,
+                   directory: str,
+                   previous: Optional['Manifest']) -> None:
+        if path in self.entries or not self._is_inside(full_path, directory):
+            return
+
+        try:
+            stat_result = os.stat(full_path)
+        except OSError:
+            return
+
+        entry = previous and previous.entries.get(path)
+        if entry is None or not entry.is_same(stat_result):
+            entry = self._create_entry(path, full_path, stat_result)
+            if entry is None:
+                return
+
+        self.entries[path] = entry
+        if entry.url is not None:
+            self.fingerprints[os.path.normpath(entry.url)] = path
+
+    def _is_inside(self, full_path: str, directory: str) -> bool:
+        real_path = os.path.realpath(full_path)
+        return os.path.commonpath([real_path, directory]) == directory
+
+    def _create_entry(self,
+                      path: str,
+                      full_path: str,
+                      stat_result: os.stat_result) -> Optional[ManifestEntry]:
+        if not stat.S_ISREG(stat_result.st_mode):
+            return ManifestEntry(full_path, stat_result)
+
+        digest = sha1()
+        try:
+            with open(full_path, 'rb') as file:
+                for chunk in iter(lambda: file.read(64 * 1024), b''):
+                    digest.update(chunk)
+        except OSError:
+            return None
+        hexdigest = digest.hexdigest()
+
+        head, ext = os.path.splitext(path)
+        url = f'{head}.{hexdigest[:12]}{ext}'.replace(os.sep, '/')
+        return ManifestEntry(full_path, stat_result, f'"{hexdigest}"', url)
@@ -1,8 +1,226 @@
 import os
-from starlette.types import Scope
-from starlette.staticfiles import StaticFiles as BaseStaticFiles
+import stat
+import asyncio
+from logging import getLogger
+from mimetypes import guess_type
+from typing import AsyncGenerator, Optional, Sequence, Tuple, Dict
+from starlette.types import Scope, ASGIApp
+from starlette.datastructures import Headers
+from starlette.concurrency import run_in_threadpool
+from starlette.staticfiles import (
+    StaticFiles as BaseStaticFiles,
+    NotModifiedResponse
+)
+from hius.responses import Response, FileResponse
+from hius.handlers.filecache import FileCache, CachedFile
+from hius.handlers.compress import (
+    SUFFIXES,
+    compress_directory,
+    get_accepted_encodings
+)
+from hius.handlers.manifest import Manifest
+from hius.routing.exceptions import NoMatchFound
+from hius.routing.utils import URLPath
+
+IMMUTABLE = 'public, max-age=31536000, immutable'
+
+logger = getLogger('hius.staticfiles')
+
+Lookup = Tuple[str, Optional[os.stat_result], Optional[str]]
 
 
 class StaticFiles(BaseStaticFiles):
+    def __init__(self,
+                 *,
+                 cache_size: int = 0,
+                 cache_file_size: int = 64 * 1024,
+                 precompressed: bool = False,
+                 manifest: bool = False,
+                 watch_interval: float = 2.0,
+                 **kwargs) -> None:
+        super().__init__(**kwargs)
+        self.precompressed = precompressed
+
+        self.use_manifest = manifest
+        self.watch_interval = watch_interval
+        self.manifest = None
+
+        self.cache = None
+        if cache_size > 0:
+            self.cache = FileCache(cache_size, cache_file_size)
+
     def get_path(self, scope: Scope) -> str:
         return os.path.normpath(os.path.join(*scope['ctx_path'].split('/')))
+
+    async def get_response(self, path: str, scope: Scope) -> Response:
+        if scope['method'] not in ('GET', 'HEAD'):
+            return await super().get_response(path, scope)
+
+        if self.use_manifest and self.manifest is None:
+            await run_in_threadpool(self.load_manifest)
+
+        manifest = self.manifest
+        if manifest is None and self.cache is None and not self.precompressed:
+            return await super().get_response(path, scope)
+
+        immutable = manifest is not None and path in manifest.fingerprints
+        if immutable:
+            path = manifest.fingerprints[path]
+
+        encodings = self._get_encodings(scope)
+        key = path, encodings, immutable
+
+        cache = self.cache
+        if cache is not None and 'range' in Headers(scope=scope):
+            cache = None
+
+        if cache is not None:
+            entry = cache.get(key)
+            if entry is not None:
+                return self._cached_response(entry, scope)
+
+        if manifest is not None:
+            lookup = self._lookup_encoded(path, encodings)
+        else:
+            lookup = await run_in_threadpool(self._lookup_encoded,
+                                             path, encodings)
+
+        full_path, stat_result, encoding = lookup
+        if stat_result is None or not stat.S_ISREG(stat_result.st_mode):
+            return await super().get_response(path, scope)
+
+        headers = self._get_headers(path, encoding, immutable)
+        media_type = self._get_media_type(path)
+
+        if cache is None or not cache.is_cacheable(stat_result):
+            return self._file_response(full_path, stat_result, scope,
+                                       headers, media_type)
+
+        entry = await run_in_threadpool(self._read_file, full_path,
+                                        headers, media_type)
+        cache.put(key, entry)
+        return self._cached_response(entry, scope)
+
+    def _get_encodings(self, scope: Scope) -> Tuple[str, ...]:
+        if not self.precompressed:
+            return ()
+
+        header = Headers(scope=scope).get('accept-encoding', '')
+        accepted = get_accepted_encodings(header)
+        return tuple(encoding for encoding in SUFFIXES if encoding in accepted)
+
+    def _lookup_encoded(self, path: str, encodings: Sequence[str]) -> Lookup:
+        for encoding in encodings:
+            encoded_path = path + SUFFIXES[encoding]
+            full_path, stat_result = self.lookup_path(encoded_path)
+            if stat_result is not None and stat.S_ISREG(stat_result.st_mode):
+                return full_path, stat_result, encoding
+        return (*self.lookup_path(path), None)
+
+    def lookup_path(self, path: str) -> Tuple[str, Optional[os.stat_result]]:
+        if self.manifest is not None:
+            return self.manifest.lookup(path)
+        return super().lookup_path(path)
+
+    def file_response(self,
+                      full_path: str,
+                      stat_result: os.stat_result,
+                      scope: Scope,
+                      status_code: int = 200) -> Response:
+        return self._file_response(full_path, stat_result, scope,
+                                   None, None, status_code)
+
+    def _get_headers(self,
+                     path: str,
+                     encoding: Optional[str],
+                     immutable: bool) -> Dict[str, str]:
+        headers = {}
+        if self.precompressed:
+            headers['vary'] = 'Accept-Encoding'
+        if encoding is not None:
+            headers['content-encoding'] = encoding
+        if immutable:
+            headers['cache-control'] = IMMUTABLE
+
+        if self.manifest is not None:
+            entry = self.manifest.get(path + SUFFIXES.get(encoding, ''))
+            if entry is not None:
+                headers['etag'] = entry.etag
+        return headers
+
+    def _get_media_type(self, path: str) -> Optional[str]:
+        if self.manifest is not None and path in self.manifest.entries:
+            return self.manifest.entries[path].media_type
+        return guess_type(path)[0]
+
+    def _file_response(self,
+                       full_path: str,
+                       stat_result: os.stat_result,
+                       scope: Scope,
+                       headers: Optional[Dict[str, str]],
+                       media_type: Optional[str],
+                       status_code: int = 200) -> Response:
+        response = FileResponse(full_path,
+                                status_code=status_code,
+                                stat_result=stat_result,
+                                method=scope['method'],
+                                headers=headers,
+                                media_type=media_type)
+        if self.is_not_modified(response.headers, Headers(scope=scope)):
+            return NotModifiedResponse(response.headers)
+        return response
+
+    def _read_file(self,
+                   full_path: str,
+                   headers: Dict[str, str],
+                   media_type: Optional[str]) -> CachedFile:
+        with open(full_path, 'rb') as file:
+            stat_result = os.fstat(file.fileno())
+            content = file.read()
+
+        headers = FileResponse(full_path,
+                               stat_result=stat_result,
+                               headers=headers,
+                               media_type=media_type).headers
+        return CachedFile(full_path, stat_result, content, headers)
+
+    def _cached_response(self, entry: CachedFile, scope: Scope) -> Response:
+        if self.is_not_modified(entry.headers, Headers(scope=scope)):
+            return NotModifiedResponse(entry.headers)
+        return entry.response(scope['method'])
+
+    # ---
+
+    def compress(self, app: ASGIApp = None, **kwargs) -> int:
+        return sum(compress_directory(directory, **kwargs)
+                   for directory in self.all_directories)
+
+    def load_manifest(self, app: ASGIApp = None) -> None:
+        self.manifest = Manifest.scan(self.all_directories, self.manifest)
+
+    def warmup(self, app: ASGIApp = None) -> None:
+        if self.use_manifest and self.manifest is None:
+            self.load_manifest()
+
+    async def watch_manifest(self, app: ASGIApp = None) -> AsyncGenerator:
+        await run_in_threadpool(self.load_manifest)
+        task = asyncio.ensure_future(self._watch_manifest())
+        yield
+        task.cancel()
+
+    async def _watch_manifest(self) -> None:
+        while True:
+            await asyncio.sleep(self.watch_interval)
+            try:
+                await run_in_threadpool(self.load_manifest)
+            except Exception:
+                logger.exception('failed to refresh static files manifest')
+
+    def url_path_for(self, name: str) -> URLPath:
+        if self.use_manifest and self.manifest is None:
+            self.load_manifest()
+
+        url = self.manifest and self.manifest.get_url(name)
+        if not url:
+            raise NoMatchFound
+        return URLPath(path='/' + url, protocol='http')
@@ -0,0 +1,11 @@
+from hius.metrics.store import MetricsStore, DEFAULT_BUCKETS
+from hius.metrics.endpoint import MetricsEndpoint, PrometheusEndpoint
+from hius.metrics.recorder import RequestMetrics
+
+__all__ = [
+    'MetricsStore',
+    'MetricsEndpoint',
+    'PrometheusEndpoint',
+    'RequestMetrics',
+    'DEFAULT_BUCKETS'
+]
@@ -0,0 +1,33 @@
+from typing import Any, Dict
+from hius.requests import Request
+from hius.responses import JSONResponse, PlainTextResponse, Response
+from hius.metrics.exposition import CONTENT_TYPE, render
+from hius.metrics.store import MetricsStore
+
+
+class MetricsEndpoint:
+
+    include_in_schema = False
+
+    def __init__(self, store: MetricsStore) -> None:
+        self.store = store
+
+    def get(self, request: Request) -> Response:
+        return JSONResponse(self.render())
+
+    def render(self) -> Dict[str, Any]:
+        metrics = {}
+        for name, sample in self.store.collect().items():
+            metrics[name] = {
+                'count': sample.count,
+                'sum': sample.sum,
+                'buckets': {str(bound): count for bound, count
+                            in self.store.cumulative(sample)}
+            }
+        return metrics
+
+
+class PrometheusEndpoint(MetricsEndpoint):
+
+    def get(self, request: Request) -> Response:
+        return PlainTextResponse(render(self.store), media_type=CONTENT_TYPE)
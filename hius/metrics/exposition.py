@@ -0,0 +1,66 @@
+from typing import Dict, List, Tuple
+from hius.metrics.store import MetricsStore, Sample, HISTOGRAM
+
+CONTENT_TYPE = 'text/plain; version=0.0.4'
+
+
+def escape(value: str) -> str:
+    return (value.replace('\\', '\\\\')
+                 .replace('"', '\\"')
+                 .replace('\n', '\\n'))
+
+
+def metric_name(family: str, **labels: str) -> str:
+    if not labels:
+        return family
+    pairs = ','.join(f'{key}="{escape(value)}"'
+                     for key, value in labels.items())
+    return f'{family}{{{pairs}}}'
+
+
+def _split(name: str) -> Tuple[str, str]:
+    family, _, labels = name.partition('{')
+    return family, labels.rstrip('}')
+
+
+def _with_labels(family: str, labels: str, extra: str = '') -> str:
+    labels = ','.join(label for label in (labels, extra) if label)
+    return f'{family}{{{labels}}}' if labels else family
+
+
+def _format_bound(bound: float) -> str:
+    return '+Inf' if bound == float('inf') else repr(bound)
+
+
+def render(store: MetricsStore) -> str:
+    families: Dict[str, List[Tuple[str, Sample]]] = {}
+    for name, sample in store.collect().items():
+        family, labels = _split(name)
+        families.setdefault(family, []).append((labels, sample))
+
+    lines = []
+    for family, samples in sorted(families.items()):
+        kind = samples[0][1].kind
+        lines.append(f'# TYPE {family} {kind}')
+        for labels, sample in samples:
+            if kind == HISTOGRAM:
+                lines.extend(_render_histogram(store, family, labels, sample))
+            else:
+                lines.append(f'{_with_labels(family, labels)} {sample.sum!r}')
+    lines.append('')
+    return '\n'.join(lines)
+
+
+def _render_histogram(store: MetricsStore,
+                      family: str,
+                      labels: str,
+                      sample: Sample) -> List[str]:
+    lines = []
+    for bound, count in store.cumulative(sample):
+        le = f'le="{_format_bound(bound)}"'
+        lines.append(f'{_with_labels(family + "_bucket", labels, le)} '
+                     f'{count}')
+    lines.append(f'{_with_labels(family + "_sum", labels)} {sample.sum!r}')
+    lines.append(f'{_with_labels(family + "_count", labels)} '
+                 f'{sample.count}')
+    return lines
@@ -0,0 +1,79 @@
+import os
+import asyncio
+from typing import Any, AsyncGenerator, Dict, List
+from starlette.types import ASGIApp
+from hius.metrics.exposition import metric_name
+from hius.metrics.store import MetricsStore
+
+UNMATCHED = '<unmatched>'
+STATUSES = ('xxx', '1xx', '2xx', '3xx', '4xx', '5xx', 'xxx', 'xxx', 'xxx',
+            'xxx')
+
+
+class RouteSamples:
+
+    __slots__ = 'owner', 'names', 'values',
+
+    def __init__(self, owner: 'RequestMetrics', route: Any) -> None:
+        route_name = UNMATCHED if route is None else route.name
+        self.owner = owner
+        self.names = [metric_name(owner.name, route=route_name, status=status)
+                      for status in STATUSES]
+        self.values: List[List[float]] = [[] for _ in STATUSES]
+
+
+class RequestMetrics:
+
+    __slots__ = ('store', 'name', 'interval', '_samples', '_unmatched',
+                 '_scheduled')
+
+    def __init__(self,
+                 store: MetricsStore,
+                 name: str = 'hius_http_request_duration_seconds',
+                 interval: float = 1.0) -> None:
+        self.store = store
+        self.name = name
+        self.interval = interval
+        self._samples: Dict[Any, RouteSamples] = {}
+        self._unmatched = self._get_samples(None)
+        self._scheduled = False
+
+        os.register_at_fork(after_in_child=self._reset)
+
+    def record(self, route: Any, status: int, duration: float) -> None:
+        samples = self._unmatched if route is None else route.metrics
+        if samples is None or samples.owner is not self:
+            samples = self._get_samples(route)
+        samples.values[status // 100].append(duration)
+
+        if not self._scheduled:
+            self._scheduled = True
+            asyncio.get_running_loop().call_later(self.interval, self.flush)
+
+    def _get_samples(self, route: Any) -> RouteSamples:
+        samples = self._samples.get(route)
+        if samples is None:
+            samples = self._samples[route] = RouteSamples(self, route)
+        if route is not None:
+            route.metrics = samples
+        return samples
+
+    def flush(self) -> None:
+        self._scheduled = False
+        for samples in self._samples.values():
+            for index, values in enumerate(samples.values):
+                if values:
+                    samples.values[index] = []
+                    self.store.observe_many(samples.names[index], values)
+
+    def _reset(self) -> None:
+        self._scheduled = False
+        for samples in self._samples.values():
+            samples.values = [[] for _ in STATUSES]
+
+    async def lifespan(self, app: ASGIApp) -> AsyncGenerator:
+        self._scheduled = False
+        try:
+            yield
+        finally:
+            self.flush()
@@ -0,0 +1,311 @@
+import os
+import mmap
+import fcntl
+import struct
+import tempfile
+import threading
+from time import monotonic
+from logging import getLogger
+from bisect import bisect_left, bisect_right
+from contextlib import contextmanager
+from typing import (
+    BinaryIO,
+    Iterator,
+    Optional,
+    Sequence,
+    Tuple,
+    Set,
+    List,
+    Dict
+)
+
+MAGIC = b'HIUSMET1'
+HEADER = struct.Struct('8sQQQQ')
+HEADER_WORDS = HEADER.size // 8
+NAME_SIZE = 128
+
+COUNTER = 'counter'
+HISTOGRAM = 'histogram'
+KINDS = {COUNTER: b'c', HISTOGRAM: b'h'}
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1,
+                   0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+CLAIM_RETRY = 1.0
+
+logger = getLogger('hius.metrics')
+
+
+class Sample:
+
+    __slots__ = 'kind', 'count', 'sum', 'buckets',
+
+    def __init__(self,
+                 kind: str,
+                 count: int,
+                 total: float,
+                 buckets: List[int]) -> None:
+        self.kind = kind
+        self.count = count
+        self.sum = total
+        self.buckets = buckets
+
+    def __repr__(self) -> str:
+        return f'Sample({self.kind}, count={self.count}, sum={self.sum})'
+
+
+class MetricsStore:
+
+    __slots__ = ('path', 'workers', 'capacity', 'buckets', 'dropped',
+                 '_file', '_mmap', '_u64', '_f64', '_row_words', '_pids',
+                 '_names', '_data', '_thread_lock', '_indexes', '_rows',
+                 '_rejected', '_warned', '_slot', '_retry_at')
+
+    def __init__(self,
+                 workers: int = 8,
+                 capacity: int = 4096,
+                 buckets: Sequence[float] = DEFAULT_BUCKETS,
+                 path: Optional[str] = None) -> None:
+        self.path = path
+        self.workers = workers
+        self.capacity = capacity
+        self.buckets = tuple(sorted(buckets))
+
+        self._row_words = len(self.buckets) + 3
+        self._pids = HEADER_WORDS + len(self.buckets)
+        self._names = self._pids + workers
+        self._data = self._names + capacity * NAME_SIZE // 8
+
+        self._thread_lock = threading.Lock()
+        self._indexes: Dict[str, int] = {}
+        self._reset()
+
+        self._file = self._open()
+        self._mmap = mmap.mmap(self._file.fileno(), self._size)
+        self._u64 = memoryview(self._mmap).cast('Q')
+        self._f64 = memoryview(self._mmap).cast('d')
+
+        os.register_at_fork(after_in_child=self._reset)
+
+    @property
+    def _size(self) -> int:
+        words = self._data + self.workers * self.capacity * self._row_words
+        return words * 8
+
+    def _header(self) -> bytes:
+        header = HEADER.pack(MAGIC, self.workers, self.capacity,
+                             len(self.buckets), 0)
+        return header + struct.pack(f'{len(self.buckets)}d', *self.buckets)
+
+    def _open(self) -> BinaryIO:
+        if self.path is None:
+            file = tempfile.TemporaryFile()
+        else:
+            fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+            file = os.fdopen(fd, 'r+b')
+
+        header = self._header()
+        with self._lock(file):
+            current = file.read(len(header))
+            if (os.fstat(file.fileno()).st_size != self._size or
+                    current[:32] != header[:32] or
+                    current[40:] != header[40:]):
+                file.truncate(0)
+                file.truncate(self._size)
+                file.seek(0)
+                file.write(header)
+                file.flush()
+        return file
+
+    def _reset(self) -> None:
+        self.dropped = 0
+        self._rows: Dict[str, int] = {}
+        self._rejected: Set[str] = set()
+        self._warned: Set[str] = set()
+        self._slot: Optional[int] = None
+        self._retry_at = 0.0
+
+    @contextmanager
+    def _lock(self, file=None) -> Iterator[None]:
+        fileno = (file or self._file).fileno()
+        with self._thread_lock:
+            fcntl.lockf(fileno, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.lockf(fileno, fcntl.LOCK_UN)
+
+    def close(self) -> None:
+        self._u64.release()
+        self._f64.release()
+        self._mmap.close()
+        self._file.close()
+
+    # ---
+
+    def inc(self, name: str, value: float = 1) -> None:
+        row = self._row(name, COUNTER)
+        if row is None:
+            self.dropped += 1
+            return
+        self._u64[row] += 1
+        self._f64[row + 1] += value
+
+    def observe(self, name: str, value: float) -> None:
+        row = self._row(name, HISTOGRAM)
+        if row is None:
+            self.dropped += 1
+            return
+        self._f64[row + 1] += value
+        self._u64[row + 2 + bisect_left(self.buckets, value)] += 1
+
+    def observe_many(self, name: str, values: Sequence[float]) -> None:
+        row = self._row(name, HISTOGRAM)
+        if row is None:
+            self.dropped += len(values)
+            return
+
+        values = sorted(values)
+        self._f64[row + 1] += sum(values)
+        start = 0
+        for index, bound in enumerate(self.buckets):
+            end = bisect_right(values, bound, start)
+            if end > start:
+                self._u64[row + 2 + index] += end - start
+                start = end
+        if start < len(values):
+            self._u64[row + 2 + len(self.buckets)] += len(values) - start
+
+    def _row(self, name: str, kind: str) -> Optional[int]:
+        row = self._rows.get(name)
+        if row is None:
+            index = self._register_or_drop(name, kind)
+            offset = self._slot_offset() if index is not None else None
+            if offset is None:
+                return None
+            row = self._rows[name] = offset + index * self._row_words
+        return row
+
+    def _register_or_drop(self, name: str, kind: str) -> Optional[int]:
+        if name in self._rejected:
+            return None
+        try:
+            return self.register(name, kind)
+        except (RuntimeError, ValueError) as exc:
+            self._rejected.add(name)
+            self._warn(f'{exc}, values are dropped')
+            return None
+
+    def _warn(self, message: str) -> None:
+        if message not in self._warned:
+            self._warned.add(message)
+            logger.warning(message)
+
+    def _slot_offset(self) -> Optional[int]:
+        if self._slot is None:
+            if monotonic() < self._retry_at:
+                return None
+            self._slot = self._claim_slot()
+            if self._slot is None:
+                self._retry_at = monotonic() + CLAIM_RETRY
+                return None
+        return self._data + self._slot * self.capacity * self._row_words
+
+    def _claim_slot(self) -> Optional[int]:
+        pid = os.getpid()
+        with self._lock():
+            owners = self._u64[self._pids:self._names].tolist()
+            if pid in owners:
+                return owners.index(pid)
+
+            for slot, owner in enumerate(owners):
+                if not owner or not _is_alive(owner):
+                    self._u64[self._pids + slot] = pid
+                    return slot
+
+        self._warn(f'all {self.workers} metrics slots are taken by live '
+                   f'processes, values are dropped')
+        return None
+
+    # ---
+
+    def register(self, name: str, kind: str = HISTOGRAM) -> int:
+        index = self._indexes.get(name)
+        if index is None:
+            encoded = name.encode()
+            if len(encoded) >= NAME_SIZE:
+                raise ValueError(f'metric name is longer than '
+                                 f'{NAME_SIZE - 1} bytes: {name!r}')
+            with self._lock():
+                index = self._find_or_add(encoded, KINDS[kind])
+            self._indexes[name] = index
+        return index
+
+    def _find_or_add(self, encoded: bytes, kind: bytes) -> int:
+        count = self._u64[HEADER_WORDS - 1]
+        for index in range(count):
+            if self._read_name(index)[1:] == encoded:
+                return index
+
+        if count >= self.capacity:
+            raise RuntimeError(f'metrics store is full ({self.capacity} '
+                               f'names)')
+
+        offset = self._names * 8 + count * NAME_SIZE
+        entry = (kind + encoded).ljust(NAME_SIZE, b'\0')
+        self._mmap[offset:offset + NAME_SIZE] = entry
+        self._u64[HEADER_WORDS - 1] = count + 1
+        return count
+
+    def _read_name(self, index: int) -> bytes:
+        offset = self._names * 8 + index * NAME_SIZE
+        return self._mmap[offset:offset + NAME_SIZE].rstrip(b'\0')
+
+    def names(self) -> List[str]:
+        return [name for name, _ in self._entries()]
+
+    def _entries(self) -> List[Tuple[str, str]]:
+        kinds = {value: key for key, value in KINDS.items()}
+        entries = []
+        for index in range(self._u64[HEADER_WORDS - 1]):
+            entry = self._read_name(index)
+            entries.append((entry[1:].decode(), kinds[entry[:1]]))
+        return entries
+
+    # ---
+
+    def collect(self) -> Dict[str, Sample]:
+        slot_words = self.capacity * self._row_words
+        samples = {}
+        for index, (name, kind) in enumerate(self._entries()):
+            count, total, buckets = 0, 0.0, [0] * (len(self.buckets) + 1)
+            for slot in range(self.workers):
+                row = self._data + slot * slot_words + index * self._row_words
+                count += self._u64[row]
+                total += self._f64[row + 1]
+                values = self._u64[row + 2:row + self._row_words].tolist()
+                buckets = [a + b for a, b in zip(buckets, values)]
+            if kind == HISTOGRAM:
+                count = sum(buckets)
+            samples[name] = Sample(kind, count, total, buckets)
+        return samples
+
+    def get(self, name: str) -> Optional[Sample]:
+        return self.collect().get(name)
+
+    def cumulative(self, sample: Sample) -> List[Tuple[float, int]]:
+        bounds = (*self.buckets, float('inf'))
+        result, total = [], 0
+        for bound, count in zip(bounds, sample.buckets):
+            total += count
+            result.append((bound, total))
+        return result
+
+
+def _is_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:  # pragma: no cover
+        return True
+    return True
@@ -7,6 +7,7 @@ class OpenAPIConfig(BaseModel):
     version: str = '1.0.0'
     favicon: str = '<meta/>'
     description: str = None
+    redoc_path: str = None
 
     doc_url: str = '/docs'
     schema_url: str = '/openapi.json'
@@ -15,3 +16,4 @@ class OpenAPIConfig(BaseModel):
     def _check_url(cls, value):
         if not value.startswith('/'):
             raise RoutePathError('path must start with "/"')
+        return value
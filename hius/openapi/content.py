@@ -0,0 +1,48 @@
+from gzip import compress
+from hashlib import sha1
+from typing import Mapping
+from hius.handlers.compress import get_accepted_encodings
+from hius.requests import Request
+from hius.responses import Response
+
+
+class RenderedContent:
+
+    __slots__ = 'body', 'gzipped', 'media_type', 'headers', 'etag',
+
+    def __init__(self,
+                 body: bytes,
+                 media_type: str,
+                 headers: Mapping[str, str] = None) -> None:
+        self.body = body
+        self.gzipped = compress(body)
+        self.media_type = media_type
+        self.headers = {'cache-control': 'no-cache', **(headers or {})}
+        self.etag = sha1(body).hexdigest()
+
+    @property
+    def fingerprint(self) -> str:
+        return self.etag[:12]
+
+    def response(self, request: Request) -> Response:
+        header = request.headers.get('accept-encoding', '')
+        if 'gzip' in get_accepted_encodings(header):
+            body, etag = self.gzipped, f'"{self.etag}-gzip"'
+            headers = {'content-encoding': 'gzip'}
+        else:
+            body, etag = self.body, f'"{self.etag}"'
+            headers = {}
+
+        headers.update(self.headers, etag=etag, vary='Accept-Encoding')
+
+        if self._is_not_modified(request, etag):
+            return Response(status_code=304, headers=headers)
+        return Response(body, headers=headers, media_type=self.media_type)
+
+    def _is_not_modified(self, request: Request, etag: str) -> bool:
+        if_none_match = request.headers.get('if-none-match')
+        if if_none_match is None:
+            return False
+
+        tags = {tag.strip() for tag in if_none_match.split(',')}
+        return etag in tags or '*' in tags
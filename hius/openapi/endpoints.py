@@ -0,0 +1,220 @@
+import os
+from json import dumps
+from typing import Optional, Union, Type, List, Dict
+from pydantic import BaseModel
+from starlette.concurrency import run_in_threadpool
+from starlette.types import Scope, Receive, Send
+from hius.requests import Request
+from hius.responses import Response
+from hius.httpcodes import HTTPNotFound, HTTPMethodNotAllowed
+from hius.routing.router import Router
+from hius.routing.routes import BaseRoute, route, mount
+from hius.openapi.config import OpenAPIConfig
+from hius.openapi.content import RenderedContent
+from hius.openapi.template import HEADER, BODY, HTML, REDOC_CDN_URL
+
+REDOC_BUNDLE = os.path.join(os.path.dirname(__file__),
+                            'static', 'redoc.standalone.js')
+IMMUTABLE = {'cache-control': 'public, max-age=31536000, immutable'}
+
+
+class FakeDict:
+    def __init__(self, model: Type[BaseModel]) -> None:
+        self.model = model
+
+    def __getitem__(self, key) -> Type[BaseModel]:
+        return self.model
+
+
+class OpenAPIAssets:
+    def __init__(self, path: Optional[str], url: str) -> None:
+        self.path = path
+        self.url = url
+        self.assets = None
+
+    async def __call__(self,
+                       scope: Scope,
+                       receive: Receive,
+                       send: Send) -> None:
+        if self.path is None:
+            raise HTTPNotFound()
+        if scope['method'] not in ('GET', 'HEAD'):
+            raise HTTPMethodNotAllowed()
+
+        assets = self.assets or await run_in_threadpool(self.load)
+        asset = assets.get(scope['ctx_path'].lstrip('/'))
+        if asset is None:
+            raise HTTPNotFound()
+
+        response = asset.response(Request(scope))
+        await response(scope, receive, send)
+
+    def load(self) -> Dict[str, RenderedContent]:
+        if self.assets is None:
+            with open(self.path, 'rb') as file:
+                redoc = RenderedContent(file.read(),
+                                        media_type='application/javascript',
+                                        headers=IMMUTABLE)
+            self.assets = {f'redoc.standalone.{redoc.fingerprint}.js': redoc}
+        return self.assets
+
+    def get_redoc_url(self) -> str:
+        if self.path is None:
+            return REDOC_CDN_URL
+
+        name, = self.load()
+        return f'{self.url}/{name}'
+
+
+class OpenAPI:
+    def __init__(self,
+                 router: Router,
+                 config: OpenAPIConfig,
+                 assets: OpenAPIAssets) -> None:
+        self.router = router
+        self.config = config
+        self.assets = assets
+
+        self.revision = None
+        self.html = None
+        self.schema = None
+
+        self.base_schema = None
+        self.fragments = {}
+
+    def _make_html_header(self) -> str:
+        return HEADER.format(
+            title=self.config.title,
+            favicon=self.config.favicon,
+            redoc_url=self.assets.get_redoc_url()
+        )
+
+    def get_html(self) -> RenderedContent:
+        self._check_revision()
+        return self.html
+
+    def get_schema(self) -> RenderedContent:
+        self._check_revision()
+        return self.schema
+
+    def _check_revision(self) -> None:
+        if self.revision != self.router.revision:
+            self.render()
+
+    def render(self) -> None:
+        revision = self.router.revision
+        schema = self._create_schema()
+
+        self.schema = RenderedContent(
+            dumps(schema, ensure_ascii=False, separators=(',', ':')).encode(),
+            media_type='application/json'
+        )
+        self.html = RenderedContent(
+            self._create_html(schema).encode(),
+            media_type='text/html'
+        )
+        self.revision = revision
+
+    def _create_html(self, schema: dict) -> str:
+        return HTML.format(header=self._make_html_header(),
+                           body=self._create_body(schema))
+
+    def _create_body(self, schema: dict) -> str:
+        return BODY.format(schema=dumps(schema))
+
+    def _create_schema(self) -> dict:
+        paths, fragments = {}, {}
+        for parents_paths, route in self.router.iter_http_routes():
+            if not self._is_included(route):
+                continue
+
+            key = parents_paths, route
+            if key in self.fragments:
+                fragments[key] = self.fragments[key]
+            else:
+                fragments[key] = self._create_fragment(route)
+
+            path = ''.join(parents_paths) + route.path
+            paths.setdefault(path, {}).update(fragments[key])
+
+        self.fragments = fragments
+        return {**self._get_base_schema(), 'paths': paths}
+
+    def _get_base_schema(self) -> dict:
+        # pydantic_openapi_schema is heavy, so it's imported on first demand
+        from hius.openapi.models import create_openapi_schema
+
+        if self.base_schema is None:
+            schema = create_openapi_schema(self.config)
+            self.base_schema = schema.dict(by_alias=True, exclude_none=True)
+        return self.base_schema
+
+    def _create_fragment(self, route: Type[BaseRoute]) -> Dict[str, dict]:
+        from hius.openapi.models import create_operation
+
+        models = self._get_endpoint_models(route)
+
+        fragment = {}
+        for method in route.methods:
+            operation = create_operation(route, method, models[method])
+            fragment[method.lower()] = operation.dict(by_alias=True,
+                                                      exclude_none=True)
+        return fragment
+
+    def _is_included(self, route: Type[BaseRoute]) -> bool:
+        return getattr(route.endpoint._endpoint, 'include_in_schema', True)
+
+    def _get_endpoint_models(self,
+                             route: Type[BaseRoute]) -> Union[dict, FakeDict]:
+        if hasattr(route.endpoint, 'models'):
+            return route.endpoint.models
+        return FakeDict(route.endpoint.model)
+
+
+class OpenAPIDocEndpoint:
+
+    include_in_schema = False
+
+    def __init__(self, openapi: OpenAPI) -> None:
+        self.openapi = openapi
+
+    def get(self, request: Request) -> Response:
+        return self.openapi.get_html().response(request)
+
+
+class OpenAPISchemaEndpoint:
+
+    include_in_schema = False
+
+    def __init__(self, openapi: OpenAPI) -> None:
+        self.openapi = openapi
+
+    def get(self, request: Request) -> Response:
+        return self.openapi.get_schema().response(request)
+
+
+def create_openapi(router: Router, config: OpenAPIConfig) -> OpenAPI:
+    assets_url = config.doc_url.rstrip('/') + '/assets'
+    assets = OpenAPIAssets(_get_redoc_path(config), assets_url)
+    return OpenAPI(router, config, assets)
+
+
+def get_openapi_routes(openapi: OpenAPI) -> List[BaseRoute]:
+    config = openapi.config
+    routes = [
+        route(config.doc_url, OpenAPIDocEndpoint(openapi),
+              name='openapi_doc'),
+        route(config.schema_url, OpenAPISchemaEndpoint(openapi),
+              name='openapi_schema')
+    ]
+    if openapi.assets.path is not None:
+        routes.append(mount(openapi.assets.url, app=openapi.assets,
+                            name='openapi_assets'))
+    return routes
+
+
+def _get_redoc_path(config: OpenAPIConfig) -> Optional[str]:
+    if config.redoc_path is not None:
+        return config.redoc_path
+    if os.path.isfile(REDOC_BUNDLE):
+        return REDOC_BUNDLE
@@ -2,7 +2,6 @@ from http import HTTPStatus
 from pydantic_openapi_schema.v3_1_0 import (
     OpenAPI,
     Info,
-    PathItem,
     Operation,
     Response
 )
@@ -28,9 +27,3 @@ def create_operation(route, method, model) -> Operation:
         }
     )
 
-
-def get_schema_paths(schema, parents_paths, route) -> PathItem:
-    path = ''.join(parents_paths) + route.path
-    if path not in schema.paths:
-        schema.paths[path] = PathItem()
-    return schema.paths[path]
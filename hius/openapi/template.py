@@ -1,11 +1,13 @@
+REDOC_CDN_URL = ('https://cdn.jsdelivr.net/npm/redoc@2.5.4/'
+                 'bundles/redoc.standalone.js')
+
 HEADER = '''
 <head>
   <title>{title}</title>
   {favicon}
   <meta charset='utf-8'/>
   <meta name='viewport' content='width=device-width, initial-scale=1'>
-  <link href='https://fonts.googleapis.com/css?family=Montserrat:300,400,700|Roboto:300,400,700' rel='stylesheet'>
-  <script src='https://cdn.jsdelivr.net/npm/redoc@next/bundles/redoc.standalone.js' crossorigin></script>
+  <script src='{redoc_url}' crossorigin></script>
   <style>body {{ margin: 0; padding: 0 }}</style>
 </head>
 '''
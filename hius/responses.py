@@ -1 +1,246 @@
+import os
+import stat
+from mmap import mmap, ACCESS_READ
+from secrets import token_hex
+from email.utils import parsedate
+from typing import Optional, List, Tuple
 from starlette.responses import *
+from starlette.responses import FileResponse as BaseFileResponse
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import Headers
+from starlette.types import Scope, Receive, Send
+
+PATHSEND = 'http.response.pathsend'
+ZEROCOPYSEND = 'http.response.zerocopysend'
+MAX_RANGES = 16
+
+Ranges = List[Tuple[int, int]]
+RawHeaders = List[Tuple[bytes, bytes]]
+
+
+def parse_range(header: str, size: int) -> Optional[Ranges]:
+    unit, _, specs = header.partition('=')
+    if unit.strip().lower() != 'bytes':
+        return
+
+    ranges = []
+    for spec in specs.split(','):
+        first, sep, last = spec.strip().partition('-')
+        if not sep or not (first + last).isdigit():
+            return
+
+        if not first:
+            start, end = max(size - int(last), 0), size - 1
+        else:
+            start, end = int(first), int(last or size - 1)
+            if last and end < start:
+                return
+
+        if start < size and start <= end:
+            ranges.append((start, min(end, size - 1)))
+
+    if len(ranges) > MAX_RANGES:
+        return
+    return ranges
+
+
+class FileResponse(BaseFileResponse):
+    async def __call__(self,
+                       scope: Scope,
+                       receive: Receive,
+                       send: Send) -> None:
+        if self.send_header_only:
+            return await super().__call__(scope, receive, send)
+
+        await self._check_stat()
+        ranges = self._get_ranges(scope)
+        extensions = scope.get('extensions') or {}
+
+        if ranges is not None:
+            await self._send_ranges(ranges, extensions, send)
+        elif PATHSEND in extensions:
+            await self._send_start(send)
+            await self._send_path(send)
+        elif ZEROCOPYSEND in extensions:
+            await self._send_start(send)
+            await self._send_zerocopy(send)
+        else:
+            return await super().__call__(scope, receive, send)
+
+        if self.background is not None:
+            await self.background()
+
+    def set_stat_headers(self, stat_result: os.stat_result) -> None:
+        super().set_stat_headers(stat_result)
+        self.headers.setdefault('accept-ranges', 'bytes')
+
+    async def _check_stat(self) -> None:
+        if self.stat_result is not None:
+            return
+
+        try:
+            stat_result = await run_in_threadpool(os.stat, self.path)
+        except FileNotFoundError:
+            raise RuntimeError(f'File at path {self.path} does not exist.')
+
+        if not stat.S_ISREG(stat_result.st_mode):
+            raise RuntimeError(f'File at path {self.path} is not a file.')
+
+        self.stat_result = stat_result
+        self.set_stat_headers(stat_result)
+
+    # ---
+
+    def _get_ranges(self, scope: Scope) -> Optional[Ranges]:
+        if self.status_code != 200:
+            return
+
+        headers = Headers(scope=scope)
+        if 'range' not in headers:
+            return
+        if not self._is_range_fresh(headers.get('if-range')):
+            return
+        return parse_range(headers['range'], self.stat_result.st_size)
+
+    def _is_range_fresh(self, if_range: Optional[str]) -> bool:
+        if if_range is None:
+            return True
+
+        date = parsedate(if_range)
+        if date is None:
+            etag = self.headers.get('etag')
+            return not if_range.startswith('W/') and if_range == etag
+        return date == parsedate(self.headers.get('last-modified', ''))
+
+    def _get_range_headers(self,
+                           content_length: int,
+                           content_range: str = None,
+                           content_type: str = None) -> RawHeaders:
+        excluded = {b'content-length'}
+        if content_type is not None:
+            excluded.add(b'content-type')
+
+        headers = [(key, value) for key, value in self.raw_headers
+                   if key not in excluded]
+        headers.append((b'content-length', str(content_length).encode()))
+
+        if content_range is not None:
+            headers.append((b'content-range', content_range.encode()))
+        if content_type is not None:
+            headers.append((b'content-type', content_type.encode()))
+        return headers
+
+    # ---
+
+    async def _send_start(self,
+                          send: Send,
+                          status: int = None,
+                          headers: RawHeaders = None) -> None:
+        await send({
+            'type': 'http.response.start',
+            'status': status or self.status_code,
+            'headers': self.raw_headers if headers is None else headers
+        })
+
+    async def _send_path(self, send: Send) -> None:
+        await send({
+            'type': PATHSEND,
+            'path': os.path.abspath(self.path)
+        })
+
+    async def _send_zerocopy(self, send: Send, **params: int) -> None:
+        file = await run_in_threadpool(open, self.path, 'rb')
+        try:
+            await send({
+                'type': ZEROCOPYSEND,
+                'file': file,
+                'more_body': False,
+                **params
+            })
+        finally:
+            file.close()
+
+    async def _send_ranges(self,
+                           ranges: Ranges,
+                           extensions: dict,
+                           send: Send) -> None:
+        size = self.stat_result.st_size
+        if not ranges:
+            headers = self._get_range_headers(0, f'bytes */{size}')
+            await self._send_start(send, 416, headers)
+            await send({'type': 'http.response.body', 'body': b''})
+        elif len(ranges) == 1:
+            await self._send_range(*ranges[0], size, extensions, send)
+        else:
+            await self._send_multipart(ranges, size, send)
+
+    async def _send_range(self,
+                          start: int,
+                          end: int,
+                          size: int,
+                          extensions: dict,
+                          send: Send) -> None:
+        headers = self._get_range_headers(end - start + 1,
+                                          f'bytes {start}-{end}/{size}')
+        await self._send_start(send, 206, headers)
+
+        if ZEROCOPYSEND in extensions:
+            await self._send_zerocopy(send, offset=start,
+                                      count=end - start + 1)
+        else:
+            await self._send_mapped(send, [(b'', start, end)], b'')
+
+    async def _send_multipart(self, ranges: Ranges, size: int,
+                              send: Send) -> None:
+        boundary = token_hex(16)
+        content_type = self.headers.get('content-type')
+
+        parts = []
+        for start, end in ranges:
+            head = (f'--{boundary}\r\n'
+                    f'Content-Type: {content_type}\r\n'
+                    f'Content-Range: bytes {start}-{end}/{size}\r\n\r\n')
+            parts.append((head.encode('latin-1'), start, end))
+        tail = f'\r\n--{boundary}--\r\n'.encode('latin-1')
+
+        length = sum(len(head) + end - start + 1 for head, start, end in parts)
+        length += 2 * (len(parts) - 1) + len(tail)
+
+        headers = self._get_range_headers(
+            length,
+            content_type=f'multipart/byteranges; boundary={boundary}'
+        )
+        await self._send_start(send, 206, headers)
+        await self._send_mapped(send, parts, tail)
+
+    async def _send_mapped(self,
+                           send: Send,
+                           parts: List[Tuple[bytes, int, int]],
+                           tail: bytes) -> None:
+        view = await run_in_threadpool(self._map_file)
+        try:
+            for index, (head, start, end) in enumerate(parts):
+                if index:
+                    head = b'\r\n' + head
+                if head:
+                    await send({'type': 'http.response.body',
+                                'body': head,
+                                'more_body': True})
+
+                for offset in range(start, end + 1, self.chunk_size):
+                    stop = min(offset + self.chunk_size, end + 1)
+                    chunk = await run_in_threadpool(view.__getitem__,
+                                                    slice(offset, stop))
+                    await send({'type': 'http.response.body',
+                                'body': chunk,
+                                'more_body': True})
+
+            await send({'type': 'http.response.body',
+                        'body': tail,
+                        'more_body': False})
+        finally:
+            view.close()
+
+    def _map_file(self) -> mmap:
+        with open(self.path, 'rb') as file:
+            return mmap(file.fileno(), 0, access=ACCESS_READ)
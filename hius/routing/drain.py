@@ -0,0 +1,55 @@
+from typing import Optional
+import anyio
+from starlette.responses import PlainTextResponse
+from starlette.websockets import WebSocketClose
+from starlette.types import Scope, Receive, Send, ASGIApp
+
+SERVICE_RESTART = 1012
+
+
+class RequestTracker:
+
+    __slots__ = 'reject', 'active', 'draining', '_idle',
+
+    def __init__(self, reject: bool = False) -> None:
+        self.reject = reject
+
+        self.active = 0
+        self.draining = False
+        self._idle: Optional[anyio.Event] = None
+
+    async def __call__(self,
+                       app: ASGIApp,
+                       scope: Scope,
+                       receive: Receive,
+                       send: Send) -> None:
+        if self.draining and self.reject:
+            await self._reject(scope, receive, send)
+            return
+
+        self.active += 1
+        try:
+            await app(scope, receive, send)
+        finally:
+            self.active -= 1
+            if not self.active and self._idle is not None:
+                self._idle.set()
+
+    async def _reject(self,
+                      scope: Scope,
+                      receive: Receive,
+                      send: Send) -> None:
+        if scope['type'] == 'websocket':
+            response = WebSocketClose(SERVICE_RESTART)
+        else:
+            response = PlainTextResponse('Service Unavailable', 503,
+                                         {'connection': 'close'})
+        await response(scope, receive, send)
+
+    async def drain(self, timeout: float = None) -> bool:
+        self.draining = True
+        if self.active:
+            self._idle = anyio.Event()
+            with anyio.move_on_after(timeout):
+                await self._idle.wait()
+        return not self.active
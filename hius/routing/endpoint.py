@@ -18,6 +18,7 @@ from inspect import (
 )
 from hius.requests import Request
 from hius.routing.exceptions import HTTPValidationError
+from hius.routing.timing import get_timing
 from starlette.websockets import WebSocket, WebSocketDisconnect
 from starlette.types import Scope, Receive, Send
 from starlette.concurrency import run_in_threadpool
@@ -127,14 +128,27 @@ class HTTPBaseEndpoint(BaseEndpoint):
                        scope: Scope,
                        receive: Receive,
                        send: Send) -> None:
+        timing = get_timing(scope)
+        if timing is not None:
+            timing.resume()
         try:
             request = Request(scope, receive)
-            response = await self._handle(self._get_method(request),
-                                          *self._get_params(request))
+            method = self._get_method(request)
+            args, kwargs = self._get_params(request)
+            scope['hius.params'] = kwargs
+            if timing is not None:
+                timing.mark('validation')
+            response = await self._handle(method, args, kwargs)
         except ValidationError as exc:
             raise HTTPValidationError(exc.raw_errors, exc.model)
 
+        if timing is not None:
+            timing.mark('handler')
+
+        scope['hius.status'] = response.status_code
         await response(scope, receive, send)
+        if timing is not None:
+            timing.mark('response')
 
     def _get_params(self, req: Request) -> Params:
         return (req,), self._parse_params(self._get_model(req), req)
@@ -0,0 +1,109 @@
+from typing import (
+    Awaitable,
+    Callable,
+    Sequence,
+    Iterable,
+    Union,
+    Dict,
+    List,
+    Set
+)
+import anyio
+
+HookRunner = Callable[['Hook'], Awaitable]
+
+
+class Hook:
+
+    __slots__ = 'func', 'name', 'depends', 'timeout',
+
+    def __init__(self,
+                 func: Callable,
+                 name: str = None,
+                 depends: Sequence[str] = (),
+                 timeout: float = None) -> None:
+        self.func = func
+        self.name = name or getattr(func, '__name__', repr(func))
+        self.depends = tuple(depends)
+        self.timeout = timeout
+
+    def __repr__(self) -> str:
+        return f'Hook({self.name!r})'
+
+
+def hook(func: Callable,
+         *,
+         name: str = None,
+         depends: Sequence[str] = (),
+         timeout: float = None) -> Hook:
+    return Hook(func, name, depends, timeout)
+
+
+def as_hooks(funcs: Iterable[Union[Callable, Hook]]) -> List[Hook]:
+    return [func if isinstance(func, Hook) else Hook(func) for func in funcs]
+
+
+def resolve(hooks: Sequence[Hook], finished: Set[str]) -> List[Hook]:
+    by_name = {}
+    for item in hooks:
+        by_name.setdefault(item.name, []).append(item)
+
+    for item in hooks:
+        for name in item.depends:
+            if len(by_name.get(name, ())) > 1:
+                raise RuntimeError(f'hook {item.name!r} depends on '
+                                   f'ambiguous hook name {name!r}')
+            if name not in by_name and name not in finished:
+                raise RuntimeError(f'hook {item.name!r} depends on '
+                                   f'unknown hook {name!r}')
+
+    resolved, pending = [], list(hooks)
+    while pending:
+        done = {item.name for item in resolved}
+        ready = [item for item in pending
+                 if all(name in done or name not in by_name
+                        for name in item.depends)]
+        if not ready:
+            raise RuntimeError(f'circular hook dependencies: {pending}')
+
+        resolved.extend(ready)
+        pending = [item for item in pending if item not in ready]
+    return resolved
+
+
+def _get_waits(hooks: Sequence[Hook], reverse: bool) -> Dict[Hook, List[Hook]]:
+    by_name = {item.name: item for item in hooks}
+    waits = {item: [] for item in hooks}
+    for item in hooks:
+        for name in item.depends:
+            if name not in by_name:
+                continue
+            if reverse:
+                waits[by_name[name]].append(item)
+            else:
+                waits[item].append(by_name[name])
+    return waits
+
+
+async def run_hooks(hooks: Sequence[Hook],
+                    runner: HookRunner,
+                    *,
+                    concurrent: bool = False,
+                    reverse: bool = False) -> None:
+    if not concurrent:
+        for item in (reversed(hooks) if reverse else hooks):
+            await runner(item)
+        return
+
+    waits = _get_waits(hooks, reverse)
+    events = {item: anyio.Event() for item in hooks}
+
+    async def run(item: Hook) -> None:
+        for dependency in waits[item]:
+            await events[dependency].wait()
+        await runner(item)
+        events[item].set()
+
+    async with anyio.create_task_group() as task_group:
+        for item in hooks:
+            task_group.start_soon(run, item)
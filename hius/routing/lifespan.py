@@ -1,53 +1,108 @@
 from inspect import iscoroutinefunction, isasyncgenfunction
 from traceback import format_exc
+from time import perf_counter
 from typing import (
     Callable,
     Optional,
     Sequence,
+    Union,
     Dict,
     Any
 )
-from starlette.concurrency import run_in_threadpool
+import anyio
 from starlette.types import Scope, Receive, Send, ASGIApp
+from hius.routing.hooks import Hook, as_hooks, resolve, run_hooks
+from hius.routing.report import Report
+from hius.routing.drain import RequestTracker
+from hius.routing.memory import Thresholds, freeze_gc
 from hius.types import LifespanGenerator
 
+Hooks = Sequence[Union[Callable, Hook]]
+
+STAGES = {
+    'startup': ('init', 'startup', 'lifespan.startup', 'warmup', 'gc'),
+    'shutdown': ('drain', 'lifespan.shutdown', 'shutdown')
+}
+
 
 class Lifespan:
 
-    __slots__ = ('on_startup', 'on_shutdown', 'on_lifespan',
-                 '_started', '_launched')
+    __slots__ = ('on_startup', 'on_shutdown', 'on_lifespan', 'on_warmup',
+                 'concurrent', 'gc_freeze', 'gc_thresholds',
+                 'report', 'log_report', 'tracker', 'drain_timeout',
+                 '_started', '_launched', '_finished')
 
     def __init__(self,
-                 on_startup: Sequence[Callable] = None,
-                 on_shutdown: Sequence[Callable] = None,
-                 on_lifespan: Sequence[LifespanGenerator] = None) -> None:
-        self.on_startup = on_startup or []
-        self.on_shutdown = on_shutdown or []
-        self.on_lifespan = on_lifespan or []
+                 on_startup: Hooks = None,
+                 on_shutdown: Hooks = None,
+                 on_lifespan: Sequence[Union[LifespanGenerator, Hook]] = None,
+                 concurrent: bool = False,
+                 report: Report = None,
+                 log_report: bool = False,
+                 tracker: RequestTracker = None,
+                 drain_timeout: float = None,
+                 on_warmup: Hooks = None,
+                 gc_freeze: bool = False,
+                 gc_thresholds: Thresholds = None) -> None:
+        self.on_startup = list(on_startup or [])
+        self.on_shutdown = list(on_shutdown or [])
+        self.on_lifespan = list(on_lifespan or [])
+        self.on_warmup = list(on_warmup or [])
+        self.gc_freeze = gc_freeze
+        self.gc_thresholds = gc_thresholds
+        self.concurrent = concurrent
+        self.report = report if report is not None else Report()
+        self.log_report = log_report
+        self.tracker = tracker
+        self.drain_timeout = drain_timeout
 
         self._started = False
-        self._launched = []
+        self._launched = {}
+        self._finished = set()
+
+    async def _run_hooks(self,
+                         stage: str,
+                         hooks: Hooks,
+                         runner: Callable,
+                         reverse: bool = False) -> None:
+        hooks = resolve(as_hooks(hooks), self._finished)
+
+        async def run(hook: Hook) -> None:
+            with self.report.measure(stage, hook.name):
+                with anyio.fail_after(hook.timeout):
+                    await runner(hook)
+            self._finished.add(hook.name)
+
+        await run_hooks(hooks, run, concurrent=self.concurrent,
+                        reverse=reverse)
 
     async def _handle(self, func: Callable, app: ASGIApp = None) -> Any:
         if iscoroutinefunction(func):
             return await func(app)
-        return await run_in_threadpool(func, app)
+        return await anyio.to_thread.run_sync(func, app, cancellable=True)
 
-    async def _handle_gen(self, func: Callable, is_async: bool) -> Any:
-        try:
-            if is_async:
+    async def _handle_gen(self, func: Callable, is_async: bool) -> None:
+        if is_async:
+            try:
                 await func()
+            except StopAsyncIteration:
+                stopped = True
             else:
-                func()
-        except (StopIteration, StopAsyncIteration):
-            pass
+                stopped = False
         else:
-            if self._started:
-                raise RuntimeError('lifespan context yielded multiple times')
+            stopped = await anyio.to_thread.run_sync(_advance, func,
+                                                     cancellable=True)
+
+        if not stopped and self._started:
+            raise RuntimeError('lifespan context yielded multiple times')
 
     def _state_started(self) -> None:
         self._started = True
 
+    def _log_report(self, state: str) -> None:
+        if self.log_report:
+            self.report.log(*STAGES[state])
+
     def _error_message(self, state: str) -> Dict[str, str]:
         return {'type': f'lifespan.{state}.failed', 'message': format_exc()}
 
@@ -64,39 +119,86 @@ class Lifespan:
             await receive()
             await self._startup(app)
             await self._startup_lifespan(app)
+            await self._warmup(app)
+            self._freeze()
+            self._log_report('startup')
             await send(self._success_message('startup'))
             self._state_started()
 
             await receive()
+            await self._drain()
             await self._shutdown_lifespan()
             await self._shutdown(app)
+            self._log_report('shutdown')
             await send(self._success_message('shutdown'))
         except Exception:
-            if self._started:
-                await send(self._error_message('shutdown'))
-            else:
-                await send(self._error_message('startup'))
+            state = 'shutdown' if self._started else 'startup'
+            self._log_report(state)
+            await send(self._error_message(state))
 
     async def _startup(self, app: Optional[ASGIApp]) -> None:
-        for func in self.on_startup:
-            await self._handle(func, app)
+        async def run(hook: Hook) -> None:
+            await self._handle(hook.func, app)
+
+        await self._run_hooks('startup', self.on_startup, run)
 
     async def _startup_lifespan(self, app: Optional[ASGIApp]) -> None:
-        for func in self.on_lifespan:
-            if isasyncgenfunction(func):
-                gen_next = func(app).__aiter__().__anext__
+        async def run(hook: Hook) -> None:
+            if isasyncgenfunction(hook.func):
+                gen_next = hook.func(app).__aiter__().__anext__
                 is_async = True
             else:
-                gen_next = func(app).__iter__().__next__
+                gen_next = hook.func(app).__iter__().__next__
                 is_async = False
 
             await self._handle_gen(gen_next, is_async=is_async)
-            self._launched.append((gen_next, is_async))
+            self._launched[hook] = (gen_next, is_async)
+
+        await self._run_hooks('lifespan.startup', self.on_lifespan, run)
+
+    async def _warmup(self, app: Optional[ASGIApp]) -> None:
+        async def run(hook: Hook) -> None:
+            await self._handle(hook.func, app)
+
+        await self._run_hooks('warmup', self.on_warmup, run)
+
+    def _freeze(self) -> None:
+        if not self.gc_freeze:
+            return
+
+        start = perf_counter()
+        frozen = freeze_gc(self.gc_thresholds)
+        self.report.add('gc', 'freeze', perf_counter() - start,
+                        frozen=frozen)
+
+    async def _drain(self) -> None:
+        if self.tracker is None:
+            return
+
+        error = None
+        start = perf_counter()
+        if not await self.tracker.drain(self.drain_timeout):
+            error = f'{self.tracker.active} requests still in flight'
+        self.report.add('drain', 'requests', perf_counter() - start, error)
 
     async def _shutdown_lifespan(self) -> None:
-        for gen_next, is_async in reversed(self._launched):
+        async def run(hook: Hook) -> None:
+            gen_next, is_async = self._launched[hook]
             await self._handle_gen(gen_next, is_async=is_async)
 
+        await self._run_hooks('lifespan.shutdown', list(self._launched), run,
+                              reverse=True)
+
     async def _shutdown(self, app: Optional[ASGIApp]) -> None:
-        for func in self.on_shutdown:
-            await self._handle(func, app)
+        async def run(hook: Hook) -> None:
+            await self._handle(hook.func, app)
+
+        await self._run_hooks('shutdown', self.on_shutdown, run)
+
+
+def _advance(gen_next: Callable) -> bool:
+    try:
+        gen_next()
+    except StopIteration:
+        return True
+    return False
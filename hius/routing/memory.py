@@ -0,0 +1,12 @@
+import gc
+from typing import Optional, Tuple
+
+Thresholds = Tuple[int, ...]
+
+
+def freeze_gc(thresholds: Optional[Thresholds] = None) -> int:
+    gc.collect()
+    gc.freeze()
+    if thresholds is not None:
+        gc.set_threshold(*thresholds)
+    return gc.get_freeze_count()
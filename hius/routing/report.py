@@ -0,0 +1,110 @@
+from contextlib import contextmanager
+from time import perf_counter
+from logging import Logger, getLogger, INFO
+from typing import (
+    Iterator,
+    Optional,
+    List,
+    Dict,
+    Any
+)
+
+logger = getLogger('hius.lifespan')
+
+
+class Timing:
+
+    __slots__ = 'stage', 'name', 'duration', 'error', 'details',
+
+    def __init__(self,
+                 stage: str,
+                 name: str,
+                 duration: float,
+                 error: str = None,
+                 details: Dict[str, Any] = None) -> None:
+        self.stage = stage
+        self.name = name
+        self.duration = duration
+        self.error = error
+        self.details = details or {}
+
+    def __repr__(self) -> str:
+        return (f'Timing({self.stage!r}, {self.name!r}, '
+                f'{self.duration:.6f}, ok={self.ok})')
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            'stage': self.stage,
+            'name': self.name,
+            'duration': self.duration,
+            'ok': self.ok,
+            'error': self.error,
+            **self.details
+        }
+
+
+class Report:
+
+    __slots__ = 'timings',
+
+    def __init__(self) -> None:
+        self.timings: List[Timing] = []
+
+    def __iter__(self) -> Iterator[Timing]:
+        return iter(self.timings)
+
+    def __len__(self) -> int:
+        return len(self.timings)
+
+    def add(self,
+            stage: str,
+            name: str,
+            duration: float,
+            error: str = None,
+            **details: Any) -> Timing:
+        timing = Timing(stage, name, duration, error, details)
+        self.timings.append(timing)
+        return timing
+
+    @contextmanager
+    def measure(self, stage: str, name: str) -> Iterator[None]:
+        error = None
+        start = perf_counter()
+        try:
+            yield
+        except BaseException as exc:
+            error = type(exc).__name__
+            if str(exc):
+                error = f'{error}: {exc}'
+            raise
+        finally:
+            self.add(stage, name, perf_counter() - start, error)
+
+    def get(self, *stages: str) -> List[Timing]:
+        return [t for t in self.timings if not stages or t.stage in stages]
+
+    def total(self, *stages: str) -> float:
+        return sum(t.duration for t in self.get(*stages))
+
+    def slowest(self, count: int = 5, *stages: str) -> List[Timing]:
+        timings = sorted(self.get(*stages), key=lambda t: -t.duration)
+        return timings[:count]
+
+    def as_dict(self) -> List[Dict[str, Any]]:
+        return [timing.as_dict() for timing in self.timings]
+
+    def log(self,
+            *stages: str,
+            logger: Optional[Logger] = logger,
+            level: int = INFO) -> None:
+        for timing in self.get(*stages):
+            status = 'ok' if timing.ok else f'failed ({timing.error})'
+            for key, value in timing.details.items():
+                status += f', {key}={value}'
+            logger.log(level, '%s %s: %.3f ms, %s', timing.stage,
+                       timing.name, timing.duration * 1000, status)
+        logger.log(level, 'total: %.3f ms', self.total(*stages) * 1000)
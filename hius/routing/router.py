@@ -1,6 +1,8 @@
-from itertools import chain
+from time import perf_counter
+from itertools import chain, count
 from collections import defaultdict
 from typing import (
+    TYPE_CHECKING,
     DefaultDict,
     Awaitable,
     Callable,
@@ -11,11 +13,14 @@ from typing import (
     List
 )
 from starlette.datastructures import URLPath
+from starlette.exceptions import HTTPException
 from starlette.websockets import WebSocketDisconnect
 from starlette.types import Scope, Receive, Send, ASGIApp
+from hius.types import Middleware
 from hius.httpcodes import HTTPNotFound, HTTPMethodNotAllowed
-from hius.routing.utils import Match
-from hius.routing.exceptions import NoMatchFound
+from hius.routing.utils import Match, build_middleware_stack
+from hius.routing.exceptions import NoMatchFound, HTTPValidationError
+from hius.routing.timing import get_timing
 from hius.routing.routes import (
     BaseRoute,
     PlainRoute,
@@ -29,28 +34,40 @@ from hius.routing.routes import (
     websocket,
 )
 
+if TYPE_CHECKING:  # pragma: no cover
+    from hius.metrics.recorder import RequestMetrics
+
 Lifespan = Callable[[Scope, Receive, Send], Awaitable]
 Plain = DefaultDict[str, List[BaseRoute]]
 Dynamic = List[BaseRoute]
-PathsAndRoute = Tuple[str, BaseRoute]
+PathsAndRoute = Tuple[Tuple[str, ...], BaseRoute]
+
+_revisions = count(1)
 
 
 class Router:
 
-    __slots__ = '_mounted', '_http', '_webs', 'lifespan',
+    __slots__ = ('_mounted', '_http', '_webs', '_revision', '_handler',
+                 'lifespan', 'middleware', 'metrics')
 
     def __init__(self,
                  routes: Sequence[BaseRoute] = None,
-                 lifespan: Lifespan = None) -> None:
+                 lifespan: Lifespan = None,
+                 middleware: Middleware = None,
+                 metrics: 'RequestMetrics' = None) -> None:
         self._mounted = []
 
         self._http = {'plain': defaultdict(list), 'dynamic': []}
         self._webs = {'plain': defaultdict(list), 'dynamic': []}
+        self._revision = 0
 
         async def default_lifespan(*args):
             pass  # pragma: no cover
 
         self.lifespan = lifespan or default_lifespan
+        self.middleware = middleware or []
+        self.metrics = metrics
+        self._handler = build_middleware_stack(self.dispatch, self.middleware)
 
         if routes is not None:
             self._bind_routes(routes)
@@ -59,12 +76,19 @@ class Router:
                        scope: Scope,
                        receive: Receive,
                        send: Send) -> None:
+        if scope['type'] == 'lifespan':
+            await self.lifespan(scope, receive, send)
+        else:
+            await self._handler(scope, receive, send)
+
+    async def dispatch(self,
+                       scope: Scope,
+                       receive: Receive,
+                       send: Send) -> None:
         if scope['type'] == 'http':
             await self.match_http(scope, receive, send)
         elif scope['type'] == 'websocket':
             await self.match_websocket(scope, receive, send)
-        elif scope['type'] == 'lifespan':
-            await self.lifespan(scope, receive, send)
 
     def _set_scope_vars(self, scope: Scope) -> None:
         if 'router' not in scope:
@@ -77,15 +101,40 @@ class Router:
                          scope: Scope,
                          receive: Receive,
                          send: Send) -> None:
+        metrics = self.metrics
+        if metrics is None or 'hius.warmup' in scope:
+            await self._get_http_endpoint(scope)(scope, receive, send)
+            return
+
+        status = 500
+        start = perf_counter()
+        try:
+            await self._get_http_endpoint(scope)(scope, receive, send)
+            status = scope.get('hius.status', 200)
+        except HTTPException as exc:
+            status = exc.status_code
+            raise
+        except HTTPValidationError:
+            status = 400
+            raise
+        finally:
+            metrics.record(scope.get('route'), status, perf_counter() - start)
+
+    def _get_http_endpoint(self, scope: Scope) -> ASGIApp:
         self._set_scope_vars(scope)
+
+        timing = get_timing(scope)
+        if timing is not None:
+            timing.resume()
         match, endpoint = self._match(scope, **self._http)
+        if timing is not None:
+            timing.mark('routing')
 
-        if match == Match.FULL:
-            await endpoint(scope, receive, send)
+        if endpoint is not None:
+            return endpoint
         elif match == Match.NONE:
             raise HTTPNotFound()
-        elif match == Match.PARTIAL:
-            raise HTTPMethodNotAllowed()
+        raise HTTPMethodNotAllowed()
 
     async def match_websocket(self,
                               scope: Scope,
@@ -124,19 +173,28 @@ class Router:
                      plain: Plain) -> Optional[RouteMatch]:
         routes = plain.get(scope['ctx_path'])
         if routes is not None:
+            partial = Match.PARTIAL, None
             for route in routes:
-                match, endpoint = route.match(scope)
-                if endpoint is not None:
-                    return match, endpoint
-            return match, endpoint
+                match = route.match(scope)
+                if match[0] == Match.FULL:
+                    return match
+                if partial[1] is None:
+                    partial = match
+            return partial
 
     def _match_dynamic(self,
                        scope: Scope,
                        dynamic: Dynamic) -> Optional[RouteMatch]:
+        partial = None
         for route in dynamic:
             match = route.match(scope)
-            if match is not None:
+            if match is None:
+                continue
+            if match[0] == Match.FULL:
                 return match
+            if partial is None or partial[1] is None:
+                partial = match
+        return partial
 
     def _match_mounted(self,
                        scope: Scope) -> Optional[RouteMatch]:
@@ -153,6 +211,8 @@ class Router:
             self.__bind(route)
 
     def __bind(self, route: BaseRoute) -> None:
+        self._revision = next(_revisions)
+
         if isinstance(route, Mount):
             self._mounted.append(route)
             return
@@ -171,38 +231,43 @@ class Router:
                path: str,
                routes: Optional[Sequence[BaseRoute]],
                app: Optional[ASGIApp],
-               name: Optional[str]) -> None:
-        self.__bind(mount(path, routes, app, name))
+               name: Optional[str],
+               middleware: Optional[Middleware] = None) -> None:
+        self.__bind(mount(path, routes, app, name, middleware))
 
     def _route(self,
                path: str,
                endpoint: Callable,
                methods: Optional[Sequence[str]],
-               name: Optional[str]) -> None:
-        self.__bind(route(path, endpoint, methods, name))
+               name: Optional[str],
+               middleware: Optional[Middleware] = None) -> None:
+        self.__bind(route(path, endpoint, methods, name, middleware))
 
     def _websocket(self,
                    path: str,
                    endpoint: Callable,
-                   name: Optional[str]) -> None:
-        self.__bind(websocket(path, endpoint, name))
+                   name: Optional[str],
+                   middleware: Optional[Middleware] = None) -> None:
+        self.__bind(websocket(path, endpoint, name, middleware))
 
     # ---
 
     def route(self,
               path: str,
               methods: Sequence[str] = None,
-              name: str = None) -> Callable:
+              name: str = None,
+              middleware: Middleware = None) -> Callable:
         def decorator(endpoint: Callable) -> Callable:
-            self._route(path, endpoint, methods, name)
+            self._route(path, endpoint, methods, name, middleware)
             return endpoint
         return decorator
 
     def websocket(self,
                   path: str,
-                  name: str = None) -> Callable:
+                  name: str = None,
+                  middleware: Middleware = None) -> Callable:
         def decorator(endpoint: Callable) -> Callable:
-            self._websocket(path, endpoint, name)
+            self._websocket(path, endpoint, name, middleware)
             return endpoint
         return decorator
 
@@ -224,19 +289,42 @@ class Router:
                 pass
         raise NoMatchFound
 
-    def iter_http_routes(self, paths: list = []) -> Iterator[PathsAndRoute]:
+    @property
+    def revision(self) -> int:
+        revision = self._revision
         for mnt in self._mounted:
-            paths.append(mnt.path)
+            router = get_router(mnt.app)
+            if router is not None:
+                revision = max(revision, router.revision)
+        return revision
 
-            if isinstance(mnt.app, type(self)):
-                router = mnt.app
-            else:
-                router = mnt.app.router
+    def iter_http_routes(self) -> Iterator[PathsAndRoute]:
+        stack = [((), self)]
+        while stack:
+            paths, router = stack.pop()
 
-            for paths, route in router.iter_http_routes(paths=paths):
+            for route in router.__route_iter(**router._http):
                 yield paths, route
 
-            paths.pop()
-
-        for route in self.__route_iter(**self._http):
-            yield paths, route
+            for mnt in reversed(router._mounted):
+                mounted = get_router(mnt.app)
+                if mounted is not None:
+                    stack.append(((*paths, mnt.path), mounted))
+
+    def iter_mounted_apps(self) -> Iterator[ASGIApp]:
+        stack = [self]
+        while stack:
+            router = stack.pop()
+            for mnt in reversed(router._mounted):
+                mounted = get_router(mnt.app)
+                if mounted is not None:
+                    stack.append(mounted)
+                else:
+                    yield mnt.app
+
+
+def get_router(app: ASGIApp) -> Optional[Router]:
+    if isinstance(app, Router):
+        return app
+    if isinstance(getattr(app, 'router', None), Router):
+        return app.router
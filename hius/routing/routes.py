@@ -12,8 +12,10 @@ from typing import (
     Set,
     Any
 )
-from starlette.types import Scope, ASGIApp
-from hius.routing.utils import Match, URLPath
+from starlette.types import Scope, Receive, Send, ASGIApp
+from hius.types import Middleware
+from hius.httpcodes import HTTPMethodNotAllowed
+from hius.routing.utils import Match, URLPath, build_middleware_stack
 from hius.routing.parser import parse_path
 from hius.routing.endpoint import (
     HTTP_METHODS,
@@ -36,15 +38,18 @@ RouteMatch = Tuple[Match, Optional[Callable]]
 
 class BaseRoute:
 
-    __slots__ = 'path', 'endpoint', 'name',
+    __slots__ = 'path', 'endpoint', 'name', 'handler', 'metrics',
 
     def __init__(self,
                  path: str,
                  endpoint: Callable,
-                 name: str = None) -> None:
+                 name: str = None,
+                 middleware: Middleware = None) -> None:
         self.path = path
         self.endpoint = self._prepare_endpoint(endpoint)
         self.name = self._prepare_name(name)
+        self.handler = self._prepare_handler(middleware)
+        self.metrics = None
 
     def match(self, scope: Scope) -> None:
         raise NotImplementedError  # pragma: no cover
@@ -52,6 +57,9 @@ class BaseRoute:
     def url_path_for(self, name: str) -> None:
         raise NotImplementedError  # pragma: no cover
 
+    def _prepare_handler(self, middleware: Optional[Middleware]) -> ASGIApp:
+        return build_middleware_stack(self.endpoint, middleware)
+
     def _prepare_endpoint(self, endpoint: Callable) -> Type[BaseEndpoint]:
         if isinstance(self, HTTPRoute):
             return get_http_endpoint(endpoint)
@@ -76,6 +84,28 @@ class BaseRoute:
                                 'tuple, set or None type')
 
 
+class HTTPBaseRoute(BaseRoute):
+
+    __slots__ = ()
+
+    def _prepare_handler(self, middleware: Optional[Middleware]) -> ASGIApp:
+        if not middleware:
+            self.fallback = None
+            return self.endpoint
+
+        handler = build_middleware_stack(self._dispatch, middleware)
+        self.fallback = handler
+        return handler
+
+    async def _dispatch(self,
+                        scope: Scope,
+                        receive: Receive,
+                        send: Send) -> None:
+        if scope['method'] not in self.methods:
+            raise HTTPMethodNotAllowed()
+        await self.endpoint(scope, receive, send)
+
+
 class DynamicBaseRoute(BaseRoute):
 
     __slots__ = 'pattern', 'converters',
@@ -85,8 +115,9 @@ class DynamicBaseRoute(BaseRoute):
                  endpoint: Callable,
                  pattern: Pattern,
                  converters: Dict[str, Callable],
-                 name: Optional[str] = None) -> None:
-        super().__init__(path, endpoint, name)
+                 name: Optional[str] = None,
+                 middleware: Middleware = None) -> None:
+        super().__init__(path, endpoint, name, middleware)
         self.pattern = pattern
         self.converters = converters
 
@@ -100,16 +131,19 @@ class DynamicBaseRoute(BaseRoute):
 
 class Mount:
 
-    __slots__ = 'path', 'app', 'name',
+    __slots__ = 'path', 'app', 'name', 'handler', 'metrics',
 
     def __init__(self,
                  path: str,
                  routes: Sequence[BaseRoute] = None,
                  app: ASGIApp = None,
-                 name: Optional[str] = None) -> None:
+                 name: Optional[str] = None,
+                 middleware: Middleware = None) -> None:
         self.path = path
         self.app = self._prepare_app(app, routes)
         self.name = self._prepare_name(name)
+        self.handler = build_middleware_stack(self.app, middleware)
+        self.metrics = None
 
     def _prepare_app(self,
                      app: Optional[ASGIApp],
@@ -126,35 +160,41 @@ class Mount:
 
     def url_path_for(self, name: str) -> URLPath:
         if hasattr(self.app, 'url_path_for'):
-            return self.app.url_path_for(name).appendleft(self.path)
-        elif self.name == name:
+            try:
+                return self.app.url_path_for(name).appendleft(self.path)
+            except NoMatchFound:
+                pass
+        if self.name == name:
             return URLPath(path=self.path)
         raise NoMatchFound
 
     def match(self, scope: Scope) -> RouteMatch:
         scope['ctx_path'] = self._trim_path(scope)
-        return Match.FULL, self.app
+        scope['route'] = self
+        return Match.FULL, self.handler
 
 
 # ---
 
 
-class PlainHTTPRoute(BaseRoute):
+class PlainHTTPRoute(HTTPBaseRoute):
 
-    __slots__ = 'methods',
+    __slots__ = 'methods', 'fallback',
 
     def __init__(self,
                  path: str,
                  endpoint: Callable,
                  methods: Sequence[str] = None,
-                 name: str = None) -> None:
-        super().__init__(path, endpoint, name)
+                 name: str = None,
+                 middleware: Middleware = None) -> None:
+        super().__init__(path, endpoint, name, middleware)
         self.methods = self._prepare_methods(methods)
 
     def match(self, scope: Scope) -> RouteMatch:
         if scope['method'] in self.methods:
-            return Match.FULL, self.endpoint
-        return Match.PARTIAL, None
+            scope['route'] = self
+            return Match.FULL, self.handler
+        return Match.PARTIAL, self.fallback
 
     def url_path_for(self, name: str) -> URLPath:
         if self.name == name:
@@ -167,11 +207,13 @@ class PlainWebsocketRoute(BaseRoute):
     def __init__(self,
                  path: str,
                  endpoint: Callable,
-                 name: str = None) -> None:
-        super().__init__(path, endpoint, name)
+                 name: str = None,
+                 middleware: Middleware = None) -> None:
+        super().__init__(path, endpoint, name, middleware)
 
     def match(self, scope: Scope) -> RouteMatch:
-        return Match.FULL, self.endpoint
+        scope['route'] = self
+        return Match.FULL, self.handler
 
     def url_path_for(self, name: str) -> URLPath:
         if self.name == name:
@@ -182,9 +224,9 @@ class PlainWebsocketRoute(BaseRoute):
 # ---
 
 
-class DynamicHTTPRoute(DynamicBaseRoute):
+class DynamicHTTPRoute(DynamicBaseRoute, HTTPBaseRoute):
 
-    __slots__ = 'methods',
+    __slots__ = 'methods', 'fallback',
 
     def __init__(self,
                  path: str,
@@ -192,8 +234,9 @@ class DynamicHTTPRoute(DynamicBaseRoute):
                  pattern: Pattern,
                  converters: Dict[str, Callable],
                  methods: Sequence[str] = None,
-                 name: str = None) -> None:
-        super().__init__(path, endpoint, pattern, converters, name)
+                 name: str = None,
+                 middleware: Middleware = None) -> None:
+        super().__init__(path, endpoint, pattern, converters, name, middleware)
         self.methods = self._prepare_methods(methods)
 
     def match(self, scope: Scope) -> Optional[RouteMatch]:
@@ -203,8 +246,9 @@ class DynamicHTTPRoute(DynamicBaseRoute):
 
         if scope['method'] in self.methods:
             scope['path_params'] = self._convert_params(match)
-            return Match.FULL, self.endpoint
-        return Match.PARTIAL, None
+            scope['route'] = self
+            return Match.FULL, self.handler
+        return Match.PARTIAL, self.fallback
 
     def url_path_for(self, name: str) -> URLPath:
         if self.name == name:
@@ -219,8 +263,9 @@ class DynamicWebsocketRoute(DynamicBaseRoute):
                  endpoint: Callable,
                  pattern: Pattern,
                  converters: Dict[str, Callable],
-                 name: str = None) -> None:
-        super().__init__(path, endpoint, pattern, converters, name)
+                 name: str = None,
+                 middleware: Middleware = None) -> None:
+        super().__init__(path, endpoint, pattern, converters, name, middleware)
 
     def match(self, scope: Scope) -> Optional[RouteMatch]:
         match = self.pattern.match(scope['ctx_path'])
@@ -228,7 +273,8 @@ class DynamicWebsocketRoute(DynamicBaseRoute):
             return
 
         scope['path_params'] = self._convert_params(match)
-        return Match.FULL, self.endpoint
+        scope['route'] = self
+        return Match.FULL, self.handler
 
     def url_path_for(self, name: str) -> URLPath:
         if self.name == name:
@@ -258,26 +304,31 @@ def __check_and_strip_path(path: str) -> str:
 def route(path: str,
           endpoint: Callable,
           methods: Sequence[str] = None,
-          name: str = None) -> Union[HTTPRoute]:
+          name: str = None,
+          middleware: Middleware = None) -> Union[HTTPRoute]:
     path, pattern, converters = parse_path(__check_and_strip_path(path))
 
     if not converters:
-        return PlainHTTPRoute(path, endpoint, methods, name)
-    return DynamicHTTPRoute(path, endpoint, pattern, converters, methods, name)
+        return PlainHTTPRoute(path, endpoint, methods, name, middleware)
+    return DynamicHTTPRoute(path, endpoint, pattern, converters,
+                            methods, name, middleware)
 
 
 def mount(path: str,
           routes: Sequence[BaseRoute] = None,
           app: ASGIApp = None,
-          name: Optional[str] = None) -> Mount:
-    return Mount(__check_and_strip_path(path), routes, app, name)
+          name: Optional[str] = None,
+          middleware: Middleware = None) -> Mount:
+    return Mount(__check_and_strip_path(path), routes, app, name, middleware)
 
 
 def websocket(path: str,
               endpoint: Callable,
-              name: str = None) -> Union[WebsocketRoute]:
+              name: str = None,
+              middleware: Middleware = None) -> Union[WebsocketRoute]:
     path, pattern, converters = parse_path(__check_and_strip_path(path))
 
     if not converters:
-        return PlainWebsocketRoute(path, endpoint, name)
-    return DynamicWebsocketRoute(path, endpoint, pattern, converters, name)
+        return PlainWebsocketRoute(path, endpoint, name, middleware)
+    return DynamicWebsocketRoute(path, endpoint, pattern, converters,
+                                 name, middleware)
@@ -0,0 +1,108 @@
+from time import perf_counter_ns
+from typing import (
+    TYPE_CHECKING,
+    Optional,
+    Tuple,
+    Dict,
+    Any
+)
+from starlette.types import Scope, Receive, Send, ASGIApp, Message
+
+if TYPE_CHECKING:  # pragma: no cover
+    from hius.metrics.store import MetricsStore
+
+TIMING = 'hius.timing'
+UNMATCHED = '<unmatched>'
+
+
+class Timing:
+
+    __slots__ = 'started', 'stages', '_last',
+
+    def __init__(self) -> None:
+        self.started = self._last = perf_counter_ns()
+        self.stages: Dict[str, int] = {}
+
+    def resume(self) -> None:
+        self._last = perf_counter_ns()
+
+    def mark(self, stage: str) -> None:
+        now = perf_counter_ns()
+        self.stages[stage] = self.stages.get(stage, 0) + now - self._last
+        self._last = now
+
+    @property
+    def total(self) -> int:
+        return perf_counter_ns() - self.started
+
+    def server_timing(self) -> str:
+        stages = (*self.stages.items(), ('total', self.total))
+        return ', '.join(f'{stage};dur={duration / 1e6:.3f}'
+                         for stage, duration in stages)
+
+
+def get_timing(scope: Scope) -> Optional[Timing]:
+    extensions = scope.get('extensions')
+    if extensions:
+        return extensions.get(TIMING)
+    return None
+
+
+# ---
+
+
+class TimingMiddleware:
+    def __init__(self,
+                 app: ASGIApp,
+                 server_timing: bool = True,
+                 store: 'MetricsStore' = None,
+                 name: str = 'hius_http_stage_duration_seconds') -> None:
+        self.app = app
+        self.server_timing = server_timing
+        self.store = store
+        self.name = name
+        self._names: Dict[Tuple[Any, str], str] = {}
+
+    async def __call__(self,
+                       scope: Scope,
+                       receive: Receive,
+                       send: Send) -> None:
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+
+        timing = Timing()
+        scope['extensions'] = {**scope.get('extensions', {}), TIMING: timing}
+
+        if self.server_timing:
+            async def send_wrapper(message: Message) -> None:
+                if message['type'] == 'http.response.start':
+                    header = (b'server-timing',
+                              timing.server_timing().encode('latin-1'))
+                    message['headers'] = [*message.get('headers', ()),
+                                          header]
+                await send(message)
+        else:
+            send_wrapper = send
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            if self.store is not None and 'hius.warmup' not in scope:
+                self.record(scope, timing)
+
+    def record(self, scope: Scope, timing: Timing) -> None:
+        route = scope.get('route')
+        for stage, duration in timing.stages.items():
+            key = (route, stage)
+            name = self._names.get(key)
+            if name is None:
+                name = self._names[key] = self._get_name(*key)
+            self.store.observe(name, duration / 1e9)
+
+    def _get_name(self, route: Any, stage: str) -> str:
+        # metrics need fcntl and mmap, so they are imported only when used
+        from hius.metrics.exposition import metric_name
+
+        route_name = UNMATCHED if route is None else route.name
+        return metric_name(self.name, route=route_name, stage=stage)
@@ -7,7 +7,9 @@ from typing import (
     Any
 )
 from starlette.datastructures import URL
+from starlette.types import ASGIApp
 from hius.routing.exceptions import ProtocolError
+from hius.types import Middleware
 
 PROTOCOL_MAPPING = {
     'http': {True: 'https', False: 'http'},
@@ -77,3 +79,10 @@ class URLPath:
 
         path = base_url.path.rstrip('/') + self.path
         return URL(scheme=scheme, netloc=netloc, path=path)
+
+
+def build_middleware_stack(app: ASGIApp,
+                           middleware: Optional[Middleware]) -> ASGIApp:
+    for cls, options in reversed(middleware or ()):
+        app = cls(app=app, **options)
+    return app
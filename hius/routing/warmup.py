@@ -0,0 +1,94 @@
+from functools import partial
+from typing import (
+    Sequence,
+    Union,
+    Tuple,
+    Dict,
+    List,
+    Any
+)
+from starlette.concurrency import run_in_threadpool
+from starlette.types import ASGIApp, Message
+from hius.routing.hooks import Hook
+from hius.routing.router import get_router
+
+WarmupRequest = Union[str, Tuple[str, str], Tuple[str, str, Dict[str, str]]]
+
+
+async def replay(app: ASGIApp,
+                 method: str,
+                 path: str,
+                 headers: Dict[str, str] = None) -> int:
+    path, _, query_string = path.partition('?')
+    scope = {
+        'type': 'http',
+        'asgi': {'version': '3.0'},
+        'http_version': '1.1',
+        'method': method,
+        'scheme': 'http',
+        'path': path,
+        'raw_path': path.encode(),
+        'root_path': '',
+        'query_string': query_string.encode(),
+        'headers': [(key.lower().encode('latin-1'), value.encode('latin-1'))
+                    for key, value in (headers or {}).items()],
+        'client': None,
+        'server': None,
+        'hius.warmup': True
+    }
+    messages = []
+
+    async def receive() -> Message:
+        return {'type': 'http.request', 'body': b'', 'more_body': False}
+
+    async def send(message: Message) -> None:
+        messages.append(message)
+
+    await app(scope, receive, send)
+    return messages[0]['status'] if messages else 500
+
+
+async def warmup_request(request: WarmupRequest, app: ASGIApp) -> None:
+    method, path, headers = _parse_request(request)
+    status = await replay(app, method, path, headers)
+    if status >= 500:
+        raise RuntimeError(f'warmup request {method} {path} '
+                           f'returned {status}')
+
+
+def warmup_mounted_apps(app: ASGIApp) -> None:
+    router = get_router(app)
+    if router is None:
+        return
+
+    for mounted in router.iter_mounted_apps():
+        if hasattr(mounted, 'warmup'):
+            mounted.warmup(app)
+
+
+async def warmup_mounts(app: ASGIApp) -> None:
+    await run_in_threadpool(warmup_mounted_apps, app)
+
+
+def warmup_openapi(app: ASGIApp) -> None:
+    app.openapi.render()
+
+
+def get_warmup_hooks(app: ASGIApp,
+                     requests: Sequence[WarmupRequest] = ()) -> List[Hook]:
+    hooks = [Hook(warmup_mounts, name='mounts')]
+    if app.openapi is not None:
+        hooks.append(Hook(warmup_openapi, name='openapi'))
+
+    for request in requests:
+        method, path, _ = _parse_request(request)
+        hooks.append(Hook(partial(warmup_request, request),
+                          name=f'{method} {path}'))
+    return hooks
+
+
+def _parse_request(request: WarmupRequest) -> Tuple[str, str, Any]:
+    if isinstance(request, str):
+        request = 'GET', request
+    method, path, headers = (*request, None)[:3]
+    return method.upper(), path, headers
@@ -0,0 +1,305 @@
+import os
+import sys
+import mmap
+import time
+import signal
+import socket
+import struct
+import asyncio
+import importlib
+from logging import getLogger
+from typing import (
+    Optional,
+    Dict,
+    List,
+    Any
+)
+from starlette.types import ASGIApp
+from hius.routing.memory import Thresholds, freeze_gc
+from hius.routing.warmup import warmup_mounted_apps, warmup_openapi
+
+try:
+    import uvicorn
+except ImportError:  # pragma: no cover
+    uvicorn = None
+
+logger = getLogger('hius.runner')
+
+HAS_REUSEPORT = hasattr(socket, 'SO_REUSEPORT')
+HEARTBEAT = struct.Struct('d')
+WORKER_ID = 'HIUS_WORKER_ID'
+
+
+def import_app(spec: str) -> ASGIApp:
+    module_name, _, attrs = spec.partition(':')
+    if not module_name or not attrs:
+        raise RuntimeError(f'app must be given as "module:attribute", '
+                           f'got {spec!r}')
+
+    if os.getcwd() not in sys.path:
+        sys.path.insert(0, os.getcwd())
+
+    app = importlib.import_module(module_name)
+    for attr in attrs.split('.'):
+        app = getattr(app, attr)
+    return app
+
+
+def prepare_app(app: ASGIApp) -> None:
+    if getattr(app, 'openapi', None) is not None:
+        warmup_openapi(app)
+    warmup_mounted_apps(app)
+
+
+def create_socket(host: str,
+                  port: int,
+                  reuse_port: bool = HAS_REUSEPORT,
+                  listen: bool = True,
+                  backlog: int = 2048) -> socket.socket:
+    family = socket.AF_INET6 if ':' in host else socket.AF_INET
+    sock = socket.socket(family, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    if reuse_port:
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+
+    sock.bind((host, port))
+    if listen:
+        sock.listen(backlog)
+    sock.set_inheritable(True)
+    return sock
+
+
+def get_worker_id() -> Optional[int]:
+    worker_id = os.environ.get(WORKER_ID)
+    return int(worker_id) if worker_id is not None else None
+
+
+def get_exit_code(status: int) -> int:
+    if os.WIFSIGNALED(status):
+        return -os.WTERMSIG(status)
+    return os.WEXITSTATUS(status)
+
+
+# ---
+
+
+class Worker:
+
+    __slots__ = 'id', 'pid', 'started',
+
+    def __init__(self, worker_id: int, pid: int) -> None:
+        self.id = worker_id
+        self.pid = pid
+        self.started = time.monotonic()
+
+
+class Supervisor:
+
+    __slots__ = ('app', 'host', 'port', 'workers', 'timeout',
+                 'graceful_timeout', 'gc_freeze', 'gc_thresholds',
+                 'server_options', '_socket', '_heartbeats', '_workers',
+                 '_signals', '_running')
+
+    def __init__(self,
+                 app: ASGIApp,
+                 host: str = '127.0.0.1',
+                 port: int = 8000,
+                 workers: int = 1,
+                 timeout: float = 30.0,
+                 graceful_timeout: float = 30.0,
+                 gc_freeze: bool = False,
+                 gc_thresholds: Thresholds = None,
+                 **server_options: Any) -> None:
+        if uvicorn is None:
+            raise RuntimeError('uvicorn is required to serve the app, '
+                               'install it with "pip install hius[uvicorn]"')
+
+        self.app = app
+        self.host = host
+        self.port = port
+        self.workers = workers
+        self.timeout = timeout
+        self.graceful_timeout = graceful_timeout
+        self.gc_freeze = gc_freeze
+        self.gc_thresholds = gc_thresholds
+        self.server_options = server_options
+
+        self._socket = None
+        self._heartbeats = None
+        self._workers: Dict[int, Worker] = {}
+        self._signals: List[int] = []
+        self._running = False
+
+    def run(self) -> None:
+        prepare_app(self.app)
+        if self.gc_freeze:
+            logger.info('frozen %d objects', freeze_gc(self.gc_thresholds))
+
+        self._socket = create_socket(self.host, self.port,
+                                     listen=not HAS_REUSEPORT)
+        self.port = self._socket.getsockname()[1]
+        self._heartbeats = mmap.mmap(-1, HEARTBEAT.size * self.workers)
+
+        self._install_signals()
+        self._running = True
+
+        logger.info('serving on http://%s:%d with %d workers (pid %d)',
+                    self.host, self.port, self.workers, os.getpid())
+        try:
+            for worker_id in range(self.workers):
+                self._spawn(worker_id)
+
+            while self._running:
+                self._handle_signals()
+                self._reap()
+                self._check_heartbeats()
+                time.sleep(0.1)
+        finally:
+            self._stop()
+
+    def _install_signals(self) -> None:
+        for sig in (signal.SIGINT, signal.SIGTERM, signal.SIGHUP):
+            signal.signal(sig, lambda sig, frame: self._signals.append(sig))
+
+    def _handle_signals(self) -> None:
+        while self._signals:
+            sig = self._signals.pop(0)
+            if sig == signal.SIGHUP:
+                self._restart()
+            else:
+                self._running = False
+
+    # ---
+
+    def _spawn(self, worker_id: int) -> None:
+        self._beat(worker_id)
+
+        pid = os.fork()
+        if pid:
+            self._workers[worker_id] = Worker(worker_id, pid)
+            logger.info('worker %d started (pid %d)', worker_id, pid)
+            return
+
+        code = 0
+        try:
+            self._run_worker(worker_id)
+        except BaseException:
+            logger.exception('worker %d failed', worker_id)
+            code = 1
+        finally:
+            os._exit(code)
+
+    def _run_worker(self, worker_id: int) -> None:
+        for sig in (signal.SIGINT, signal.SIGTERM, signal.SIGHUP):
+            signal.signal(sig, signal.SIG_DFL)
+        os.environ[WORKER_ID] = str(worker_id)
+
+        if HAS_REUSEPORT:
+            sock = create_socket(self.host, self.port)
+        else:
+            sock = self._socket  # pragma: no cover
+        asyncio.run(self._serve(worker_id, sock))
+
+    async def _serve(self, worker_id: int, sock: socket.socket) -> None:
+        config = uvicorn.Config(self.app, lifespan='on',
+                                **self.server_options)
+        server = uvicorn.Server(config)
+
+        heartbeat = asyncio.ensure_future(self._heartbeat(worker_id, server))
+        try:
+            await server.serve(sockets=[sock])
+        finally:
+            heartbeat.cancel()
+
+    async def _heartbeat(self, worker_id: int, server: Any) -> None:
+        master = os.getppid()
+        while os.getppid() == master:
+            self._beat(worker_id)
+            await asyncio.sleep(self.timeout / 4)
+
+        logger.error('master process is gone, worker %d exits', worker_id)
+        server.should_exit = True
+
+    def _beat(self, worker_id: int) -> None:
+        HEARTBEAT.pack_into(self._heartbeats, HEARTBEAT.size * worker_id,
+                            time.monotonic())
+
+    # ---
+
+    def _reap(self) -> None:
+        while True:
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                return
+            if not pid:
+                return
+
+            worker = self._find_worker(pid)
+            if worker is None or not self._running:
+                continue
+
+            logger.warning('worker %d (pid %d) exited with code %s',
+                           worker.id, pid, get_exit_code(status))
+            if time.monotonic() - worker.started < 1:
+                time.sleep(1)
+            self._spawn(worker.id)
+
+    def _find_worker(self, pid: int) -> Optional[Worker]:
+        for worker in self._workers.values():
+            if worker.pid == pid:
+                return worker
+        return None
+
+    def _check_heartbeats(self) -> None:
+        now = time.monotonic()
+        for worker in self._workers.values():
+            offset = HEARTBEAT.size * worker.id
+            last, = HEARTBEAT.unpack_from(self._heartbeats, offset)
+            if now - last > self.timeout:
+                logger.error('worker %d (pid %d) is not responding, killing',
+                             worker.id, worker.pid)
+                self._kill(worker.pid, signal.SIGKILL)
+                self._beat(worker.id)
+
+    def _restart(self) -> None:
+        logger.info('restarting workers')
+        for worker in list(self._workers.values()):
+            self._spawn(worker.id)
+            self._terminate([worker.pid])
+
+    def _stop(self) -> None:
+        self._running = False
+        self._terminate([worker.pid for worker in self._workers.values()])
+        self._workers.clear()
+        if self._socket is not None:
+            self._socket.close()
+
+    def _terminate(self, pids: List[int]) -> None:
+        for pid in pids:
+            self._kill(pid, signal.SIGTERM)
+
+        deadline = time.monotonic() + self.graceful_timeout
+        pending = set(pids)
+        while pending and time.monotonic() < deadline:
+            for pid in list(pending):
+                if self._is_exited(pid):
+                    pending.discard(pid)
+            time.sleep(0.05)
+
+        for pid in pending:
+            logger.warning('pid %d did not exit in time, killing', pid)
+            self._kill(pid, signal.SIGKILL)
+            self._is_exited(pid, block=True)
+
+    def _is_exited(self, pid: int, block: bool = False) -> bool:
+        try:
+            return os.waitpid(pid, 0 if block else os.WNOHANG)[0] == pid
+        except ChildProcessError:
+            return True
+
+    def _kill(self, pid: int, sig: int) -> None:
+        try:
+            os.kill(pid, sig)
+        except ProcessLookupError:
+            pass
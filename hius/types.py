@@ -1,11 +1,15 @@
 from typing import (
     AsyncGenerator,
     Callable,
+    Sequence,
     Union,
+    Tuple,
     Type,
-    Dict
+    Dict,
+    Any
 )
 from starlette.types import ASGIApp
 
 ExceptionHandlers = Dict[Union[int, Type[Exception]], Callable]
 LifespanGenerator = Callable[[ASGIApp], AsyncGenerator]
+Middleware = Sequence[Tuple[Callable[..., ASGIApp], Dict[str, Any]]]
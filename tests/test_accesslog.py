@@ -0,0 +1,74 @@
+import io
+from starlette.testclient import TestClient
+from hius import Hius
+from hius.accesslog import AccessLog, AccessLogMiddleware, format_record
+from hius.metrics import MetricsStore
+from hius.responses import PlainTextResponse
+from hius.routing import route
+
+RECORD = (0.0, ('10.0.0.1', 5000), 'GET', '/', 'index', 200, 5, 0.0015)
+
+
+def test_format():
+    line = format_record(RECORD)
+    assert line.startswith('10.0.0.1 [')
+    assert line.endswith('"GET /" 200 5 1.500ms index')
+    assert format_record((0.0, None, 'GET', '/x', None, 404, 0, 0.0)
+                         ).startswith('- [')
+
+
+def test_ring():
+    stream = io.StringIO()
+    log = AccessLog(stream, capacity=3, batch=2)
+    assert log.capacity == 4
+    assert log.batch == 2
+
+    for _ in range(6):
+        log.push(RECORD)
+    assert len(log) == 4
+    assert log.dropped == 2
+    assert log._wakeup.is_set()
+
+    assert log.flush() == 4
+    assert log.flush() == 0
+    assert log.push(RECORD)
+    assert log.flush() == 1
+
+    assert log.written == 5
+    assert stream.getvalue().count('\n') == 5
+    assert log._ring == [None] * 4
+
+
+def test_dropped_metric():
+    store = MetricsStore(workers=1)
+    log = AccessLog(io.StringIO(), capacity=2, store=store, name='dropped')
+    for _ in range(5):
+        log.push(RECORD)
+    log.flush()
+    log.flush()
+
+    assert store.get('dropped').sum == 3
+    store.close()
+
+
+def test_middleware():
+    stream = io.StringIO()
+    log = AccessLog(stream, interval=0.01)
+
+    async def index(request):
+        return PlainTextResponse('hello')
+
+    app = Hius(routes=[route('/', index)], on_lifespan=[log.lifespan])
+    app.add_middleware(AccessLogMiddleware, log=log)
+
+    with TestClient(app) as client:
+        client.get('/')
+        client.get('/missing')
+        assert log._thread.is_alive()
+    assert log._thread is None
+
+    first, second = stream.getvalue().splitlines()
+    assert '"GET /" 200 5 ' in first
+    assert first.endswith(' index')
+    assert '"GET /missing" 404 ' in second
+    assert second.endswith(' -')
@@ -0,0 +1,236 @@
+import json
+import time
+import asyncio
+import logging
+import threading
+from starlette.testclient import TestClient
+from hius import Hius
+from hius.admin import (
+    AllocationTracer,
+    LoopMonitor,
+    Sampler,
+    create_admin
+)
+from hius.admin.profiler import ProfilerEndpoint, get_route_codes
+from hius.admin.slowlog import (
+    SlowRequestMiddleware,
+    get_request_stack,
+    stop_queue_logger
+)
+from hius.metrics import MetricsStore
+from hius.responses import PlainTextResponse
+from hius.routing import route
+
+
+def busy(request):
+    start = time.perf_counter()
+    while time.perf_counter() - start < 0.3:
+        pass
+    return PlainTextResponse('done')
+
+
+class Items:
+    async def get(self, request):
+        return PlainTextResponse('items')
+
+
+def create_app():
+    app = Hius(routes=[route('/busy', busy), route('/items', Items)])
+    app.mount('/admin', create_admin(max_seconds=1))
+    return app
+
+
+def test_route_codes():
+    codes = get_route_codes(create_app().router)
+    assert codes[busy.__code__] == 'busy'
+    assert codes[Items.get.__code__] == 'Items'
+
+
+def test_sampler():
+    thread = threading.Thread(target=busy, args=(None,), name='worker')
+    sampler = Sampler(interval=0.001, routes={busy.__code__: 'busy'})
+
+    thread.start()
+    sampler.run(0.1)
+    thread.join()
+
+    roots = {root for root, _ in sampler.samples}
+    assert 'route:busy' in roots
+    assert sampler.duration >= 0.1
+
+    lines = sampler.collapsed().splitlines()
+    assert any(line.startswith('route:busy;') for line in lines)
+    assert all(line.rsplit(' ', 1)[1].isdigit() for line in lines)
+
+
+def test_speedscope():
+    sampler = Sampler(interval=0.01)
+    sampler.sample()
+
+    profile = sampler.speedscope()
+    frames = profile['shared']['frames']
+    sampled = profile['profiles'][0]
+
+    assert sampled['type'] == 'sampled'
+    assert len(sampled['samples']) == len(sampled['weights'])
+    assert frames[sampled['samples'][0][0]] == {'name': 'MainThread'}
+    assert all(index < len(frames)
+               for sample in sampled['samples'] for index in sample)
+
+
+def test_endpoint():
+    client = TestClient(create_app())
+
+    response = client.get('/admin/profile?seconds=0.05')
+    assert response.status_code == 200
+    assert 'MainThread;' in response.text
+
+    response = client.get('/admin/profile',
+                          params={'seconds': 0.05, 'output': 'speedscope'})
+    assert response.json()['profiles'][0]['type'] == 'sampled'
+
+    assert client.get('/admin/profile?seconds=2').status_code == 400
+    assert client.get('/admin/profile?output=svg').status_code == 400
+
+
+def test_endpoint_busy():
+    endpoint = ProfilerEndpoint()
+    app = Hius(routes=[route('/profile', endpoint)])
+    endpoint._lock.acquire()
+
+    response = TestClient(app).get('/profile?seconds=0.05')
+    assert response.status_code == 409
+
+
+def test_loop_monitor(caplog):
+    store = MetricsStore(workers=1)
+    monitor = LoopMonitor(interval=0.01, threshold=0.05, store=store)
+
+    async def blocking(request):
+        time.sleep(0.2)
+        return PlainTextResponse('blocked')
+
+    async def fine(request):
+        return PlainTextResponse('fine')
+
+    app = Hius(routes=[route('/blocking', blocking), route('/fine', fine)],
+               on_lifespan=[monitor.lifespan])
+    app.mount('/admin', create_admin(loop_monitor=monitor))
+
+    with TestClient(app) as client:
+        client.get('/fine')
+        client.get('/blocking')
+        time.sleep(0.05)
+        blocks = client.get('/admin/loop').json()['blocks']
+
+    blocked = [block for block in blocks if block['route'] == 'blocking']
+    assert len(blocked) == 1
+    assert blocked[0]['duration'] >= 0.1
+    assert any('time.sleep(0.2)' in line for line in blocked[0]['stack'])
+
+    names = store.names()
+    assert 'hius_event_loop_blocked_total{route="blocking"}' in names
+    assert store.get('hius_event_loop_lag_seconds').count > 0
+    assert 'event loop was blocked' in caplog.text
+    store.close()
+
+
+def test_tracemalloc():
+    leaked = []
+
+    def leak(request):
+        leaked.append(bytearray(256 * 1024))
+        return PlainTextResponse('leaked')
+
+    tracer = AllocationTracer(keep=2)
+    app = Hius(routes=[route('/leak', leak)])
+    app.mount('/admin', create_admin(tracer=tracer))
+    client = TestClient(app)
+
+    assert client.put('/admin/tracemalloc/snapshots/a').status_code == 409
+    assert client.post('/admin/tracemalloc?nframe=30').json()['tracing']
+    try:
+        client.put('/admin/tracemalloc/snapshots/before')
+        for _ in range(4):
+            client.get('/leak')
+        status = client.put('/admin/tracemalloc/snapshots/after').json()
+        assert [item['name'] for item in status['snapshots']] == [
+            'before', 'after'
+        ]
+
+        lines = client.get('/admin/tracemalloc/diff',
+                           params={'base': 'before', 'target': 'after',
+                                   'limit': 1}).json()
+        assert lines[0]['file'] == __file__
+        assert lines[0]['size_diff'] >= 1024 * 1024
+
+        routes = client.get('/admin/tracemalloc/diff',
+                            params={'base': 'before',
+                                    'group_by': 'route'}).json()
+        assert routes[0]['route'] == 'leak'
+        assert routes[0]['size_diff'] >= 1024 * 1024
+
+        response = client.get('/admin/tracemalloc/diff?base=missing')
+        assert response.status_code == 404
+        assert client.delete(
+            '/admin/tracemalloc/snapshots/before').status_code == 200
+        assert client.delete(
+            '/admin/tracemalloc/snapshots/before').status_code == 404
+    finally:
+        status = client.delete('/admin/tracemalloc').json()
+    assert not status['tracing']
+    assert status['snapshots'] == []
+
+
+class Collector(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.records = []
+
+    def emit(self, record):
+        self.records.append(record)
+
+
+def test_slow_request_log():
+    collector = Collector()
+
+    async def slow(request, item_id: int, full: bool = False):
+        await asyncio.sleep(0.1)
+        return PlainTextResponse('slow')
+
+    def fast(request):
+        return PlainTextResponse('fast')
+
+    app = Hius(routes=[route('/items/{item_id}', slow), route('/', fast)])
+    app.add_middleware(SlowRequestMiddleware, threshold=0.05,
+                       name='hius.test.slow', handlers=[collector])
+    client = TestClient(app)
+    try:
+        client.get('/')
+        client.get('/items/7?full=true')
+    finally:
+        stop_queue_logger('hius.test.slow')
+
+    record, = collector.records
+    data = record.request
+    assert data['route'] == 'slow'
+    assert data['status'] == 200
+    assert data['duration'] >= 0.1
+    assert data['params'] == {'item_id': 7, 'full': True}
+    assert list(data['stages']) == ['routing', 'validation', 'handler',
+                                    'response']
+    assert 'await asyncio.sleep(0.1)' in data['stack'][-2]
+    assert json.loads(record.getMessage()[len('slow request '):]) == data
+
+
+def test_request_stack_without_get_coro():
+    async def pending():
+        pass  # pragma: no cover
+
+    class LegacyTask:
+        _coro = pending()
+
+    lines = get_request_stack({}, LegacyTask())
+    LegacyTask._coro.close()
+    assert len(lines) == 1
+    assert 'pending' in lines[0]
@@ -335,3 +335,93 @@ def test_multipart_form():
 
     with ThreadPoolExecutor() as pool:
         assert sorted(pool.map(partial(send, cli), data)) == data
+
+
+def test_app_report(caplog):
+    events = []
+
+    async def slow(app):
+        await asyncio.sleep(0.01)
+
+    def failing(app):
+        raise RuntimeError('boom')
+
+    app = Hius(on_startup=[slow], on_shutdown=[failing], log_report=True)
+
+    @app.on_lifespan(name='pool')
+    async def pool(app):
+        events.append('open')
+        yield
+        events.append('close')
+
+    assert [t.name for t in app.report.get('init')] == ['openapi',
+                                                        'middleware']
+
+    with caplog.at_level('INFO', logger='hius.lifespan'):
+        with TestClient(app):
+            pass
+
+    stages = [(t.stage, t.name, t.ok) for t in app.report]
+    assert stages[2:] == [
+        ('startup', 'slow', True),
+        ('lifespan.startup', 'pool', True),
+        ('lifespan.shutdown', 'pool', True),
+        ('shutdown', 'failing', False)
+    ]
+    assert app.report.slowest(1, 'startup')[0].duration >= 0.01
+    assert app.report.get('shutdown')[0].error == 'RuntimeError: boom'
+    assert app.report.as_dict()[-1]['ok'] is False
+    assert 'startup slow' in caplog.text
+    assert 'shutdown failing' in caplog.text
+
+
+def test_app_warmup(tmpdir):
+    calls = []
+    with open(os.path.join(tmpdir, 'app.css'), 'w') as file:
+        file.write('body {}')
+
+    async def user(request, user_id: int, full: bool = False):
+        calls.append((request.method, user_id, full))
+        return PlainTextResponse('user')
+
+    static = StaticFiles(directory=tmpdir, manifest=True)
+    app = Hius(warmup=['/users/1?full=true', ('HEAD', '/users/2')])
+    app.add_route('/users/{user_id}', user, methods=['GET', 'HEAD'])
+    app.mount('/static', static)
+
+    assert app.openapi.schema is None
+    assert static.manifest is None
+
+    with TestClient(app):
+        assert calls == [('GET', 1, True), ('HEAD', 2, False)]
+        assert app.openapi.schema is not None
+        assert static.manifest is not None
+
+    assert [(t.name, t.ok) for t in app.report.get('warmup')] == [
+        ('mounts', True),
+        ('openapi', True),
+        ('GET /users/1?full=true', True),
+        ('HEAD /users/2', True)
+    ]
+
+
+def test_app_warmup_fail():
+    async def broken(request):
+        raise RuntimeError
+
+    app = Hius(routes=[route('/', broken)], warmup=['/'],
+               openapi_config=None)
+
+    messages = []
+
+    async def receive():
+        return {'type': 'lifespan.startup'}
+
+    async def send(message):
+        messages.append(message['type'])
+
+    asyncio.run(app({'type': 'lifespan'}, receive, send))
+
+    assert messages == ['lifespan.startup.failed']
+    timing, = app.report.get('warmup')[1:]
+    assert timing.error.startswith('RuntimeError')
@@ -0,0 +1,203 @@
+import os
+import time
+import pytest
+from starlette.testclient import TestClient
+from hius import Hius
+from hius.cache import SharedCache, CacheMiddleware
+from hius.responses import PlainTextResponse, StreamingResponse
+
+
+@pytest.fixture
+def cache():
+    cache = SharedCache(capacity=8, item_size=1024, ways=2)
+    yield cache
+    cache.close()
+
+
+def test_get_set(cache):
+    assert cache.get(b'key') is None
+    assert cache.set(b'key', b'value', 60)
+    assert cache.get(b'key') == b'value'
+
+    assert cache.set(b'key', b'other', 60)
+    assert cache.get(b'key') == b'other'
+    assert len(cache) == 1
+
+
+def test_too_large(cache):
+    assert not cache.set(b'key', b'x' * 1024, 60)
+    assert cache.get(b'key') is None
+
+
+def test_expire(cache):
+    cache.set(b'key', b'value', -1)
+    assert cache.get(b'key') is None
+    assert len(cache) == 0
+
+
+def test_delete_clear(cache):
+    cache.set(b'first', b'1', 60)
+    cache.set(b'second', b'2', 60)
+
+    assert cache.delete(b'first')
+    assert not cache.delete(b'first')
+    assert cache.get(b'first') is None
+    assert cache.get(b'second') == b'2'
+
+    cache.clear()
+    assert len(cache) == 0
+
+
+def test_eviction():
+    cache = SharedCache(capacity=2, item_size=64, ways=2)
+    cache.set(b'first', b'1', 60)
+    time.sleep(0.001)
+    cache.set(b'second', b'2', 60)
+    time.sleep(0.001)
+    cache.get(b'first')
+
+    cache.set(b'third', b'3', 60)
+
+    assert cache.get(b'first') == b'1'
+    assert cache.get(b'second') is None
+    assert cache.get(b'third') == b'3'
+    cache.close()
+
+
+def test_shared_between_processes(cache):
+    pid = os.fork()
+    if not pid:
+        cache.set(b'key', b'from child', 60)
+        os._exit(0)
+    os.waitpid(pid, 0)
+
+    assert cache.get(b'key') == b'from child'
+
+
+def test_file_backed(tmpdir):
+    path = os.path.join(tmpdir, 'cache')
+    first = SharedCache(capacity=4, item_size=64, path=path)
+    first.set(b'key', b'value', 60)
+
+    second = SharedCache(capacity=4, item_size=64, path=path)
+    assert second.get(b'key') == b'value'
+
+    third = SharedCache(capacity=8, item_size=64, path=path)
+    assert third.get(b'key') is None
+
+    for cache in (first, second, third):
+        cache.close()
+
+
+# ---
+
+
+def make_app(cache, calls):
+    app = Hius()
+    middleware = [(CacheMiddleware, {'backend': cache, 'ttl': 60})]
+
+    @app.route('/cached', middleware=middleware)
+    async def cached(request, q: str = ''):
+        calls.append(q)
+        return PlainTextResponse(f'cached {q}', headers={'x-calls': '1'})
+
+    @app.route('/private', middleware=middleware)
+    async def private(request):
+        calls.append('private')
+        return PlainTextResponse('private',
+                                 headers={'cache-control': 'private'})
+
+    @app.route('/stream', middleware=middleware)
+    async def stream(request):
+        calls.append('stream')
+
+        async def body():
+            for _ in range(4):
+                yield b'x' * 512
+        return StreamingResponse(body())
+
+    @app.route('/user', middleware=middleware)
+    async def user(request):
+        calls.append('user')
+        return PlainTextResponse(request.cookies.get('user', ''),
+                                 headers={'vary': 'Cookie'})
+
+    @app.route('/encoded', middleware=middleware)
+    async def encoded(request):
+        calls.append('encoded')
+        return PlainTextResponse('encoded',
+                                 headers={'vary': 'Accept-Encoding'})
+
+    @app.route('/any', middleware=middleware)
+    async def any_header(request):
+        calls.append('any')
+        return PlainTextResponse('any', headers={'vary': '*'})
+
+    @app.route('/missing', middleware=middleware)
+    async def missing(request):
+        calls.append('missing')
+        return PlainTextResponse('missing', status_code=404)
+
+    return app
+
+
+def test_middleware(cache):
+    calls = []
+    client = TestClient(make_app(cache, calls))
+
+    for _ in range(3):
+        response = client.get('/cached?q=a')
+        assert response.text == 'cached a'
+        assert response.headers['x-calls'] == '1'
+    assert client.head('/cached?q=a').text == ''
+    assert client.get('/cached?q=b').text == 'cached b'
+
+    assert calls == ['a', 'b']
+
+
+def test_middleware_head_not_stored(cache):
+    calls = []
+    client = TestClient(make_app(cache, calls))
+
+    client.head('/cached')
+    client.get('/cached')
+    assert calls == ['', '']
+
+
+@pytest.mark.parametrize('path', ['/private', '/stream', '/missing',
+                                  '/user', '/any'])
+def test_middleware_not_cacheable(cache, path):
+    calls = []
+    client = TestClient(make_app(cache, calls))
+
+    client.get(path)
+    client.get(path)
+    assert len(calls) == 2
+
+
+def test_middleware_bypass(cache):
+    calls = []
+    client = TestClient(make_app(cache, calls))
+
+    client.get('/cached', headers={'authorization': 'token'})
+    client.get('/cached', headers={'authorization': 'token'})
+    client.get('/cached', headers={'accept-encoding': 'br'})
+    client.get('/cached', headers={'accept-encoding': 'gzip'})
+    client.get('/cached', headers={'cookie': 'user=alice'})
+    client.get('/cached', headers={'cookie': 'user=alice'})
+    assert len(calls) == 6
+
+
+def test_middleware_vary(cache):
+    calls = []
+    client = TestClient(make_app(cache, calls))
+
+    alice = client.get('/user', headers={'cookie': 'user=alice'})
+    assert alice.text == 'alice'
+    client.cookies.clear()
+    bob = client.get('/user', headers={'cookie': 'user=bob'})
+    assert bob.text == 'bob'
+
+    client.get('/encoded')
+    assert client.get('/encoded').text == 'encoded'
+    assert calls == ['user', 'user', 'encoded']
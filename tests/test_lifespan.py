@@ -1,8 +1,14 @@
+import gc
+import time
+import anyio
 import pytest
 from starlette.responses import PlainTextResponse
 from starlette.testclient import TestClient as BaseTestClient
 from hius.routing import Router as BaseRouter, route
 from hius.routing.lifespan import Lifespan
+from hius.routing.hooks import hook
+from hius.routing.drain import RequestTracker
+from hius import Hius
 
 
 class TestClient(BaseTestClient):
@@ -146,3 +152,308 @@ def test_raise_on(state, params):
         pass
 
     assert flag
+
+
+# ---
+
+
+def run_lifespan(lifespan):
+    messages = []
+    router = Router(lifespan)
+
+    async def app(scope, receive, send):
+        async def _send(message):
+            messages.append(message['type'])
+            return await send(message)
+        await router(scope, receive, _send)
+
+    with TestClient(app):
+        pass
+
+    return messages
+
+
+def make_hook(events, name, depends=(), delay=0, timeout=None):
+    async def func(app):
+        events.append(f'start:{name}')
+        await anyio.sleep(delay)
+        events.append(f'end:{name}')
+    return hook(func, name=name, depends=depends, timeout=timeout)
+
+
+def make_lifespan_hook(events, name, depends=()):
+    async def func(app):
+        events.append(f'start:{name}')
+        yield
+        events.append(f'stop:{name}')
+    return hook(func, name=name, depends=depends)
+
+
+@pytest.mark.parametrize('concurrent', [False, True])
+def test_hooks_dependency_order(concurrent):
+    events = []
+    lifespan = Lifespan(on_startup=[
+        make_hook(events, 'c', depends=['a', 'b']),
+        make_hook(events, 'a', delay=0.01),
+        make_hook(events, 'b'),
+    ], concurrent=concurrent)
+
+    messages = run_lifespan(lifespan)
+
+    assert messages[0] == 'lifespan.startup.complete'
+    assert events.index('end:a') < events.index('start:c')
+    assert events.index('end:b') < events.index('start:c')
+
+
+def test_hooks_concurrent():
+    events = []
+    lifespan = Lifespan(on_startup=[
+        make_hook(events, 'a', delay=0.05),
+        make_hook(events, 'b', delay=0.05),
+    ], concurrent=True)
+
+    run_lifespan(lifespan)
+
+    assert events == ['start:a', 'start:b', 'end:a', 'end:b']
+
+
+def test_hooks_sequential():
+    events = []
+    lifespan = Lifespan(on_startup=[
+        make_hook(events, 'a', delay=0.01),
+        make_hook(events, 'b'),
+    ])
+
+    run_lifespan(lifespan)
+
+    assert events == ['start:a', 'end:a', 'start:b', 'end:b']
+
+
+@pytest.mark.parametrize('concurrent', [False, True])
+def test_lifespan_hooks_teardown_order(concurrent):
+    events = []
+    lifespan = Lifespan(on_lifespan=[
+        make_lifespan_hook(events, 'cache', depends=['db']),
+        make_lifespan_hook(events, 'db'),
+    ], concurrent=concurrent)
+
+    run_lifespan(lifespan)
+
+    assert events == ['start:db', 'start:cache', 'stop:cache', 'stop:db']
+
+
+def test_shutdown_hook_depends_on_startup():
+    events = []
+    lifespan = Lifespan(on_startup=[make_hook(events, 'a')],
+                        on_shutdown=[make_hook(events, 'b', depends=['a'])])
+
+    assert run_lifespan(lifespan) == ['lifespan.startup.complete',
+                                      'lifespan.shutdown.complete']
+
+
+_params_hooks_fail = [
+    [make_hook([], 'a', delay=1, timeout=0.01)],
+    [make_hook([], 'a', depends=['unknown'])],
+    [make_hook([], 'a', depends=['b']), make_hook([], 'b', depends=['a'])],
+    [make_hook([], 'a'), make_hook([], 'a'),
+     make_hook([], 'b', depends=['a'])],
+]
+_ids_hooks_fail = ['timeout', 'unknown', 'circular', 'ambiguous']
+
+
+@pytest.mark.parametrize('concurrent', [False, True])
+@pytest.mark.parametrize('hooks', _params_hooks_fail, ids=_ids_hooks_fail)
+def test_hooks_fail(hooks, concurrent):
+    lifespan = Lifespan(on_startup=hooks, concurrent=concurrent)
+    assert run_lifespan(lifespan) == ['lifespan.startup.failed']
+
+
+def test_hooks_fail_cancels_pending():
+    events = []
+    lifespan = Lifespan(on_startup=[
+        make_hook(events, 'slow', delay=1),
+        make_hook(events, 'fast', timeout=0.01, delay=1),
+    ], concurrent=True)
+
+    assert run_lifespan(lifespan) == ['lifespan.startup.failed']
+    assert events == ['start:slow', 'start:fast']
+
+
+def test_sync_hook_timeout():
+    def slow(app):
+        time.sleep(1)
+
+    def slow_gen(app):
+        time.sleep(1)
+        yield
+
+    for kwargs in ({'on_startup': [hook(slow, timeout=0.1)]},
+                   {'on_lifespan': [hook(slow_gen, timeout=0.1)]}):
+        start = time.perf_counter()
+        assert run_lifespan(Lifespan(**kwargs)) == ['lifespan.startup.failed']
+        assert time.perf_counter() - start < 0.5
+
+
+def test_sync_lifespan_hook():
+    events = []
+
+    def context(app):
+        events.append('start')
+        yield
+        events.append('stop')
+
+    assert run_lifespan(Lifespan(on_lifespan=[context])) == [
+        'lifespan.startup.complete', 'lifespan.shutdown.complete'
+    ]
+    assert events == ['start', 'stop']
+
+
+# ---
+
+
+def http_scope(path):
+    return {
+        'type': 'http',
+        'http_version': '1.1',
+        'method': 'GET',
+        'scheme': 'http',
+        'path': path,
+        'root_path': '',
+        'query_string': b'',
+        'headers': [],
+        'server': ('testserver', 80)
+    }
+
+
+async def http_request(app, path):
+    messages = []
+
+    async def receive():
+        return {'type': 'http.request', 'body': b'', 'more_body': False}
+
+    async def send(message):
+        messages.append(message)
+
+    await app(http_scope(path), receive, send)
+    return messages[0]['status']
+
+
+async def run_drain(app, events, path='/slow'):
+    to_app, app_receive = anyio.create_memory_object_stream(10)
+    app_send, from_app = anyio.create_memory_object_stream(10)
+    statuses = []
+
+    async def request(path):
+        statuses.append(await http_request(app, path))
+
+    async with anyio.create_task_group() as task_group:
+        task_group.start_soon(app, {'type': 'lifespan'},
+                              app_receive.receive, app_send.send)
+
+        await to_app.send({'type': 'lifespan.startup'})
+        await from_app.receive()
+
+        task_group.start_soon(request, path)
+        await anyio.sleep(0.01)
+
+        await to_app.send({'type': 'lifespan.shutdown'})
+        await anyio.sleep(0.01)
+        statuses.append(await http_request(app, '/fast'))
+
+        events.append((await from_app.receive())['type'])
+
+    return statuses
+
+
+def make_drain_app(events, **kwargs):
+    async def slow(request):
+        await anyio.sleep(0.1)
+        events.append('request')
+        return PlainTextResponse('slow')
+
+    def shutdown(app):
+        events.append('shutdown')
+
+    routes = [route('/slow', slow), route('/fast', hello_world)]
+    return Hius(routes=routes, on_shutdown=[shutdown], **kwargs)
+
+
+def test_drain():
+    events = []
+    app = make_drain_app(events, drain_timeout=1)
+
+    statuses = anyio.run(run_drain, app, events)
+
+    assert statuses == [200, 200]
+    assert events == ['request', 'shutdown', 'lifespan.shutdown.complete']
+    assert app.report.get('drain')[0].ok
+
+
+def test_drain_reject():
+    events = []
+    app = make_drain_app(events, drain_timeout=1, reject_on_drain=True)
+
+    statuses = anyio.run(run_drain, app, events)
+
+    assert statuses == [503, 200]
+    assert events == ['request', 'shutdown', 'lifespan.shutdown.complete']
+
+
+def test_drain_timeout():
+    events = []
+    app = make_drain_app(events, drain_timeout=0.01)
+
+    anyio.run(run_drain, app, events)
+
+    assert events == ['shutdown', 'lifespan.shutdown.complete', 'request']
+    assert app.report.get('drain')[0].error == '1 requests still in flight'
+
+
+def test_no_drain():
+    events = []
+    app = make_drain_app(events)
+
+    anyio.run(run_drain, app, events)
+
+    assert app.tracker is None
+    assert events[0] == 'shutdown'
+
+
+def test_drain_reject_websocket():
+    tracker = RequestTracker(reject=True)
+    tracker.draining = True
+    messages = []
+
+    async def send(message):
+        messages.append(message)
+
+    anyio.run(tracker, None, {'type': 'websocket'}, None, send)
+
+    assert messages[0]['type'] == 'websocket.close'
+    assert messages[0]['code'] == 1012
+
+
+# ---
+
+
+def test_gc_freeze():
+    thresholds = gc.get_threshold()
+    lifespan = Lifespan(on_startup=[sync_func], gc_freeze=True,
+                        gc_thresholds=(50000, 20, 20))
+    try:
+        run_lifespan(lifespan)
+
+        assert gc.get_freeze_count() > 0
+        assert gc.get_threshold() == (50000, 20, 20)
+
+        timing, = lifespan.report.get('gc')
+        assert timing.details['frozen'] == timing.as_dict()['frozen'] > 0
+    finally:
+        gc.unfreeze()
+        gc.set_threshold(*thresholds)
+
+
+def test_gc_no_freeze():
+    lifespan = Lifespan(on_startup=[sync_func])
+    run_lifespan(lifespan)
+    assert not lifespan.report.get('gc')
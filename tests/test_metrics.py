@@ -0,0 +1,253 @@
+import os
+import time
+import sys
+import subprocess
+import pytest
+from starlette.testclient import TestClient
+from hius import Hius
+from hius.routing import route
+from hius.metrics import (
+    MetricsStore,
+    MetricsEndpoint,
+    RequestMetrics,
+    PrometheusEndpoint
+)
+from hius.responses import PlainTextResponse
+
+
+@pytest.fixture
+def store():
+    store = MetricsStore(workers=4, capacity=8, buckets=(0.1, 1.0))
+    yield store
+    store.close()
+
+
+def run_in_child(func):
+    pid = os.fork()
+    if not pid:
+        code = 0
+        try:
+            func()
+        except BaseException:
+            code = 1
+        finally:
+            os._exit(code)
+    _, status = os.waitpid(pid, 0)
+    assert os.WEXITSTATUS(status) == 0
+
+
+def test_observe(store):
+    store.observe('request', 0.05)
+    store.observe('request', 0.5)
+    store.observe('request', 5)
+
+    sample = store.get('request')
+    assert sample.kind == 'histogram'
+    assert sample.count == 3
+    assert sample.sum == pytest.approx(5.55)
+    assert sample.buckets == [1, 1, 1]
+    assert store.cumulative(sample) == [(0.1, 1), (1.0, 2),
+                                        (float('inf'), 3)]
+
+
+def test_inc(store):
+    store.inc('errors')
+    store.inc('errors', 2)
+
+    sample = store.get('errors')
+    assert sample.kind == 'counter'
+    assert sample.count == 2
+    assert sample.sum == 3
+    assert store.names() == ['errors']
+
+
+def test_aggregate_workers(store):
+    store.observe('request', 0.05)
+
+    for _ in range(3):
+        run_in_child(lambda: store.observe('request', 0.5))
+    run_in_child(lambda: store.inc('other'))
+
+    sample = store.get('request')
+    assert sample.count == 4
+    assert sample.buckets == [1, 3, 0]
+    assert store.names() == ['request', 'other']
+
+
+def test_slots_reused(store):
+    def observe_many():
+        for _ in range(store.workers):
+            run_in_child(lambda: store.inc('child'))
+
+    run_in_child(observe_many)
+    assert store.get('child').count == store.workers
+
+
+def test_slots_exhausted():
+    store = MetricsStore(workers=1, capacity=1)
+    store.inc('parent')
+
+    def child():
+        store.inc('parent')
+        store.inc('parent')
+        assert store.dropped == 2
+
+    run_in_child(child)
+    assert store.get('parent').count == 1
+    assert store.dropped == 0
+    store.close()
+
+
+def test_capacity(store):
+    for index in range(store.capacity):
+        store.inc(f'name_{index}')
+
+    store.inc('overflow')
+    store.observe('x' * 128, 0.5)
+    store.inc('overflow')
+    assert store.dropped == 3
+    assert 'overflow' not in store.names()
+
+    with pytest.raises(RuntimeError):
+        store.register('overflow')
+    with pytest.raises(ValueError):
+        store.register('x' * 128)
+
+
+def test_file_backed(tmpdir):
+    path = os.path.join(tmpdir, 'metrics')
+
+    first = MetricsStore(workers=2, capacity=4, path=path)
+    first.inc('shared', 2)
+
+    second = MetricsStore(workers=2, capacity=4, path=path)
+    assert second.get('shared').sum == 2
+
+    third = MetricsStore(workers=3, capacity=4, path=path)
+    assert third.names() == []
+
+    for store in (first, second, third):
+        store.close()
+
+
+def test_endpoint(store):
+    store.observe('request', 0.05)
+    app = Hius(routes=[route('/metrics', MetricsEndpoint(store))])
+
+    response = TestClient(app).get('/metrics')
+    assert response.json() == {
+        'request': {
+            'count': 1,
+            'sum': 0.05,
+            'buckets': {'0.1': 1, '1.0': 1, 'inf': 1}
+        }
+    }
+
+
+def test_request_metrics(store):
+    async def user(request, user_id: int):
+        return PlainTextResponse(str(user_id))
+
+    async def created(request):
+        return PlainTextResponse('', status_code=201)
+
+    async def failed(request):
+        raise RuntimeError
+
+    app = Hius(routes=[route('/users/{user_id}', user, name='user'),
+                       route('/created', created, methods=['POST']),
+                       route('/failed', failed)],
+               metrics=RequestMetrics(store, name='http'))
+
+    with TestClient(app, raise_server_exceptions=False) as client:
+        client.get('/users/1')
+        client.get('/users/2')
+        client.get('/users/x')
+        client.get('/missing')
+        client.get('/created')
+        client.post('/created')
+        client.get('/failed')
+
+    family = 'http{route="%s",status="%s"}'
+    assert store.get(family % ('user', '2xx')).count == 2
+    assert store.get(family % ('user', '4xx')).count == 1
+    assert store.get(family % ('<unmatched>', '4xx')).count == 2
+    assert store.get(family % ('created', '2xx')).count == 1
+    assert store.get(family % ('failed', '5xx')).count == 1
+
+
+def test_request_metrics_interval(store):
+    async def user(request):
+        return PlainTextResponse('user')
+
+    metrics = RequestMetrics(store, name='http', interval=0.05)
+    app = Hius(routes=[route('/user', user)], metrics=metrics)
+    name = 'http{route="user",status="2xx"}'
+
+    with TestClient(app) as client:
+        client.get('/user')
+        client.get('/user')
+        assert store.get(name) is None
+        time.sleep(0.2)
+        client.get('/missing')
+        assert store.get(name).count == 2
+
+
+def test_observe_many(store):
+    values = [0.05, 0.1, 0.1, 0.5, 2.0, 0.01]
+    store.observe_many('batch', values)
+    for value in values:
+        store.observe('single', value)
+
+    batch, single = store.get('batch'), store.get('single')
+    assert batch.buckets == single.buckets == [4, 1, 1]
+    assert batch.sum == pytest.approx(single.sum)
+
+
+def test_request_metrics_store_full():
+    store = MetricsStore(workers=1, capacity=1)
+
+    async def user(request):
+        return PlainTextResponse('user')
+
+    app = Hius(routes=[route('/user', user),
+                       route('/long', user, name='long' * 30)],
+               metrics=RequestMetrics(store))
+    with TestClient(app) as client:
+        assert client.get('/user').status_code == 200
+        assert client.get('/missing').status_code == 404
+        assert client.get('/long').status_code == 200
+
+    assert store.dropped == 2
+    assert len(store.names()) == 1
+    store.close()
+
+
+def test_prometheus_endpoint(store):
+    store.observe('latency{route="a"}', 0.05)
+    store.observe('latency{route="a"}', 0.5)
+    store.inc('jobs_total', 3)
+    app = Hius(routes=[route('/metrics', PrometheusEndpoint(store))])
+
+    response = TestClient(app).get('/metrics')
+    assert response.headers['content-type'].startswith(
+        'text/plain; version=0.0.4')
+    assert response.text == '\n'.join([
+        '# TYPE jobs_total counter',
+        'jobs_total 3.0',
+        '# TYPE latency histogram',
+        'latency_bucket{route="a",le="0.1"} 1',
+        'latency_bucket{route="a",le="1.0"} 2',
+        'latency_bucket{route="a",le="+Inf"} 2',
+        'latency_sum{route="a"} 0.55',
+        'latency_count{route="a"} 2',
+        ''
+    ])
+
+
+def test_not_imported_by_default():
+    code = 'import sys, hius; print("hius.metrics" in sys.modules)'
+    output = subprocess.check_output([sys.executable, '-c', code],
+                                     cwd=os.path.dirname(os.path.dirname(
+                                         os.path.abspath(__file__))))
+    assert output.strip() == b'False'
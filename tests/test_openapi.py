@@ -0,0 +1,207 @@
+import os
+import re
+import sys
+import subprocess
+from starlette.testclient import TestClient
+from hius import Hius
+from hius.openapi import OpenAPIConfig, endpoints
+from hius.openapi.template import REDOC_CDN_URL
+from hius.routing import Router
+from hius.handlers import StaticFiles
+from hius.responses import PlainTextResponse
+
+
+def make_app(**kwargs):
+    app = Hius(**kwargs)
+
+    @app.route('/users/{user_id:int}', name='get_user')
+    async def user(request, user_id: int):
+        return PlainTextResponse(str(user_id))
+
+    return app
+
+
+def test_schema():
+    cli = TestClient(make_app())
+
+    response = cli.get('/openapi.json')
+    assert response.status_code == 200
+
+    schema = response.json()
+    assert schema['info']['title'] == 'Hius API'
+    assert list(schema['paths']) == ['/users/{user_id}']
+    assert set(schema['paths']['/users/{user_id}']) == {'get', 'head'}
+
+
+def test_doc():
+    cli = TestClient(make_app())
+
+    response = cli.get('/docs')
+    assert response.status_code == 200
+    assert response.headers['content-type'] == 'text/html; charset=utf-8'
+    assert 'Hius API' in response.text
+
+
+def test_custom_urls():
+    config = OpenAPIConfig(doc_url='/api/docs', schema_url='/api/schema')
+    cli = TestClient(make_app(openapi_config=config))
+
+    assert cli.get('/api/docs').status_code == 200
+    assert cli.get('/api/schema').status_code == 200
+    assert cli.get('/docs').status_code == 404
+
+
+def test_disabled():
+    app = make_app(openapi_config=None)
+    cli = TestClient(app)
+
+    assert cli.get('/docs').status_code == 404
+    assert cli.get('/openapi.json').status_code == 404
+
+
+def test_default_config_not_shared():
+    first, second = Hius(), Hius()
+    assert first.openapi_config is not second.openapi_config
+
+    first.openapi_config.title = 'First'
+    assert second.openapi_config.title != 'First'
+
+
+def test_lazy_import():
+    code = ('import sys, hius; hius.Hius(); '
+            'assert "hius.openapi.models" not in sys.modules; '
+            'assert "pydantic_openapi_schema" not in sys.modules')
+    subprocess.run([sys.executable, '-c', code], check=True)
+
+
+def test_etag():
+    cli = TestClient(make_app())
+
+    response = cli.get('/openapi.json', headers={'accept-encoding': ''})
+    etag = response.headers['etag']
+    assert 'content-encoding' not in response.headers
+
+    response = cli.get('/openapi.json', headers={'if-none-match': etag,
+                                                 'accept-encoding': ''})
+    assert response.status_code == 304
+    assert response.content == b''
+
+
+def test_gzip():
+    cli = TestClient(make_app())
+
+    response = cli.get('/openapi.json', headers={'accept-encoding': 'gzip'})
+    assert response.headers['content-encoding'] == 'gzip'
+    assert response.headers['vary'] == 'Accept-Encoding'
+    assert response.headers['etag'].endswith('-gzip"')
+    assert response.json()['info']['title'] == 'Hius API'
+
+
+def test_gzip_refused():
+    cli = TestClient(make_app())
+
+    for value in ('gzip;q=0', 'br, gzip; q=0.0', 'identity'):
+        response = cli.get('/openapi.json',
+                           headers={'accept-encoding': value})
+        assert 'content-encoding' not in response.headers
+        assert not response.headers['etag'].endswith('-gzip"')
+
+    response = cli.get('/openapi.json',
+                       headers={'accept-encoding': 'br;q=1, gzip;q=0.5'})
+    assert response.headers['content-encoding'] == 'gzip'
+
+
+def test_rebuild_on_new_routes():
+    app = make_app()
+    cli = TestClient(app)
+
+    etag = cli.get('/openapi.json').headers['etag']
+    assert cli.get('/openapi.json').headers['etag'] == etag
+
+    @app.route('/new')
+    async def new(request):
+        pass
+
+    response = cli.get('/openapi.json')
+    assert response.headers['etag'] != etag
+    assert '/new' in response.json()['paths']
+
+
+def test_mounted_routes():
+    api = Router()
+
+    @api.route('/items')
+    async def items(request):
+        pass
+
+    app = make_app()
+    app.mount('/api', api)
+    app.mount('/static', StaticFiles(directory='.'))
+    cli = TestClient(app)
+
+    assert set(cli.get('/openapi.json').json()['paths']) == {
+        '/users/{user_id}',
+        '/api/items'
+    }
+
+
+def test_fragments_reused():
+    app = make_app()
+    openapi = app.router._http['plain']['/docs'][0].endpoint._endpoint.openapi
+    cli = TestClient(app)
+
+    cli.get('/openapi.json')
+    fragments = dict(openapi.fragments)
+
+    @app.route('/new')
+    async def new(request):
+        pass
+
+    cli.get('/openapi.json')
+    assert len(openapi.fragments) == len(fragments) + 1
+    for key, fragment in fragments.items():
+        assert openapi.fragments[key] is fragment
+
+
+def test_redoc_bundled():
+    cli = TestClient(make_app())
+
+    html = cli.get('/docs').text
+    assert REDOC_CDN_URL not in html
+
+    url = re.search(r"src='(/docs/assets/redoc\.standalone\.\w+\.js)'", html)
+    response = cli.get(url.group(1))
+    assert response.status_code == 200
+    assert response.headers['content-type'].startswith(
+        'application/javascript')
+
+
+def test_redoc_cdn_fallback(monkeypatch):
+    monkeypatch.setattr(endpoints, 'REDOC_BUNDLE', '/nonexistent/redoc.js')
+    cli = TestClient(make_app())
+
+    assert REDOC_CDN_URL in cli.get('/docs').text
+    assert cli.get('/docs/assets/redoc.js').status_code == 404
+
+
+def test_redoc_self_hosted(tmpdir):
+    path = os.path.join(tmpdir, 'redoc.js')
+    with open(path, 'w') as file:
+        file.write('var Redoc = {};')
+
+    cli = TestClient(make_app(openapi_config=OpenAPIConfig(redoc_path=path)))
+
+    html = cli.get('/docs').text
+    assert REDOC_CDN_URL not in html
+
+    url = re.search(r"src='(/docs/assets/redoc\.standalone\.\w+\.js)'", html)
+    assert url is not None
+
+    response = cli.get(url.group(1), headers={'accept-encoding': 'gzip'})
+    assert response.status_code == 200
+    assert response.text == 'var Redoc = {};'
+    assert response.headers['content-encoding'] == 'gzip'
+    assert 'immutable' in response.headers['cache-control']
+
+    assert cli.get('/docs/assets/redoc.js').status_code == 404
+    assert cli.post(url.group(1)).status_code == 405
@@ -0,0 +1,171 @@
+import os
+import asyncio
+import pytest
+from starlette.testclient import TestClient
+from hius.responses import FileResponse, parse_range
+
+
+@pytest.fixture
+def path(tmpdir):
+    path = os.path.join(tmpdir, 'file.txt')
+    with open(path, 'w') as file:
+        file.write('<file content>')
+    return path
+
+
+def call(response, method='GET', extensions=None, headers=None):
+    messages = []
+    scope = {'type': 'http', 'method': method, 'headers': headers or []}
+    if extensions is not None:
+        scope['extensions'] = extensions
+
+    async def receive():
+        return {'type': 'http.request'}  # pragma: no cover
+
+    async def send(message):
+        if message['type'] == 'http.response.zerocopysend':
+            message['content'] = message['file'].read()
+        messages.append(message)
+
+    asyncio.run(response(scope, receive, send))
+    return messages
+
+
+def test_pathsend(path):
+    start, body = call(FileResponse(path),
+                       extensions={'http.response.pathsend': {}})
+
+    assert start['type'] == 'http.response.start'
+    assert (b'content-length', b'14') in start['headers']
+    assert body == {'type': 'http.response.pathsend', 'path': path}
+
+
+def test_zerocopysend(path):
+    start, body = call(FileResponse(path),
+                       extensions={'http.response.zerocopysend': {}})
+
+    assert start['type'] == 'http.response.start'
+    assert body['type'] == 'http.response.zerocopysend'
+    assert body['content'] == b'<file content>'
+    assert body['file'].closed
+
+
+def test_chunked_fallback(path):
+    start, body = call(FileResponse(path), extensions={})
+
+    assert start['type'] == 'http.response.start'
+    assert body['body'] == b'<file content>'
+
+
+def test_head_ignores_pathsend(path):
+    _, body = call(FileResponse(path, method='HEAD'),
+                   extensions={'http.response.pathsend': {}})
+
+    assert body == {'type': 'http.response.body',
+                    'body': b'',
+                    'more_body': False}
+
+
+def test_missing_file(tmpdir):
+    response = FileResponse(os.path.join(tmpdir, 'missing.txt'))
+    with pytest.raises(RuntimeError):
+        call(response, extensions={'http.response.pathsend': {}})
+
+    response = FileResponse(tmpdir)
+    with pytest.raises(RuntimeError):
+        call(response, extensions={'http.response.pathsend': {}})
+
+
+# ---
+
+
+_params_parse_range = [
+    ('bytes=0-4', [(0, 4)]),
+    ('bytes=5-', [(5, 13)]),
+    ('bytes=-4', [(10, 13)]),
+    ('bytes=-100', [(0, 13)]),
+    ('bytes=0-100', [(0, 13)]),
+    ('bytes=0-1, 4-5', [(0, 1), (4, 5)]),
+    ('bytes=20-30', []),
+    ('bytes=5-1', None),
+    ('bytes=a-b', None),
+    ('bytes=-', None),
+    ('items=0-1', None),
+    ('bytes=' + ','.join(['0-1'] * 17), None)
+]
+
+
+@pytest.mark.parametrize('header, ranges', _params_parse_range)
+def test_parse_range(header, ranges):
+    assert parse_range(header, 14) == ranges
+
+
+def test_range(path):
+    cli = TestClient(FileResponse(path))
+
+    response = cli.get('/', headers={'range': 'bytes=1-4'})
+    assert response.status_code == 206
+    assert response.content == b'file'
+    assert response.headers['content-range'] == 'bytes 1-4/14'
+    assert response.headers['content-length'] == '4'
+    assert response.headers['accept-ranges'] == 'bytes'
+
+
+def test_range_multipart(path):
+    cli = TestClient(FileResponse(path))
+
+    response = cli.get('/', headers={'range': 'bytes=1-4, -8'})
+    assert response.status_code == 206
+
+    content_type = response.headers['content-type']
+    assert content_type.startswith('multipart/byteranges; boundary=')
+    boundary = content_type.split('=')[1]
+
+    assert response.content == (
+        f'--{boundary}\r\n'
+        f'Content-Type: text/plain; charset=utf-8\r\n'
+        f'Content-Range: bytes 1-4/14\r\n\r\n'
+        f'file\r\n'
+        f'--{boundary}\r\n'
+        f'Content-Type: text/plain; charset=utf-8\r\n'
+        f'Content-Range: bytes 6-13/14\r\n\r\n'
+        f'content>\r\n'
+        f'--{boundary}--\r\n'
+    ).encode()
+    assert int(response.headers['content-length']) == len(response.content)
+
+
+def test_range_not_satisfiable(path):
+    cli = TestClient(FileResponse(path))
+
+    response = cli.get('/', headers={'range': 'bytes=100-'})
+    assert response.status_code == 416
+    assert response.headers['content-range'] == 'bytes */14'
+
+
+def test_if_range(path):
+    cli = TestClient(FileResponse(path))
+    headers = cli.get('/').headers
+
+    response = cli.get('/', headers={'range': 'bytes=1-4',
+                                     'if-range': headers['etag']})
+    assert response.status_code == 206
+
+    response = cli.get('/', headers={'range': 'bytes=1-4',
+                                     'if-range': headers['last-modified']})
+    assert response.status_code == 206
+
+    response = cli.get('/', headers={'range': 'bytes=1-4',
+                                     'if-range': '"outdated"'})
+    assert response.status_code == 200
+    assert response.content == b'<file content>'
+
+
+def test_range_zerocopysend(path):
+    start, body = call(FileResponse(path),
+                       extensions={'http.response.zerocopysend': {}},
+                       headers=[(b'range', b'bytes=1-4')])
+
+    assert start['status'] == 206
+    assert body['offset'] == 1
+    assert body['count'] == 4
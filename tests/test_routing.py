@@ -458,3 +458,92 @@ def test_router_route_without_slash():
         @router.route('badroute')
         def badroute(request):
             pass
+
+
+# ---
+
+
+class TagMiddleware:
+    def __init__(self, app, tag):
+        self.app = app
+        self.tag = tag
+
+    async def __call__(self, scope, receive, send):
+        async def _send(message):
+            if message['type'] == 'http.response.start':
+                message['headers'].append((b'x-tag', self.tag.encode()))
+            await send(message)
+        await self.app(scope, receive, _send)
+
+
+def test_route_middleware():
+    tagged = Router(
+        [
+            route('/plain', homepage),
+            route('/route', homepage,
+                  middleware=[(TagMiddleware, {'tag': 'route'})]),
+            route('/{name}', homepage,
+                  middleware=[(TagMiddleware, {'tag': 'dynamic'})]),
+            mount('/mount', routes=[route('/', homepage)],
+                  middleware=[(TagMiddleware, {'tag': 'mount'})])
+        ]
+    )
+    cli = TestClient(tagged)
+
+    assert 'x-tag' not in cli.get('/plain').headers
+    assert cli.get('/route').headers.get_list('x-tag') == ['route']
+    assert cli.get('/dynamic').headers.get_list('x-tag') == ['dynamic']
+    assert cli.get('/mount/').headers.get_list('x-tag') == ['mount']
+
+
+def test_router_middleware():
+    tagged = Router(middleware=[(TagMiddleware, {'tag': 'router'})])
+    tagged._route('/', homepage, None, None,
+                  middleware=[(TagMiddleware, {'tag': 'route'})])
+    cli = TestClient(Router([mount('/api', app=tagged)]))
+
+    response = cli.get('/api/')
+    assert response.status_code == 200
+    assert response.headers.get_list('x-tag') == ['route', 'router']
+
+
+class PreflightMiddleware:
+    instances = 0
+
+    def __init__(self, app):
+        self.app = app
+        PreflightMiddleware.instances += 1
+
+    async def __call__(self, scope, receive, send):
+        if scope['method'] == 'OPTIONS':
+            await Response(status_code=204)(scope, receive, send)
+        else:
+            await self.app(scope, receive, send)
+
+
+def test_route_middleware_unmatched_method():
+    cli = TestClient(Router([
+        route('/plain', homepage, methods=['POST'],
+              middleware=[(PreflightMiddleware, {})]),
+        route('/{name}', homepage, methods=['POST'],
+              middleware=[(PreflightMiddleware, {})])
+    ]))
+
+    assert cli.options('/plain').status_code == 204
+    assert cli.options('/dynamic').status_code == 204
+    with pytest.raises(HTTPException) as exc:
+        cli.get('/plain')
+    assert exc.value.status_code == 405
+
+
+def test_router_middleware_once():
+    PreflightMiddleware.instances = 0
+    tagged = Router([route('/one', homepage), route('/two', homepage)],
+                    middleware=[(PreflightMiddleware, {})])
+    cli = TestClient(Router([mount('/api', app=tagged)]))
+
+    assert PreflightMiddleware.instances == 1
+    assert cli.options('/api/missing').status_code == 204
+    with pytest.raises(HTTPException) as exc:
+        cli.get('/api/missing')
+    assert exc.value.status_code == 404
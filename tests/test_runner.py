@@ -0,0 +1,177 @@
+import os
+import sys
+import json
+import time
+import signal
+import socket
+import subprocess
+import urllib.request
+import pytest
+from hius import Hius
+from hius.runner import (
+    create_socket,
+    get_worker_id,
+    import_app,
+    prepare_app,
+    WORKER_ID
+)
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+APP = '''
+import os
+import time
+from hius import Hius
+from hius.responses import JSONResponse
+from hius.runner import get_worker_id
+
+app = Hius()
+
+
+@app.route('/')
+async def index(request):
+    return JSONResponse({'worker': get_worker_id(), 'pid': os.getpid()})
+
+
+@app.route('/block')
+async def block(request):
+    time.sleep(30)
+'''
+
+
+def test_import_app(tmpdir, monkeypatch):
+    with open(os.path.join(tmpdir, 'import_app.py'), 'w') as file:
+        file.write('from hius import Hius\napp = Hius()\n')
+
+    monkeypatch.chdir(tmpdir)
+    monkeypatch.setattr(sys, 'path', list(sys.path))
+
+    app = import_app('import_app:app')
+    assert isinstance(app, Hius)
+    assert import_app('import_app:app.router') is app.router
+
+
+@pytest.mark.parametrize('spec', ['import_app', ':app', 'import_app:'])
+def test_import_app_bad_spec(spec):
+    with pytest.raises(RuntimeError):
+        import_app(spec)
+
+
+def test_prepare_app():
+    app = Hius()
+    prepare_app(app)
+    assert app.openapi.schema is not None
+
+
+def test_worker_id(monkeypatch):
+    assert get_worker_id() is None
+    monkeypatch.setenv(WORKER_ID, '3')
+    assert get_worker_id() == 3
+
+
+def test_create_socket_reuse_port():
+    first = create_socket('127.0.0.1', 0, listen=False)
+    port = first.getsockname()[1]
+    second = create_socket('127.0.0.1', port)
+    third = create_socket('127.0.0.1', port)
+    try:
+        assert second.getsockname()[1] == third.getsockname()[1] == port
+    finally:
+        for sock in (first, second, third):
+            sock.close()
+
+
+# ---
+
+
+def get_free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def get(port, path='/', timeout=5.0):
+    url = f'http://127.0.0.1:{port}{path}'
+    with urllib.request.urlopen(url, timeout=timeout) as response:
+        return tuple(json.load(response).values())
+
+
+def wait_workers(port, count=2, exclude=(), timeout=10.0):
+    deadline = time.monotonic() + timeout
+    workers = {}
+    while time.monotonic() < deadline:
+        try:
+            worker_id, pid = get(port, timeout=1.0)
+        except OSError:
+            time.sleep(0.05)
+            continue
+        if pid not in exclude:
+            workers[worker_id] = pid
+        if len(workers) == count:
+            return workers
+    raise TimeoutError(workers)
+
+
+@pytest.fixture
+def serve(tmpdir):
+    pytest.importorskip('uvicorn')
+
+    with open(os.path.join(tmpdir, 'runner_app.py'), 'w') as file:
+        file.write(APP)
+
+    port = get_free_port()
+    process = subprocess.Popen(
+        [sys.executable, '-m', 'hius', 'serve', 'runner_app:app',
+         '--workers', '2', '--port', str(port), '--timeout', '1',
+         '--log-level', 'warning'],
+        cwd=tmpdir,
+        env={**os.environ, 'PYTHONPATH': ROOT}
+    )
+    yield process, port
+
+    if process.poll() is None:
+        process.terminate()
+        process.wait()
+
+
+def test_serve(serve):
+    process, port = serve
+
+    workers = wait_workers(port)
+    assert sorted(workers) == [0, 1]
+
+    process.send_signal(signal.SIGHUP)
+    restarted = wait_workers(port, exclude=set(workers.values()))
+    assert sorted(restarted) == [0, 1]
+
+    process.send_signal(signal.SIGTERM)
+    assert process.wait(10) == 0
+
+
+def test_serve_kills_blocked_worker(serve):
+    process, port = serve
+
+    workers = wait_workers(port)
+    with pytest.raises(OSError):
+        get(port, '/block', timeout=0.5)
+
+    restarted = wait_workers(port, 1, exclude=set(workers.values()))
+    assert len(restarted) == 1
+    assert wait_workers(port).keys() == workers.keys()
+
+
+def test_serve_master_gone(serve):
+    process, port = serve
+
+    workers = wait_workers(port)
+    process.kill()
+    process.wait()
+
+    deadline = time.monotonic() + 10
+    while time.monotonic() < deadline:
+        if not any(os.path.exists(f'/proc/{pid}')
+                   for pid in workers.values()):
+            break
+        time.sleep(0.1)
+    else:
+        pytest.fail('workers outlived the master')
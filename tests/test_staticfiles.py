@@ -0,0 +1,308 @@
+import os
+import re
+import asyncio
+import pytest
+from starlette.testclient import TestClient
+from hius import Hius
+from hius.handlers import StaticFiles
+from hius.handlers.compress import compress_directory, main
+from hius.handlers.manifest import Manifest
+from hius.routing.exceptions import NoMatchFound
+
+
+def write(path, content):
+    with open(path, 'w') as file:
+        file.write(content)
+
+
+@pytest.fixture
+def static_dir(tmpdir):
+    write(os.path.join(tmpdir, 'small.txt'), 'small')
+    write(os.path.join(tmpdir, 'large.txt'), 'x' * 1024)
+    return tmpdir
+
+
+def make_client(directory, **kwargs):
+    app = Hius(openapi_config=None)
+    static = StaticFiles(directory=directory, **kwargs)
+    app.mount('/static', static)
+    return TestClient(app), static
+
+
+# ---
+
+
+def test_cache_hit(static_dir):
+    cli, static = make_client(static_dir, cache_size=4096,
+                              cache_file_size=512)
+
+    response = cli.get('/static/small.txt')
+    assert response.status_code == 200
+    assert response.text == 'small'
+    assert response.headers['content-type'] == 'text/plain; charset=utf-8'
+    assert static.cache.used == 5
+
+    response = cli.get('/static/small.txt')
+    assert response.text == 'small'
+    assert response.headers['content-length'] == '5'
+
+    response = cli.head('/static/small.txt')
+    assert response.content == b''
+    assert response.headers['content-length'] == '5'
+
+
+def test_cache_not_modified(static_dir):
+    cli, _ = make_client(static_dir, cache_size=4096)
+
+    etag = cli.get('/static/small.txt').headers['etag']
+
+    response = cli.get('/static/small.txt', headers={'if-none-match': etag})
+    assert response.status_code == 304
+
+
+def test_cache_large_file(static_dir):
+    cli, static = make_client(static_dir, cache_size=4096,
+                              cache_file_size=512)
+
+    response = cli.get('/static/large.txt')
+    assert response.status_code == 200
+    assert len(response.content) == 1024
+    assert static.cache.used == 0
+
+
+def test_cache_invalidation(static_dir):
+    cli, _ = make_client(static_dir, cache_size=4096)
+
+    assert cli.get('/static/small.txt').text == 'small'
+
+    path = os.path.join(static_dir, 'small.txt')
+    write(path, 'changed')
+
+    assert cli.get('/static/small.txt').text == 'changed'
+
+    os.remove(path)
+    assert cli.get('/static/small.txt').status_code == 404
+
+
+def test_cache_eviction(static_dir):
+    for name in 'abc':
+        write(os.path.join(static_dir, f'{name}.txt'), name * 10)
+
+    cli, static = make_client(static_dir, cache_size=20)
+
+    for name in 'abc':
+        cli.get(f'/static/{name}.txt')
+
+    assert list(static.cache.entries) == [('b.txt', (), False),
+                                          ('c.txt', (), False)]
+    assert static.cache.used == 20
+
+
+def test_cache_missing(static_dir):
+    cli, _ = make_client(static_dir, cache_size=4096)
+
+    assert cli.get('/static/missing.txt').status_code == 404
+
+
+# ---
+
+
+@pytest.fixture
+def compressed_dir(tmpdir):
+    write(os.path.join(tmpdir, 'app.js'), 'var x = 1;' * 100)
+    write(os.path.join(tmpdir, 'tiny.css'), 'a{}')
+    write(os.path.join(tmpdir, 'image.bin'), 'x' * 1000)
+    return tmpdir
+
+
+def test_compress_directory(compressed_dir):
+    static = StaticFiles(directory=compressed_dir)
+    created = static.compress(encodings=['gzip'])
+
+    assert created == 1
+    assert os.listdir(compressed_dir).count('app.js.gz') == 1
+    assert 'tiny.css.gz' not in os.listdir(compressed_dir)
+    assert 'image.bin.gz' not in os.listdir(compressed_dir)
+
+    assert static.compress(encodings=['gzip']) == 0
+
+
+def test_compress_cli(compressed_dir, capsys):
+    main([str(compressed_dir), '--encoding', 'gzip', '--min-size', '1'])
+
+    assert 'app.js.gz' in os.listdir(compressed_dir)
+    assert 'tiny.css.gz' not in os.listdir(compressed_dir)
+    assert '1 files created' in capsys.readouterr().out
+
+
+@pytest.mark.parametrize('cache_size', [0, 4096])
+def test_precompressed(compressed_dir, cache_size):
+    compress_directory(compressed_dir, encodings=['gzip'])
+    cli, _ = make_client(compressed_dir, precompressed=True,
+                         cache_size=cache_size)
+
+    response = cli.get('/static/app.js', headers={'accept-encoding': 'gzip'})
+    assert response.status_code == 200
+    assert response.headers['content-encoding'] == 'gzip'
+    assert response.headers['vary'] == 'Accept-Encoding'
+    assert 'javascript' in response.headers['content-type']
+    assert response.text == 'var x = 1;' * 100
+
+    response = cli.get('/static/app.js', headers={'accept-encoding': 'br'})
+    assert 'content-encoding' not in response.headers
+    assert response.headers['vary'] == 'Accept-Encoding'
+    assert response.text == 'var x = 1;' * 100
+
+    response = cli.get('/static/app.js',
+                       headers={'accept-encoding': 'gzip;q=0'})
+    assert 'content-encoding' not in response.headers
+
+
+def test_precompressed_brotli(compressed_dir):
+    pytest.importorskip('brotli')
+    compress_directory(compressed_dir)
+    cli, _ = make_client(compressed_dir, precompressed=True)
+
+    response = cli.get('/static/app.js',
+                       headers={'accept-encoding': 'gzip, br'})
+    assert response.headers['content-encoding'] == 'br'
+    assert response.text == 'var x = 1;' * 100
+
+
+def test_cache_range(static_dir):
+    cli, _ = make_client(static_dir, cache_size=4096)
+
+    assert cli.get('/static/small.txt').text == 'small'
+
+    response = cli.get('/static/small.txt', headers={'range': 'bytes=1-2'})
+    assert response.status_code == 206
+    assert response.text == 'ma'
+
+
+# ---
+
+
+@pytest.fixture
+def manifest_dir(tmpdir):
+    os.mkdir(os.path.join(tmpdir, 'css'))
+    write(os.path.join(tmpdir, 'css', 'app.css'), 'body {}')
+    write(os.path.join(tmpdir, 'LICENSE'), 'MIT')
+    return tmpdir
+
+
+def test_manifest(manifest_dir):
+    static = StaticFiles(directory=manifest_dir, manifest=True)
+    app = Hius(openapi_config=None, on_startup=[static.load_manifest])
+    app.mount('/static', static, name='static')
+
+    with TestClient(app) as cli:
+        assert static.manifest is not None
+
+        url = app.url_path_for('css/app.css')
+        assert re.fullmatch(r'/static/css/app\.[0-9a-f]{12}\.css', str(url))
+        assert re.fullmatch(r'/static/LICENSE\.[0-9a-f]{12}',
+                            str(app.url_path_for('LICENSE')))
+        assert app.url_path_for('static') == '/static'
+
+        response = cli.get(str(url))
+        assert response.status_code == 200
+        assert response.text == 'body {}'
+        assert response.headers['cache-control'] == (
+            'public, max-age=31536000, immutable'
+        )
+        assert response.headers['content-type'] == 'text/css; charset=utf-8'
+
+        response = cli.get('/static/css/app.css')
+        assert response.status_code == 200
+        assert 'cache-control' not in response.headers
+        etag = response.headers['etag']
+        assert etag.startswith('"') and etag.endswith('"')
+        assert etag[1:13] == str(url).split('.')[-2]
+        response = cli.get('/static/css/app.css',
+                           headers={'if-none-match': etag})
+        assert response.status_code == 304
+
+        write(os.path.join(manifest_dir, 'new.txt'), 'new')
+        assert cli.get('/static/new.txt').status_code == 404
+        assert cli.get('/static/css/app.000000000000.css').status_code == 404
+
+
+def test_manifest_lazy(manifest_dir):
+    cli, static = make_client(manifest_dir, manifest=True, cache_size=4096)
+
+    response = cli.get('/static/css/app.css')
+    assert response.status_code == 200
+    assert static.manifest is not None
+
+    url = static.url_path_for('css/app.css')
+    assert cli.get(f'/static{url}').text == 'body {}'
+    assert cli.get(f'/static{url}').headers['cache-control'].endswith(
+        'immutable'
+    )
+
+
+@pytest.mark.parametrize('manifest', [False, True])
+def test_manifest_html_root(manifest_dir, manifest):
+    write(os.path.join(manifest_dir, 'index.html'), 'index')
+    cli, _ = make_client(manifest_dir, html=True, manifest=manifest)
+
+    response = cli.get('/static/')
+    assert response.status_code == 200
+    assert response.text == 'index'
+
+
+def test_manifest_file_removed(manifest_dir):
+    path = os.path.join(manifest_dir, 'LICENSE')
+    stat_result = os.stat(path)
+    os.remove(path)
+
+    assert Manifest()._create_entry('LICENSE', path, stat_result) is None
+
+
+def test_url_path_for_without_manifest(manifest_dir):
+    with pytest.raises(NoMatchFound):
+        StaticFiles(directory=manifest_dir).url_path_for('css/app.css')
+
+
+def test_watch_manifest(manifest_dir):
+    static = StaticFiles(directory=manifest_dir, manifest=True,
+                         watch_interval=0.01)
+
+    async def watch():
+        watcher = static.watch_manifest()
+        await watcher.__anext__()
+        old_url = static.manifest.get_url('css/app.css')
+
+        write(os.path.join(manifest_dir, 'css', 'app.css'), 'body {x}')
+        await asyncio.sleep(0.1)
+        new_url = static.manifest.get_url('css/app.css')
+
+        with pytest.raises(StopAsyncIteration):
+            await watcher.__anext__()
+        return old_url, new_url
+
+    old_url, new_url = asyncio.run(watch())
+    assert old_url != new_url
+
+
+def test_watch_manifest_error(manifest_dir, caplog):
+    static = StaticFiles(directory=manifest_dir, manifest=True,
+                         watch_interval=0.01)
+    calls = []
+
+    def load_manifest(app=None):
+        calls.append(app)
+        if len(calls) == 2:
+            raise RuntimeError('scan failed')
+
+    async def watch():
+        watcher = static.watch_manifest()
+        await watcher.__anext__()
+        static.load_manifest = load_manifest
+        await asyncio.sleep(0.1)
+        with pytest.raises(StopAsyncIteration):
+            await watcher.__anext__()
+
+    asyncio.run(watch())
+    assert len(calls) > 2
+    assert 'failed to refresh static files manifest' in caplog.text
@@ -0,0 +1,71 @@
+from starlette.testclient import TestClient
+from hius import Hius
+from hius.routing import route
+from hius.routing.timing import TIMING, Timing, TimingMiddleware
+from hius.metrics import MetricsStore
+from hius.responses import JSONResponse
+
+STAGES = ['routing', 'validation', 'handler', 'response']
+
+
+def create_app(**options):
+    stages = []
+
+    async def user(request, user_id: int):
+        stages.append(request.scope['extensions'][TIMING])
+        return JSONResponse({'id': user_id})
+
+    app = Hius(routes=[route('/users/{user_id}', user, name='user')])
+    app.add_middleware(TimingMiddleware, **options)
+    return app, stages
+
+
+def test_timing_mark():
+    timing = Timing()
+    timing.mark('routing')
+    timing.mark('routing')
+    timing.resume()
+    timing.mark('handler')
+
+    assert list(timing.stages) == ['routing', 'handler']
+    assert timing.total >= sum(timing.stages.values())
+    assert timing.server_timing().startswith('routing;dur=')
+    assert 'total;dur=' in timing.server_timing()
+
+
+def test_stages():
+    app, timings = create_app()
+
+    response = TestClient(app).get('/users/1')
+    assert response.json() == {'id': 1}
+    assert list(timings[0].stages) == STAGES
+
+    header = response.headers['server-timing']
+    assert [item.split(';')[0] for item in header.split(', ')] == [
+        'routing', 'validation', 'handler', 'total'
+    ]
+
+
+def test_without_server_timing():
+    app, _ = create_app(server_timing=False)
+
+    response = TestClient(app).get('/users/1')
+    assert 'server-timing' not in response.headers
+
+
+def test_metrics():
+    store = MetricsStore(workers=1, buckets=(1.0,))
+    app, _ = create_app(store=store, name='stage')
+
+    client = TestClient(app)
+    client.get('/users/1')
+    client.get('/users/x')
+    client.get('/missing')
+
+    names = store.names()
+    for stage in STAGES:
+        assert f'stage{{route="user",stage="{stage}"}}' in names
+    assert store.get('stage{route="user",stage="handler"}').count == 1
+    assert store.get('stage{route="user",stage="routing"}').count == 2
+    assert 'stage{route="<unmatched>",stage="routing"}' in names
+    store.close()